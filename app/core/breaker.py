@@ -0,0 +1,67 @@
+# app/core/breaker.py
+# -----------------------------------------------------------------------------
+# 외부 호출 서킷 브레이커 (워커 단위)
+# - closed   : 정상 호출. 연속 실패가 failure_threshold에 닿으면 open
+# - open     : reset_timeout 동안 호출하지 않음 → 호출자는 즉시 폴백
+# - half_open: 시간이 지나면 시험 호출 1건만 허용, 성공하면 closed / 실패하면 다시 open
+# -----------------------------------------------------------------------------
+from __future__ import annotations
+
+import time
+
+
+class CircuitBreaker:
+    def __init__(self, name: str, *, failure_threshold: int, reset_timeout: float):
+        self.name = name
+        self.failure_threshold = max(1, int(failure_threshold))
+        self.reset_timeout = float(reset_timeout)
+        self.failures = 0
+        self.opened_at: float | None = None
+        self._probing = False
+        self.rejected = 0
+        self.trips = 0
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return "closed"
+        if time.monotonic() - self.opened_at >= self.reset_timeout:
+            return "half_open"
+        return "open"
+
+    def allow(self) -> bool:
+        """지금 외부 호출을 해도 되는지 (half_open이면 시험 호출 1건만)"""
+        state = self.state
+        if state == "closed":
+            return True
+        if state == "half_open" and not self._probing:
+            self._probing = True
+            return True
+        self.rejected += 1
+        return False
+
+    def record_success(self) -> None:
+        self.failures = 0
+        self.opened_at = None
+        self._probing = False
+
+    def record_failure(self) -> None:
+        self.failures += 1
+        if self._probing or self.failures >= self.failure_threshold:
+            if self.opened_at is None or self._probing:
+                self.trips += 1
+            self.opened_at = time.monotonic()
+        self._probing = False
+
+    def release(self) -> None:
+        """허용받은 호출을 상류와 무관한 이유로 못 했을 때 (시험 기회 반납)"""
+        self._probing = False
+
+    def stats(self) -> dict:
+        return {
+            "name": self.name,
+            "state": self.state,
+            "failures": self.failures,
+            "trips": self.trips,
+            "rejected": self.rejected,
+        }
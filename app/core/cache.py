@@ -0,0 +1,142 @@
+# app/core/cache.py
+# -----------------------------------------------------------------------------
+# 비동기 TTL + LRU 캐시 (single-flight)
+# - get_or_load(key, loader): 적중이면 즉시, 미스면 loader 한 번만 실행
+#   · 같은 키의 동시 미스는 진행 중인 호출 결과를 함께 기다림(coalesced)
+#   · loader 예외는 캐시하지 않음 (대기자에게도 같은 예외 전파)
+# - 용량 초과 시 가장 오래 안 쓴 항목부터 제거
+#   (sizeof를 주면 max_bytes 메모리 예산도 함께 — 항목 크기 합 기준)
+# - 만료 항목은 덮어쓰거나 밀려날 때까지 남겨 get_stale()로 폴백 제공
+# -----------------------------------------------------------------------------
+from __future__ import annotations
+
+import asyncio
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Hashable
+
+
+class AsyncTTLCache:
+    """maxsize개(+ max_bytes)까지 ttl초 동안 보관. 적중/미스/합류/제거 횟수 기록"""
+
+    def __init__(
+        self,
+        maxsize: int,
+        ttl: float,
+        *,
+        max_bytes: int | None = None,
+        sizeof: Callable[[Any], int] | None = None,
+    ):
+        self.maxsize = max(1, int(maxsize))
+        self.ttl = float(ttl)
+        self.max_bytes = max_bytes if sizeof is not None else None
+        self._sizeof = sizeof
+        self._data: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+        self._sizes: dict[Hashable, int] = {}
+        self.nbytes = 0
+        self._inflight: dict[Hashable, asyncio.Future] = {}
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def _get(self, key: Hashable) -> tuple[bool, Any]:
+        entry = self._data.get(key)
+        if entry is None:
+            return False, None
+        if entry[0] <= time.monotonic():
+            return False, None  # 만료 — 폴백용으로 남겨둠
+        self._data.move_to_end(key)
+        return True, entry[1]
+
+    def _put(self, key: Hashable, value: Any) -> None:
+        self._data[key] = (time.monotonic() + self.ttl, value)
+        self._data.move_to_end(key)
+        if self._sizeof is not None:
+            size = int(self._sizeof(value))
+            self.nbytes += size - self._sizes.get(key, 0)
+            self._sizes[key] = size
+        while len(self._data) > self.maxsize or self._over_budget():
+            old, _ = self._data.popitem(last=False)
+            self.nbytes -= self._sizes.pop(old, 0)
+            self.evictions += 1
+
+    def _over_budget(self) -> bool:
+        # 방금 넣은 항목 하나는 예산보다 커도 남김
+        return (
+            self.max_bytes is not None
+            and self.nbytes > self.max_bytes
+            and len(self._data) > 1
+        )
+
+    async def get_or_load(
+        self, key: Hashable, loader: Callable[[], Awaitable[Any]]
+    ) -> Any:
+        while True:
+            found, value = self._get(key)
+            if found:
+                self.hits += 1
+                return value
+
+            fut = self._inflight.get(key)
+            if fut is None:
+                break
+            self.coalesced += 1
+            try:
+                return await asyncio.shield(fut)
+            except asyncio.CancelledError:
+                if not fut.cancelled():  # 대기자 자신이 취소됨
+                    raise
+                # 선행 호출이 취소됨 → 다시 시도(새 선행자가 될 수 있음)
+
+        self.misses += 1
+        fut = asyncio.get_running_loop().create_future()
+        self._inflight[key] = fut
+        try:
+            value = await loader()
+        except asyncio.CancelledError:
+            fut.cancel()
+            raise
+        except BaseException as e:
+            fut.set_exception(e)
+            fut.exception()  # 대기자가 없어도 'never retrieved' 경고 방지
+            raise
+        else:
+            self._put(key, value)
+            fut.set_result(value)
+            return value
+        finally:
+            self._inflight.pop(key, None)
+
+    def get_stale(self, key: Hashable, default: Any = None) -> Any:
+        """만료 여부와 상관없이 마지막 값 (상류 장애 시 폴백)"""
+        entry = self._data.get(key)
+        return default if entry is None else entry[1]
+
+    def clear(self) -> None:
+        self._data.clear()
+        self._sizes.clear()
+        self.nbytes = 0
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses + self.coalesced
+        return {
+            "size": len(self._data),
+            "maxsize": self.maxsize,
+            "ttl_s": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "evictions": self.evictions,
+            **(
+                {"nbytes": self.nbytes, "max_bytes": self.max_bytes}
+                if self._sizeof is not None
+                else {}
+            ),
+            "hit_ratio": (
+                round((self.hits + self.coalesced) / lookups, 4) if lookups else None
+            ),
+        }
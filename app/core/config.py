@@ -13,10 +13,78 @@ class Settings(BaseSettings):
     ENV: str = "dev"
     DATABASE_URL: str = "sqlite+aiosqlite:///./space.db"
     MODEL_DIR: str = "./models"
+    SPATIAL_RTREE: bool = True  # SQLite R*Tree 공간 인덱스 사용
+    PLACE_INDEX_ENABLED: bool = True  # Place 인메모리 BallTree (기동 시 적재)
+    PLACE_INDEX_REFRESH_S: float = 30.0  # 다른 워커 쓰기 흡수 주기
+
+    # 수성구 고정 격자(셀 단위 사전 집계)
+    GRID_ENABLED: bool = True
+    GRID_CELL_M: float = 50.0
+    GRID_MIN_LAT: float = 35.78
+    GRID_MAX_LAT: float = 35.90
+    GRID_MIN_LON: float = 128.57
+    GRID_MAX_LON: float = 128.74
+    GRID_REFRESH_S: float = 5.0  # 더티 셀 재집계 최소 간격
+
+    # 최신 분기 FTQ 스냅샷 (같은 워커 쓰기는 이벤트로 즉시 무효화)
+    FTQ_SNAPSHOT_TTL_S: float = 60.0  # 다른 워커 쓰기 흡수 주기
+
+    # 거리감쇠 경쟁 압력 (Huff/중력 모형, app/services/competition.py)
+    COMPETITION_KERNEL: str = "exponential"  # exponential|gaussian|power|linear
+    COMPETITION_BANDWIDTH_M: float = 500.0  # 감쇠 거리 척도
+    COMPETITION_RADIUS_M: float = 2000.0  # 이웃 탐색 반경 (커널 절단)
+    COMPETITION_POWER_BETA: float = 2.0  # power 커널 지수 (Huff 거리 마찰)
+    COMPETITION_FT_REF: float = 10000.0  # 매력도 = (1 + 유동인구/REF)^ALPHA
+    COMPETITION_FT_ALPHA: float = 0.5
+
+    # 장소별 사전 계산 피처 (app/services/feature_store.py)
+    FEATURE_STORE_ENABLED: bool = True  # 기동 시 버전 적재, 비어 있으면 전체 구축 작업
+    FEATURE_STORE_DEBOUNCE_S: float = 5.0  # 쓰기 이벤트 후 증분 갱신 작업까지 대기
+
+    # 예측 적합 프로세스 풀 (app/services/forecast_pool.py)
+    FORECAST_POOL_ENABLED: bool = True  # False면 스레드 풀 (개발/디버깅)
+    FORECAST_WORKERS: int = 0  # 0=CPU 코어 수 (uvicorn 워커 여러 개면 나눠서 지정)
+    FORECAST_QUEUE_MAX: int = 8  # 워커가 모두 바쁠 때 대기 허용 건수, 넘으면 429
+    # 결정적 모드: 요청에 seed가 없으면 입력 해시로 RF/노이즈 seed 유도
+    # → 같은 입력 = 같은 응답 + ETag/304 (False면 seed 준 요청만)
+    FORECAST_DETERMINISTIC: bool = True
+    # 증분 예측 (store_id 요청, app/services/forecast_state.py)
+    FORECAST_INCREMENTAL: bool = True
+    FORECAST_REFIT_EVERY: int = 3  # 최적화 없이 append로 반영할 최대 누적 개월
+    # 배치 예측 (POST /finance/forecast_auto/batch)
+    FORECAST_BATCH_MAX: int = 1000  # 요청당 최대 매장 수
+    FORECAST_BATCH_CHUNK: int = 4  # 워커 작업 하나에 묶는 매장 수
+    # 적합 결과 캐시 (시계열/exog 기준값/horizon/적합 설정 해시 → 평균/CI/RF 예측)
+    FORECAST_CACHE_SIZE: int = 512
+    FORECAST_CACHE_MAX_MB: float = 32.0
+    FORECAST_CACHE_TTL_S: float = 6 * 3600.0
 
     # 외부 API 키들
     KAKAO_API_KEY: str | None = None  # Kakao REST API Key
     MAP_API_KEY: str | None = None
+    # Kakao 검색 캐시: 좌표를 GRID_M 격자로 양자화한 (lat, lon, radius) 키
+    KAKAO_CACHE_GRID_M: float = 50.0
+    KAKAO_CACHE_TTL_S: float = 600.0
+    KAKAO_CACHE_SIZE: int = 2048
+    # Kakao 호출 쿼터 (모든 워커가 KAKAO_QUOTA_DB 파일로 공유)
+    KAKAO_QUOTA_DB: str = "./ratelimit.db"
+    KAKAO_RATE_LIMIT_RPS: float = 10.0
+    KAKAO_RATE_BURST: int = 20
+    KAKAO_DAILY_QUOTA: int = 100_000
+    KAKAO_BACKGROUND_RESERVE: float = 5.0  # 백그라운드가 남겨둘 토큰 수
+    KAKAO_BACKGROUND_QUOTA_FRAC: float = 0.8  # 백그라운드가 쓸 수 있는 일일 쿼터 비율
+    KAKAO_MAX_WAIT_S: float = 10.0  # 토큰 대기 상한 (interactive)
+    KAKAO_BACKOFF_BASE_S: float = 0.5
+    KAKAO_BACKOFF_CAP_S: float = 8.0
+    KAKAO_MIN_BUDGET_S: float = 0.3  # 남은 요청 예산이 이보다 적으면 호출 생략
+    KAKAO_BREAKER_FAILURES: int = 5  # 연속 실패 시 서킷 open
+    KAKAO_BREAKER_RESET_S: float = 30.0  # open 유지 후 시험 호출
+
+    # 요청 예산 (라우터 → 서비스 → 외부 호출까지 전달)
+    ANALYSIS_DEADLINE_S: float = 3.0
+    ANALYSIS_BATCH_MAX: int = 2000  # /analysis/area/batch 최대 지점 수
+    ANALYSIS_BATCH_FETCH_CONCURRENCY: int = 4  # 배치 빈 지점 Kakao 동시 수집 수
+    ANALYSIS_BATCH_FETCH_BUDGET_S: float = 15.0  # 배치 요청 전체 Kakao 수집 예산
     GEMINI_API_KEY: str | None = None
 
     # 수성구 공공데이터
@@ -33,6 +101,12 @@ class Settings(BaseSettings):
     SUSEONG_PAGE_SIZE: int = 200
     SUSEONG_PAGES: int = 10
 
+    # 수성구 API 페이지 수집 파이프라인
+    SUSEONG_FETCH_CONCURRENCY: int = 4  # 동시 in-flight 페이지 요청 수
+    SUSEONG_HTTP_TIMEOUT: float = 20.0
+    SUSEONG_BOOTSTRAP_CONCURRENCY: int = 3  # 동시에 수집하는 분기 수
+    SUSEONG_RATE_LIMIT_RPS: float = 8.0  # 전체 분기 합산 초당 요청 한도 (0=무제한)
+
     model_config = SettingsConfigDict(
         env_file=".env", extra="ignore"  # .env에 추가 필드 무시
     )
@@ -0,0 +1,74 @@
+# app/core/deadline.py
+# -----------------------------------------------------------------------------
+# 요청 단위 마감시각(deadline) + 성능 저하(degraded) 표시
+# - request_scope(seconds): 라우터에서 요청 예산을 열면 contextvar로
+#   서비스/외부 클라이언트까지 그대로 전달 (인자 추가 없이, gather 자식 태스크 포함)
+# - remaining(): 남은 초 (스코프 밖이면 None = 무제한)
+# - mark_degraded(reason): DB-only/만료 캐시 응답 등 축소 응답 사유 기록
+# -----------------------------------------------------------------------------
+from __future__ import annotations
+
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator
+
+_deadline: ContextVar[float | None] = ContextVar("deadline", default=None)
+_degraded: ContextVar[list[str] | None] = ContextVar("degraded", default=None)
+
+
+class DeadlineExceeded(TimeoutError):
+    """요청 예산 안에 끝낼 수 없음"""
+
+
+class RequestScope:
+    """request_scope()가 돌려주는 핸들 — 응답에 degraded 여부를 싣는 용도"""
+
+    def __init__(self, reasons: list[str]):
+        self.reasons = reasons
+
+    @property
+    def degraded(self) -> bool:
+        return bool(self.reasons)
+
+
+@contextmanager
+def request_scope(seconds: float | None) -> Iterator[RequestScope]:
+    """
+    seconds 뒤를 마감으로 하는 스코프 (바깥 스코프가 더 이르면 그쪽 유지).
+    seconds가 None/0 이하면 마감 없이 degraded 기록만.
+    """
+    outer = _deadline.get()
+    dl = outer
+    if seconds and seconds > 0:
+        mine = time.monotonic() + seconds
+        dl = mine if outer is None else min(outer, mine)
+    scope = RequestScope([])
+    t_dl = _deadline.set(dl)
+    t_dg = _degraded.set(scope.reasons)
+    try:
+        yield scope
+    finally:
+        _deadline.reset(t_dl)
+        _degraded.reset(t_dg)
+
+
+def remaining() -> float | None:
+    dl = _deadline.get()
+    return None if dl is None else dl - time.monotonic()
+
+
+def budget(cap: float) -> float:
+    """min(cap, 남은 시간) — 남은 시간이 없으면 DeadlineExceeded"""
+    left = remaining()
+    if left is None:
+        return cap
+    if left <= 0:
+        raise DeadlineExceeded("요청 마감시각 초과")
+    return min(cap, left)
+
+
+def mark_degraded(reason: str) -> None:
+    reasons = _degraded.get()
+    if reasons is not None and reason not in reasons:
+        reasons.append(reason)
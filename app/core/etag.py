@@ -0,0 +1,24 @@
+# app/core/etag.py
+# -----------------------------------------------------------------------------
+# 조건부 요청 (If-None-Match) 판정
+# - 헤더는 목록(W/"a", W/"b") 또는 "*" 일 수 있음 (CDN/리버스 프록시)
+# - GET/HEAD 규칙대로 약한 비교: W/ 접두어를 떼고 따옴표 포함 값이 같으면 일치
+# -----------------------------------------------------------------------------
+from __future__ import annotations
+
+from typing import Optional
+
+
+def _opaque(tag: str) -> str:
+    tag = tag.strip()
+    return tag[2:] if tag[:2] in ("W/", "w/") else tag
+
+
+def etag_matches(if_none_match: Optional[str], etag: Optional[str]) -> bool:
+    """If-None-Match 헤더가 etag와 (약한 비교로) 일치하면 True → 304"""
+    if not if_none_match or not etag:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    mine = _opaque(etag)
+    return any(_opaque(tag) == mine for tag in if_none_match.split(","))
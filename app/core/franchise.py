@@ -0,0 +1,196 @@
+# app/core/franchise.py
+# -----------------------------------------------------------------------------
+# 프랜차이즈 브랜드 판정 (상호명 다중 패턴 매칭)
+# - BRANDS: 대표 브랜드명 → 별칭(한/영 표기, 약칭)
+# - 정규화: NFKC + 소문자 + 괄호 내용 제거 + 공백 뒤 지점 접미사('… 수성못점') 제거
+#           + 한글/영문/숫자 외 문자 제거 → '투썸 플레이스' == '투썸플레이스'
+# - 매칭: 별칭 전체로 만든 Aho-Corasick 자동자 한 번 통과 (이름 길이에 선형,
+#         브랜드 수와 무관), 겹치면 가장 긴 별칭
+#   · 오탐 방지: 별칭은 단어(공백/기호로 나뉜 토큰) 시작에서만 인정,
+#     SHORT_ALIAS 글자 이하 별칭은 단어 끝(또는 '커피/카페' 접미)까지 맞아야 함
+#     → '개인카페 공차장' ≠ 공차, '커피빈스' ≠ 커피빈, '공차 범어점' = 공차
+# - Kakao category_name 마지막 단계(예: '… > 커피전문점 > 스타벅스')도 같은 자동자로,
+#   카테고리에 '프랜차이즈'가 명시된 데이터도 프랜차이즈로
+# - 저장 시 한 번 판정해 Place.is_franchise/brand에 기록 (crud.save_kakao_places)
+# -----------------------------------------------------------------------------
+from __future__ import annotations
+
+import re
+import unicodedata
+from collections import deque
+from functools import lru_cache
+from typing import Generic, Iterable, Iterator, TypeVar
+
+FRANCHISE_TOKEN = "프랜차이즈"
+
+BRANDS: dict[str, tuple[str, ...]] = {
+    "스타벅스": ("스타벅스", "starbucks"),
+    "이디야커피": ("이디야", "ediya"),
+    "메가MGC커피": ("메가커피", "메가엠지씨커피", "메가mgc커피", "megacoffee"),
+    "투썸플레이스": ("투썸플레이스", "투썸", "twosomeplace", "atwosomeplace"),
+    "빽다방": ("빽다방", "paikdabang", "paikscoffee"),
+    "컴포즈커피": ("컴포즈커피", "composecoffee"),
+    "할리스": ("할리스", "hollys"),
+    "커피빈": ("커피빈", "coffeebean"),
+    "파스쿠찌": ("파스쿠찌", "pascucci"),
+    "엔제리너스": ("엔제리너스", "angelinus"),
+    "탐앤탐스": ("탐앤탐스", "tomntoms"),
+    "폴바셋": ("폴바셋", "paulbassett"),
+    "더벤티": ("더벤티", "theventi"),
+    "매머드커피": ("매머드커피", "매머드익스프레스", "mammothcoffee"),
+    "카페베네": ("카페베네", "caffebene"),
+    "드롭탑": ("드롭탑", "droptop"),
+    "요거프레소": ("요거프레소", "yogerpresso"),
+    "커피에반하다": ("커피에반하다",),
+    "텐퍼센트커피": ("텐퍼센트커피", "10퍼센트커피", "tenpercentcoffee"),
+    "감성커피": ("감성커피",),
+    "더리터": ("더리터", "theliter"),
+    "하삼동커피": ("하삼동커피",),
+    "커피명가": ("커피명가",),
+    "달콤커피": ("달콤커피", "dalkomm"),
+    "셀렉토커피": ("셀렉토커피", "selecto"),
+    "블루보틀": ("블루보틀", "bluebottle"),
+    "공차": ("공차", "gongcha"),
+    "던킨": ("던킨", "던킨도너츠", "dunkin", "dunkindonuts"),
+    "배스킨라빈스": ("배스킨라빈스", "베스킨라빈스", "baskinrobbins"),
+    "파리바게뜨": ("파리바게뜨", "파리바게트", "parisbaguette"),
+    "뚜레쥬르": ("뚜레쥬르", "touslesjours"),
+}
+
+_BRACKETS = re.compile(r"[(\[{（【].*?[)\]}）】]")
+_BRANCH = re.compile(r"\s+\S+점$")  # '스타벅스 대구수성못점' → '스타벅스'
+_NON_WORD = re.compile(r"[^0-9a-z가-힣]")
+_SEPARATORS = re.compile(r"[^0-9a-z가-힣]+")
+
+SHORT_ALIAS = 3  # 이 글자 수 이하 별칭은 단어 끝까지 일치해야 인정
+_GENERIC_SUFFIXES = ("커피", "카페", "coffee", "cafe")  # '이디야카페' 같은 붙여쓰기
+
+V = TypeVar("V")
+
+
+def normalize(text: str | None, *, strip_branch: bool = True) -> str:
+    """매칭용 정규화 (별칭/상호명 공용)"""
+    s = unicodedata.normalize("NFKC", text or "").lower()
+    s = _BRACKETS.sub(" ", s).strip()
+    if strip_branch:
+        s = _BRANCH.sub("", s)
+    return _NON_WORD.sub("", s)
+
+
+def _tokens(text: str | None) -> tuple[str, list[int]]:
+    """정규화 문자열 + 단어 시작 오프셋 (normalize와 같은 결과를 단어별로)"""
+    s = unicodedata.normalize("NFKC", text or "").lower()
+    s = _BRANCH.sub("", _BRACKETS.sub(" ", s).strip())
+    parts = [p for p in _SEPARATORS.split(s) if p]
+    starts, pos = [], 0
+    for p in parts:
+        starts.append(pos)
+        pos += len(p)
+    return "".join(parts), starts
+
+
+class AhoCorasick(Generic[V]):
+    """
+    다중 패턴 부분 문자열 매칭 자동자 (순수 파이썬).
+    goto[s]: 문자 → 다음 상태, fail[s]: 실패 링크, out[s]: (패턴 길이, 값) 목록
+    """
+
+    def __init__(self, patterns: Iterable[tuple[str, V]]):
+        self._goto: list[dict[str, int]] = [{}]
+        self._fail: list[int] = [0]
+        self._out: list[list[tuple[int, V]]] = [[]]
+        for pat, value in patterns:
+            if pat:
+                self._add(pat, value)
+        self._link()
+
+    def _add(self, pat: str, value: V) -> None:
+        s = 0
+        for ch in pat:
+            nxt = self._goto[s].get(ch)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[s][ch] = nxt
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append([])
+            s = nxt
+        self._out[s].append((len(pat), value))
+
+    def _link(self) -> None:
+        """BFS로 실패 링크 + 출력 병합 (접미사로 끝나는 패턴도 보고)"""
+        queue = deque(self._goto[0].values())
+        while queue:
+            s = queue.popleft()
+            for ch, nxt in self._goto[s].items():
+                queue.append(nxt)
+                f = self._fail[s]
+                while f and ch not in self._goto[f]:
+                    f = self._fail[f]
+                cand = self._goto[f].get(ch, 0)
+                self._fail[nxt] = cand if cand != nxt else 0
+                self._out[nxt] = self._out[nxt] + self._out[self._fail[nxt]]
+
+    def __len__(self) -> int:
+        return len(self._goto)
+
+    def finditer(self, text: str) -> Iterator[tuple[int, int, V]]:
+        """(시작, 끝, 값) — text 한 번 통과"""
+        s = 0
+        goto, fail, out = self._goto, self._fail, self._out
+        for i, ch in enumerate(text):
+            while s and ch not in goto[s]:
+                s = fail[s]
+            s = goto[s].get(ch, 0)
+            for n, value in out[s]:
+                yield i + 1 - n, i + 1, value
+
+    def longest(self, text: str) -> V | None:
+        """가장 긴 매칭의 값 (같은 길이면 먼저 끝나는 쪽)"""
+        best, best_len = None, 0
+        for start, end, value in self.finditer(text):
+            if end - start > best_len:
+                best, best_len = value, end - start
+        return best
+
+
+@lru_cache(maxsize=1)
+def _matcher() -> AhoCorasick[str]:
+    return AhoCorasick(
+        (normalize(alias, strip_branch=False), brand)
+        for brand, aliases in BRANDS.items()
+        for alias in (brand, *aliases)
+    )
+
+
+def _word_end(text: str, starts: list[int], end: int) -> bool:
+    """end가 단어 끝이거나 뒤가 일반 접미어('커피/카페')로 이어지는지"""
+    nxt = next((p for p in starts if p >= end), len(text))
+    rest = text[end:nxt]
+    return rest == "" or rest.startswith(_GENERIC_SUFFIXES)
+
+
+def match_brand(name: str | None) -> str | None:
+    """상호명 → 대표 브랜드명 (없으면 None). 단어 시작에서 맞는 가장 긴 별칭"""
+    text, starts = _tokens(name)
+    word_starts = set(starts)
+    best, best_len = None, 0
+    for start, end, brand in _matcher().finditer(text):
+        n = end - start
+        if n <= best_len or start not in word_starts:
+            continue
+        if n <= SHORT_ALIAS and not _word_end(text, starts, end):
+            continue
+        best, best_len = brand, n
+    return best
+
+
+def classify(name: str | None, category: str | None = None) -> tuple[bool, str | None]:
+    """
+    (프랜차이즈 여부, 브랜드). 상호명 우선, 없으면 Kakao 카테고리 마지막 단계.
+    카테고리에 '프랜차이즈'가 명시돼 있으면 브랜드를 몰라도 프랜차이즈.
+    """
+    brand = match_brand(name)
+    if brand is None and category:
+        brand = match_brand(category.rsplit(">", 1)[-1])
+    return brand is not None or FRANCHISE_TOKEN in (category or ""), brand
@@ -0,0 +1,129 @@
+# app/core/geo.py
+# -----------------------------------------------------------------------------
+# 구면 거리/반경 유틸 (NumPy 벡터화)
+# - bounding_box: 위도/경도 축별 deg 델타로 반경을 감싸는 최소 상자 (SQL 선필터)
+# - haversine_m : 한 점 → 다수 점 대원거리(m)
+# - within_radius: 반경 내 인덱스와 거리, 거리 오름차순 (객체 단위 루프 없음)
+# - planar_dist2 : 국소 등장방형 거리²(m²) — SQL 집계식과 같은 연산 순서
+# - GridSpec     : 고정 범위 정사각(m) 격자 — 좌표 → 셀 번호 (SQL 식과 같은 연산)
+# -----------------------------------------------------------------------------
+from __future__ import annotations
+
+import math
+
+import numpy as np
+
+EARTH_RADIUS_M = 6_371_008.8
+M_PER_DEG_LAT = math.pi * EARTH_RADIUS_M / 180  # ≈ 111,195m
+
+
+def degree_deltas(lat: float, radius_m: float) -> tuple[float, float]:
+    """
+    반경 radius_m를 감싸는 (Δlat, Δlon) [deg].
+    경도 1도 길이는 cos(위도)배 → 대구(≈35.8°)에서 약 90km.
+    상자 안 가장 고위도 쪽 cos를 써서 안쪽이 잘리지 않게 함.
+    """
+    dlat = radius_m / M_PER_DEG_LAT
+    far_lat = min(89.9, abs(lat) + dlat)
+    dlon = dlat / math.cos(math.radians(far_lat))
+    return dlat, dlon
+
+
+def bounding_box(
+    lat: float, lon: float, radius_m: float
+) -> tuple[float, float, float, float]:
+    """(min_lat, min_lon, max_lat, max_lon)"""
+    dlat, dlon = degree_deltas(lat, radius_m)
+    return lat - dlat, lon - dlon, lat + dlat, lon + dlon
+
+
+def haversine_m(lat0: float, lon0: float, lats, lons) -> np.ndarray:
+    """(lat0, lon0) → (lats, lons)[deg] 대원거리(m)"""
+    p0 = math.radians(lat0)
+    p = np.radians(np.asarray(lats, dtype=np.float64))
+    dphi = p - p0
+    dlmb = np.radians(np.asarray(lons, dtype=np.float64)) - math.radians(lon0)
+    a = np.sin(dphi / 2) ** 2 + math.cos(p0) * np.cos(p) * np.sin(dlmb / 2) ** 2
+    return 2 * EARTH_RADIUS_M * np.arcsin(np.sqrt(np.clip(a, 0.0, 1.0)))
+
+
+def within_radius(
+    lat0: float, lon0: float, lats, lons, radius_m: float
+) -> tuple[np.ndarray, np.ndarray]:
+    """반경 내 원소 인덱스와 거리(m), 거리 오름차순"""
+    dist = haversine_m(lat0, lon0, lats, lons)
+    idx = np.flatnonzero(dist <= radius_m)
+    order = np.argsort(dist[idx], kind="stable")
+    return idx[order], dist[idx][order]
+
+
+def local_scale(lat0: float) -> tuple[float, float]:
+    """(lat0 부근) 위도/경도 1도당 m — 등장방형 근사 계수 (ky, kx)"""
+    return M_PER_DEG_LAT, M_PER_DEG_LAT * math.cos(math.radians(lat0))
+
+
+def planar_dist2(lat0: float, lon0: float, lats, lons) -> np.ndarray:
+    """
+    국소 등장방형 거리²(m²). 5km 이내에서 haversine과 0.1% 미만 차이.
+    crud.aggregate_places_in_radius의 SQL 식과 같은 순서로 계산 → 경계 판정 일치.
+    """
+    ky, kx = local_scale(lat0)
+    dy = (np.asarray(lats, dtype=np.float64) - lat0) * ky
+    dx = (np.asarray(lons, dtype=np.float64) - lon0) * kx
+    return dy * dy + dx * dx
+
+
+class GridSpec:
+    """
+    [min_lat, max_lat) × [min_lon, max_lon) 범위의 cell_m 정사각 격자.
+    셀 크기(deg)는 범위 중앙 위도 기준으로 고정 → 격자 전체에서 셀이 (거의) 정사각.
+    셀 번호 cell = cy * nx + cx, cy = floor((lat - min_lat) / dlat).
+    """
+
+    __slots__ = ("min_lat", "min_lon", "cell_m", "dlat", "dlon", "ny", "nx", "key")
+
+    def __init__(
+        self,
+        min_lat: float,
+        min_lon: float,
+        max_lat: float,
+        max_lon: float,
+        cell_m: float,
+    ):
+        ky, kx = local_scale((min_lat + max_lat) / 2)
+        self.min_lat, self.min_lon, self.cell_m = min_lat, min_lon, cell_m
+        self.dlat = cell_m / ky
+        self.dlon = cell_m / kx
+        self.ny = math.ceil((max_lat - min_lat) / self.dlat)
+        self.nx = math.ceil((max_lon - min_lon) / self.dlon)
+        self.key = f"{min_lat:.6f},{min_lon:.6f},{self.ny}x{self.nx}@{cell_m:g}m"
+
+    @property
+    def max_lat(self) -> float:
+        return self.min_lat + self.ny * self.dlat
+
+    @property
+    def max_lon(self) -> float:
+        return self.min_lon + self.nx * self.dlon
+
+    def cell_yx(self, lats, lons) -> tuple[np.ndarray, np.ndarray]:
+        """좌표 → (cy, cx). 범위 밖이면 음수/초과 인덱스 그대로"""
+        cy = np.floor((np.asarray(lats, dtype=np.float64) - self.min_lat) / self.dlat)
+        cx = np.floor((np.asarray(lons, dtype=np.float64) - self.min_lon) / self.dlon)
+        return cy.astype(np.int64), cx.astype(np.int64)
+
+    def cell_ids(self, lats, lons) -> np.ndarray:
+        """범위 안 좌표의 셀 번호 (범위 밖은 제외)"""
+        cy, cx = self.cell_yx(lats, lons)
+        inside = (cy >= 0) & (cy < self.ny) & (cx >= 0) & (cx < self.nx)
+        return cy[inside] * self.nx + cx[inside]
+
+    def covers(self, lat: float, lon: float, radius_m: float) -> bool:
+        """반경 원이 격자 범위 안에 완전히 들어가는지"""
+        min_lat, min_lon, max_lat, max_lon = bounding_box(lat, lon, radius_m)
+        return (
+            min_lat >= self.min_lat
+            and max_lat < self.max_lat
+            and min_lon >= self.min_lon
+            and max_lon < self.max_lon
+        )
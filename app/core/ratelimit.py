@@ -0,0 +1,208 @@
+# app/core/ratelimit.py
+# -----------------------------------------------------------------------------
+# 외부 API 호출 속도 제한
+# - AsyncTokenBucket : 프로세스 내 토큰 버킷 (여러 코루틴이 공유)
+# - SharedTokenBucket: 워커 간 공유 토큰 버킷 + 일일 쿼터 + 공용 쿨다운 (SQLite 파일)
+# -----------------------------------------------------------------------------
+from __future__ import annotations
+
+import asyncio
+import random
+import sqlite3
+import threading
+import time
+
+
+class AsyncTokenBucket:
+    """
+    초당 rate개 토큰을 채우고 최대 burst개까지 적립하는 토큰 버킷.
+    acquire()는 토큰이 생길 때까지 대기 (대기자는 도착 순서대로 처리).
+    rate <= 0 이면 제한 없음.
+    """
+
+    def __init__(self, rate: float, burst: int = 1):
+        self.rate = float(rate)
+        self.burst = max(1, int(burst))
+        self._tokens = float(self.burst)
+        self._last = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(self.burst, self._tokens + (now - self._last) * self.rate)
+        self._last = now
+
+    async def acquire(self) -> None:
+        if self.rate <= 0:
+            return
+        async with self._lock:
+            while True:
+                self._refill()
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+
+class RateLimitExceeded(RuntimeError):
+    """일일 쿼터 소진 또는 허용 대기시간 초과"""
+
+
+class SharedTokenBucket:
+    """
+    여러 워커(프로세스)가 SQLite 파일 하나로 공유하는 토큰 버킷.
+    - 토큰 보충/차감, 일일 사용량, 공용 쿨다운(429 등)을 BEGIN IMMEDIATE 한 번에 처리
+    - priority="background"는 토큰 reserve개와 일일 쿼터 일부를 interactive용으로 남김
+    rate <= 0 이면 제한 없음.
+    """
+
+    PRIORITIES = ("interactive", "background")
+
+    def __init__(
+        self,
+        path: str,
+        name: str,
+        *,
+        rate: float,
+        burst: int = 1,
+        daily_quota: int = 0,
+        reserve: float = 0.0,
+        background_quota_frac: float = 1.0,
+    ):
+        self.path = path
+        self.name = name
+        self.rate = float(rate)
+        self.burst = max(1, int(burst))
+        self.daily_quota = int(daily_quota)
+        self.reserve = float(reserve)
+        self.background_quota_frac = float(background_quota_frac)
+        self._local = threading.local()
+
+    # ── SQLite (스레드별 연결, asyncio.to_thread에서 호출) ─────────────────────
+    def _conn(self) -> sqlite3.Connection:
+        con = getattr(self._local, "con", None)
+        if con is None:
+            con = sqlite3.connect(self.path, timeout=10, isolation_level=None)
+            con.execute("PRAGMA journal_mode=WAL")
+            con.execute(
+                "CREATE TABLE IF NOT EXISTS rate_buckets ("
+                " name TEXT PRIMARY KEY, tokens REAL, updated REAL,"
+                " day TEXT, used INTEGER, cooldown_until REAL)"
+            )
+            self._local.con = con
+        return con
+
+    def _load(self, con: sqlite3.Connection, now: float) -> list:
+        row = con.execute(
+            "SELECT tokens, updated, day, used, cooldown_until"
+            " FROM rate_buckets WHERE name = ?",
+            (self.name,),
+        ).fetchone()
+        today = time.strftime("%Y-%m-%d")
+        if row is None:
+            return [float(self.burst), now, today, 0, 0.0]
+        tokens, updated, day, used, cooldown = row
+        tokens = min(self.burst, tokens + max(0.0, now - updated) * self.rate)
+        if day != today:
+            day, used = today, 0
+        return [tokens, now, day, used, cooldown]
+
+    def _store(self, con: sqlite3.Connection, st: list) -> None:
+        con.execute(
+            "INSERT OR REPLACE INTO rate_buckets"
+            " (name, tokens, updated, day, used, cooldown_until)"
+            " VALUES (?, ?, ?, ?, ?, ?)",
+            (self.name, *st),
+        )
+
+    def _take(self, priority: str) -> float:
+        """토큰 1개 차감 시도 → 0이면 획득, 아니면 다시 시도할 때까지 대기(초)"""
+        con = self._conn()
+        now = time.time()
+        con.execute("BEGIN IMMEDIATE")
+        try:
+            st = self._load(con, now)
+            tokens, _, _, used, cooldown = st
+            background = priority == "background"
+            quota = self.daily_quota
+            if quota and background:
+                quota = int(quota * self.background_quota_frac)
+            if cooldown > now:
+                wait = cooldown - now
+            elif quota and used >= quota:
+                raise RateLimitExceeded(
+                    f"{self.name}: 일일 쿼터 소진 ({used}/{quota}, {priority})"
+                )
+            else:
+                need = 1.0 + (self.reserve if background else 0.0)
+                if tokens >= need:
+                    st[0] = tokens - 1
+                    st[3] = used + 1
+                    wait = 0.0
+                else:
+                    wait = (need - tokens) / self.rate
+            self._store(con, st)
+            con.execute("COMMIT")
+        except BaseException:
+            con.execute("ROLLBACK")
+            raise
+        return wait
+
+    def _penalize(self, seconds: float) -> None:
+        con = self._conn()
+        now = time.time()
+        con.execute("BEGIN IMMEDIATE")
+        try:
+            st = self._load(con, now)
+            st[4] = max(st[4], now + seconds)
+            self._store(con, st)
+            con.execute("COMMIT")
+        except BaseException:
+            con.execute("ROLLBACK")
+            raise
+
+    def _state(self) -> dict:
+        con = self._conn()
+        now = time.time()
+        tokens, _, day, used, cooldown = self._load(con, now)
+        return {
+            "name": self.name,
+            "rate": self.rate,
+            "burst": self.burst,
+            "tokens": round(tokens, 2),
+            "day": day,
+            "used_today": used,
+            "daily_quota": self.daily_quota,
+            "cooldown_s": round(max(0.0, cooldown - now), 2),
+        }
+
+    # ── 비동기 API ───────────────────────────────────────────────────────────
+    async def acquire(
+        self, priority: str = "interactive", *, max_wait: float | None = None
+    ) -> None:
+        """토큰 획득까지 대기. max_wait 초과 예상이면 RateLimitExceeded"""
+        if self.rate <= 0:
+            return
+        if priority not in self.PRIORITIES:
+            raise ValueError(f"unknown priority: {priority}")
+        waited = 0.0
+        while True:
+            wait = await asyncio.to_thread(self._take, priority)
+            if wait <= 0:
+                return
+            # 워커들이 같은 시각에 몰려 깨어나지 않도록 지터
+            wait *= random.uniform(1.0, 1.25)
+            if max_wait is not None and waited + wait > max_wait:
+                raise RateLimitExceeded(
+                    f"{self.name}: 토큰 대기 {waited + wait:.1f}s > {max_wait:.1f}s"
+                )
+            await asyncio.sleep(wait)
+            waited += wait
+
+    async def penalize(self, seconds: float) -> None:
+        """모든 워커가 seconds 동안 토큰을 받지 못하게 (상류 429/Retry-After)"""
+        if seconds > 0:
+            await asyncio.to_thread(self._penalize, seconds)
+
+    async def state(self) -> dict:
+        return await asyncio.to_thread(self._state)
@@ -1,36 +1,217 @@
 # app/db/crud.py
 # -----------------------------------------------------------------------------
 # 읽기/쓰기 유틸 함수 모음
-# - bbox 조회
+# - bbox 조회 (SQLite면 R*Tree 공간 인덱스 경유, app/db/spatial.py)
+# - 반경 집계(단일 SQL) / 필요한 컬럼만 뽑는 컬럼형 조회
 # - 좌표 근접 조회(+ 업서트 예시)
+# - 벌크 업서트(INSERT ... ON CONFLICT DO UPDATE, 페이지/분기 단위 1트랜잭션)
+# - 격자 셀 집계/저장 (app/services/grid.py)
+# - 장소별 피처 저장 + 데이터 버전 (app/services/feature_store.py)
 # -----------------------------------------------------------------------------
-from sqlalchemy import select, and_, func, desc
+from dataclasses import dataclass
+
+import numpy as np
+from sqlalchemy import (
+    Integer,
+    select,
+    and_,
+    case,
+    cast,
+    true,
+    delete,
+    func,
+    desc,
+    insert,
+    update,
+)
 from sqlalchemy.ext.asyncio import AsyncSession
-from app.db.models import Place, FootTrafficQuarter
-from typing import Sequence, Optional
+from app.core import geo
+from app.core.franchise import classify
+from app.db.models import (
+    Place,
+    FootTrafficQuarter,
+    IngestState,
+    IngestJob,
+    GridCell,
+    GridFTQ,
+    GridMeta,
+    PlaceFeature,
+    FeatureStoreMeta,
+)
+from app.db.events import stage
+from app.db.spatial import bbox_filter
+from typing import Iterable, Sequence, Optional
+
+# 멀티 VALUES 한 문장당 최대 행 수 (행당 컬럼 ~7개 × 2000 < SQLite 바인드 한도 32766)
+_BULK_CHUNK = 2000
 
 
 async def get_places_bbox(
     db: AsyncSession, min_lat: float, min_lon: float, max_lat: float, max_lon: float
 ) -> Sequence[Place]:
-    stmt = select(Place).where(
-        Place.lat.between(min_lat, max_lat),
-        Place.lon.between(min_lon, max_lon),
-    )
+    stmt = select(Place).where(*bbox_filter(Place, min_lat, min_lon, max_lat, max_lon))
     res = await db.execute(stmt)
     return res.scalars().all()
 
 
+async def get_ids_within_radius(
+    db: AsyncSession, lat: float, lon: float, radius_m: float
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    반경 내 Place (ids, 거리 m), 거리 오름차순.
+    - SQL: 축별 deg 델타 상자로 (id, lat, lon)만 선필터
+    - NumPy: haversine 후필터 (상자 모서리 제거)
+    """
+    box = geo.bounding_box(lat, lon, radius_m)
+    stmt = select(Place.id, Place.lat, Place.lon).where(*bbox_filter(Place, *box))
+    rows = (await db.execute(stmt)).all()
+    if not rows:
+        return np.empty(0, dtype=np.int64), np.empty(0)
+    arr = np.array(rows, dtype=np.float64)
+    idx, dist = geo.within_radius(lat, lon, arr[:, 1], arr[:, 2], radius_m)
+    return arr[idx, 0].astype(np.int64), dist
+
+
+async def get_places_within_radius(
+    db: AsyncSession, lat: float, lon: float, radius_m: float
+) -> tuple[list[Place], np.ndarray]:
+    """반경 내 Place 객체와 거리(m), 거리순 — 반경 안 행만 ORM으로 적재"""
+    ids, dist = await get_ids_within_radius(db, lat, lon, radius_m)
+    return await get_places_by_ids(db, ids), dist
+
+
+# ── 반경 집계 / 컬럼형 조회 ──────────────────────────────────────────────────
+@dataclass(slots=True)
+class AreaAggregate:
+    count: int = 0
+    franchise: int = 0
+    personal: int = 0
+    avg_foot_traffic: float | None = None  # foot_traffic > 0 인 장소 평균
+
+
+def is_franchise():
+    """프랜차이즈 판정 SQL 식 (반경 집계/격자 집계 공용) — 저장 시 판정한 인덱스 컬럼"""
+    return Place.is_franchise == true()
+
+
+def _radius_predicate(lat: float, lon: float, radius_m: float):
+    """bbox 선필터 + 국소 등장방형 거리² ≤ r² (geo.planar_dist2와 동일 연산)"""
+    ky, kx = geo.local_scale(lat)
+    dy = (Place.lat - lat) * ky
+    dx = (Place.lon - lon) * kx
+    box = geo.bounding_box(lat, lon, radius_m)
+    return [*bbox_filter(Place, *box), dy * dy + dx * dx <= radius_m * radius_m]
+
+
+async def aggregate_places_in_radius(
+    db: AsyncSession, lat: float, lon: float, radius_m: float
+) -> AreaAggregate:
+    """
+    반경 내 장소 수/프랜차이즈 수/개인 수/평균 유동인구를 한 문장으로 집계.
+    ORM 객체를 만들지 않고 category/foot_traffic 컬럼만 읽음.
+    """
+    stmt = select(
+        func.count(),
+        func.coalesce(func.sum(case((is_franchise(), 1), else_=0)), 0),
+        func.avg(case((Place.foot_traffic > 0, Place.foot_traffic))),
+    ).where(*_radius_predicate(lat, lon, radius_m))
+    count, franchise, avg_ft = (await db.execute(stmt)).one()
+    return AreaAggregate(
+        count=int(count),
+        franchise=int(franchise),
+        personal=int(count) - int(franchise),
+        avg_foot_traffic=float(avg_ft) if avg_ft is not None else None,
+    )
+
+
+async def fetch_place_columns(
+    db: AsyncSession,
+    lat: float,
+    lon: float,
+    radius_m: float,
+    columns: Sequence[str] = ("id", "lat", "lon", "category", "foot_traffic"),
+) -> dict[str, np.ndarray]:
+    """반경 내 장소를 요청 컬럼만 NumPy 배열로 (컬럼명 → 배열)"""
+    cols = [getattr(Place, c) for c in columns]
+    rows = (
+        await db.execute(select(*cols).where(*_radius_predicate(lat, lon, radius_m)))
+    ).all()
+    if not rows:
+        return {c: np.empty(0) for c in columns}
+    return {c: np.array(v) for c, v in zip(columns, zip(*rows))}
+
+
+async def fetch_place_stats_bbox(
+    db: AsyncSession,
+    min_lat: float,
+    min_lon: float,
+    max_lat: float,
+    max_lon: float,
+    *,
+    with_category: bool = False,
+    with_id: bool = False,
+) -> dict[str, np.ndarray]:
+    """
+    상자 내 장소의 집계용 컬럼 (lat, lon, franchise 0/1, foot_traffic).
+    with_category면 category(object, 없으면 ""), with_id면 id도 함께.
+    여러 지점 반경 집계를 한 번의 조회 + NumPy로 처리할 때 사용.
+    """
+    extra = {}
+    if with_category:
+        extra["category"] = (func.coalesce(Place.category, ""), object)
+    if with_id:
+        extra["id"] = (Place.id, np.int64)
+    stmt = select(
+        Place.lat,
+        Place.lon,
+        case((is_franchise(), 1), else_=0),
+        func.coalesce(Place.foot_traffic, 0),
+        *(col for col, _ in extra.values()),
+    ).where(*bbox_filter(Place, min_lat, min_lon, max_lat, max_lon))
+    rows = (await db.execute(stmt)).all()
+    # Row → 열 단위 (np.array(Row) 회피)
+    cols = list(zip(*rows)) or [()] * (4 + len(extra))
+    out = {
+        "lat": np.array(cols[0], dtype=np.float64),
+        "lon": np.array(cols[1], dtype=np.float64),
+        "franchise": np.array(cols[2], dtype=np.int64),
+        "foot_traffic": np.array(cols[3], dtype=np.int64),
+    }
+    for i, (name, (_, dtype)) in enumerate(extra.items(), start=4):
+        out[name] = np.array(cols[i], dtype=dtype)
+    return out
+
+
+async def get_places_by_ids(db: AsyncSession, ids: Sequence[int]) -> list[Place]:
+    """id 목록의 Place를 입력 순서대로 반환 (없는 id는 제외)"""
+    if len(ids) == 0:
+        return []
+    ids = [int(i) for i in ids]
+    by_id: dict[int, Place] = {}
+    for i in range(0, len(ids), _BULK_CHUNK):  # SQLite 바인드 변수 상한 회피
+        part = ids[i : i + _BULK_CHUNK]
+        res = await db.execute(select(Place).where(Place.id.in_(part)))
+        by_id.update((p.id, p) for p in res.scalars().all())
+    return [by_id[i] for i in ids if i in by_id]
+
+
+async def get_place_coords(db: AsyncSession, *, after_id: int = 0) -> list[tuple]:
+    """(id, lat, lon, foot_traffic, category) 경량 조회 — 인메모리 공간 인덱스 스냅샷용"""
+    stmt = (
+        select(Place.id, Place.lat, Place.lon, Place.foot_traffic, Place.category)
+        .where(Place.id > after_id, Place.lat.is_not(None), Place.lon.is_not(None))
+        .order_by(Place.id)
+    )
+    return (await db.execute(stmt)).all()
+
+
 async def get_nearby_place(
     db: AsyncSession, lat: float, lon: float, eps: float = 0.0005
 ) -> Place | None:
     """대략 수십 m 박스 내 근접 장소 1건"""
     stmt = (
         select(Place)
-        .where(
-            Place.lat.between(lat - eps, lat + eps),
-            Place.lon.between(lon - eps, lon + eps),
-        )
+        .where(*bbox_filter(Place, lat - eps, lon - eps, lat + eps, lon + eps))
         .limit(1)
     )
     res = await db.execute(stmt)
@@ -46,28 +227,43 @@ async def upsert_place_with_foot_traffic(db, name, lat, lon, foot_traffic):
     else:
         place = Place(name=name, lat=lat, lon=lon, foot_traffic=foot_traffic)
         db.add(place)
+    await db.flush()
+    stage(
+        db,
+        "places",
+        [
+            {
+                "id": place.id,
+                "lat": lat,
+                "lon": lon,
+                "foot_traffic": foot_traffic,
+                "category": place.category,
+            }
+        ],
+    )
     await db.commit()
 
 
 async def save_kakao_places(db: AsyncSession, places: list[dict]) -> int:
-    inserted = 0
-    for p in places:
-        stmt = select(Place).where(
-            and_(Place.name == p["name"], Place.lat == p["lat"], Place.lon == p["lon"])
+    """
+    Kakao 장소 저장 — 좌표(자연키)가 이미 있으면 기존 행 유지.
+    프랜차이즈 여부/브랜드는 여기서 한 번 판정해 저장 (요청 시 재판정 없음).
+    """
+    rows = []
+    for p in dedupe_by_coord(places):
+        category = p.get("category") or "카페"
+        franchise, brand = classify(p["name"], category)
+        rows.append(
+            {
+                "name": p["name"],
+                "category": category,
+                "lat": p["lat"],
+                "lon": p["lon"],
+                "is_franchise": franchise,
+                "brand": brand,
+            }
         )
-        res = await db.execute(stmt)
-        if not res.scalar_one_or_none():
-            db.add(
-                Place(
-                    name=p["name"],
-                    category=p.get("category") or "카페",
-                    lat=p["lat"],
-                    lon=p["lon"],
-                )
-            )
-            inserted += 1
-    await db.commit()
-    return inserted
+    return await insert_places_ignore(db, rows)
 
 
 async def widen_bbox_places(
@@ -76,8 +272,7 @@ async def widen_bbox_places(
     """점차 반경을 키워가며 Place 검색"""
     for d in radii:
         stmt = select(Place).where(
-            Place.lat.between(lat - d, lat + d),
-            Place.lon.between(lon - d, lon + d),
+            *bbox_filter(Place, lat - d, lon - d, lat + d, lon + d)
         )
         res = await db.execute(stmt)
         rows = res.scalars().all()
@@ -102,35 +297,507 @@ async def upsert_ftq(
         db.add(
             FootTrafficQuarter(year=year, quarter=quarter, lat=lat, lon=lon, pop=pop)
         )
+    stage(db, "ftq", {"year": year, "quarter": quarter, "coords": [(lat, lon)]})
     await db.commit()
 
 
+def _latest_ftq_period():
+    """최신 (year, quarter) 1행 서브쿼리"""
+    F = FootTrafficQuarter
+    return (
+        select(F.year, F.quarter)
+        .order_by(desc(F.year), desc(F.quarter))
+        .limit(1)
+        .subquery()
+    )
+
+
+def _join_latest_ftq(stmt):
+    latest = _latest_ftq_period()
+    F = FootTrafficQuarter
+    return stmt.join(
+        latest, and_(F.year == latest.c.year, F.quarter == latest.c.quarter)
+    )
+
+
 async def get_ftq_recent_near(
     db: AsyncSession, lat: float, lon: float, deg: float = 0.03
 ) -> Optional[int]:
-    max_year = (
-        await db.execute(select(func.max(FootTrafficQuarter.year)))
-    ).scalar_one_or_none()
-    if not max_year:
-        return None
-    max_quarter = (
-        await db.execute(
-            select(func.max(FootTrafficQuarter.quarter)).where(
-                FootTrafficQuarter.year == max_year
-            )
+    """최신 분기의 (lat±deg, lon±deg) 상자 내 최대 유동인구 — 한 문장"""
+    F = FootTrafficQuarter
+    stmt = _join_latest_ftq(select(func.max(F.pop)).select_from(F)).where(
+        *bbox_filter(F, lat - deg, lon - deg, lat + deg, lon + deg)
+    )
+    mx = (await db.execute(stmt)).scalar_one_or_none()
+    return int(mx) if mx and mx > 0 else None
+
+
+async def get_latest_ftq_rows(
+    db: AsyncSession,
+) -> tuple[tuple[int, int] | None, list[tuple]]:
+    """최신 분기 (year, quarter)와 그 분기 전체 (lat, lon, pop) — 한 문장"""
+    F = FootTrafficQuarter
+    stmt = _join_latest_ftq(select(F.year, F.quarter, F.lat, F.lon, F.pop))
+    rows = (await db.execute(stmt)).all()
+    if not rows:
+        return None, []
+    return (rows[0][0], rows[0][1]), [(r[2], r[3], r[4] or 0) for r in rows]
+
+
+# ── 벌크 업서트 ──────────────────────────────────────────────────────────────
+def _insert(db: AsyncSession, model):
+    """방언별 INSERT 구문 (ON CONFLICT 지원: sqlite / postgresql)"""
+    if db.bind.dialect.name == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+    else:
+        from sqlalchemy.dialects.sqlite import insert
+    return insert(model)
+
+
+def _chunks(rows: list[dict], size: int = _BULK_CHUNK):
+    for i in range(0, len(rows), size):
+        yield rows[i : i + size]
+
+
+def dedupe_by_coord(rows: Iterable[dict]) -> list[dict]:
+    """좌표(lat, lon) 기준 중복 제거 — 같은 좌표는 마지막 값 우선"""
+    return list({(r["lat"], r["lon"]): r for r in rows}.values())
+
+
+async def bulk_upsert_foot_traffic(
+    db: AsyncSession,
+    *,
+    year: int,
+    quarter: int,
+    rows: Iterable[dict],
+    commit: bool = True,
+) -> int:
+    """
+    페이지(또는 분기 전체) 단위 유동인구 벌크 업서트.
+    - rows: {"name", "lat", "lon", "pop"} 목록
+    - 좌표 기준 메모리 중복 제거 → 테이블당 INSERT ... ON CONFLICT DO UPDATE
+    - Place + FTQ를 하나의 트랜잭션으로 커밋 (commit=False면 호출자가 커밋)
+    반환: 중복 제거 후 적재 행 수
+    """
+    uniq = dedupe_by_coord(rows)
+    if not uniq:
+        return 0
+
+    place_rows = [
+        {"name": r["name"], "lat": r["lat"], "lon": r["lon"], "foot_traffic": r["pop"]}
+        for r in uniq
+    ]
+    ftq_rows = [
+        {
+            "year": year,
+            "quarter": quarter,
+            "lat": r["lat"],
+            "lon": r["lon"],
+            "pop": r["pop"],
+        }
+        for r in uniq
+    ]
+
+    written: list[dict] = []
+    for chunk in _chunks(place_rows):
+        stmt = _insert(db, Place).values(chunk)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["lat", "lon"],
+            set_={"foot_traffic": stmt.excluded.foot_traffic},
+        ).returning(Place.id, Place.lat, Place.lon, Place.foot_traffic, Place.category)
+        written.extend(r._asdict() for r in (await db.execute(stmt)).all())
+    stage(db, "places", written)
+
+    for chunk in _chunks(ftq_rows):
+        stmt = _insert(db, FootTrafficQuarter).values(chunk)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["year", "quarter", "lat", "lon"],
+            set_={"pop": stmt.excluded.pop},
         )
-    ).scalar_one_or_none()
-    if not max_quarter:
-        return None
-
-    mx = (
-        await db.execute(
-            select(func.max(FootTrafficQuarter.pop)).where(
-                FootTrafficQuarter.year == max_year,
-                FootTrafficQuarter.quarter == max_quarter,
-                FootTrafficQuarter.lat.between(lat - deg, lat + deg),
-                FootTrafficQuarter.lon.between(lon - deg, lon + deg),
+        await db.execute(stmt)
+    stage(
+        db,
+        "ftq",
+        {
+            "year": year,
+            "quarter": quarter,
+            "coords": [(r["lat"], r["lon"]) for r in uniq],
+        },
+    )
+
+    if commit:
+        await db.commit()
+    return len(uniq)
+
+
+async def insert_places_ignore(db: AsyncSession, rows: list[dict]) -> int:
+    """Place 일괄 INSERT (좌표 충돌 시 무시). 반환: 실제 삽입 행 수"""
+    written: list[dict] = []
+    for chunk in _chunks(rows):
+        stmt = (
+            _insert(db, Place)
+            .values(chunk)
+            .on_conflict_do_nothing(index_elements=["lat", "lon"])
+            .returning(
+                Place.id, Place.lat, Place.lon, Place.foot_traffic, Place.category
             )
         )
-    ).scalar_one_or_none()
-    return int(mx) if mx and mx > 0 else None
+        written.extend(r._asdict() for r in (await db.execute(stmt)).all())
+    stage(db, "places", written)
+    await db.commit()
+    return len(written)
+
+
+# ── 격자 셀 집계 ─────────────────────────────────────────────────────────────
+def _grid_cell(model, spec: geo.GridSpec):
+    """좌표 → 셀 번호 SQL 식 (GridSpec.cell_yx와 같은 연산, 범위 안에서 CAST=floor)"""
+    cy = cast((model.lat - spec.min_lat) / spec.dlat, Integer)
+    cx = cast((model.lon - spec.min_lon) / spec.dlon, Integer)
+    return cy * spec.nx + cx
+
+
+def _grid_where(model, spec: geo.GridSpec, cells: Sequence[int] | None) -> list:
+    """격자 범위(반개구간) + 선택 셀 목록이면 그 셀들을 감싸는 상자로 선필터"""
+    if cells is None:
+        lo_lat, lo_lon, hi_lat, hi_lon = (
+            spec.min_lat,
+            spec.min_lon,
+            spec.max_lat,
+            spec.max_lon,
+        )
+    else:
+        cy = np.asarray(cells) // spec.nx
+        cx = np.asarray(cells) % spec.nx
+        lo_lat = spec.min_lat + int(cy.min()) * spec.dlat
+        hi_lat = spec.min_lat + (int(cy.max()) + 1) * spec.dlat
+        lo_lon = spec.min_lon + int(cx.min()) * spec.dlon
+        hi_lon = spec.min_lon + (int(cx.max()) + 1) * spec.dlon
+    where = [
+        *bbox_filter(model, lo_lat, lo_lon, hi_lat, hi_lon),
+        model.lat >= spec.min_lat,
+        model.lat < spec.max_lat,
+        model.lon >= spec.min_lon,
+        model.lon < spec.max_lon,
+    ]
+    if cells is not None:
+        where.append(_grid_cell(model, spec).in_([int(c) for c in cells]))
+    return where
+
+
+async def grid_place_aggregates(
+    db: AsyncSession, spec: geo.GridSpec, cells: Sequence[int] | None = None
+) -> list[tuple]:
+    """셀별 (cell, 장소 수, 프랜차이즈 수, ft 합, ft>0 개수) — cells=None이면 전체"""
+    cell = _grid_cell(Place, spec)
+    stmt = (
+        select(
+            cell,
+            func.count(),
+            func.coalesce(func.sum(case((is_franchise(), 1), else_=0)), 0),
+            func.coalesce(
+                func.sum(case((Place.foot_traffic > 0, Place.foot_traffic), else_=0)), 0
+            ),
+            func.coalesce(func.sum(case((Place.foot_traffic > 0, 1), else_=0)), 0),
+        )
+        .where(*_grid_where(Place, spec, cells))
+        .group_by(cell)
+    )
+    return [tuple(r) for r in (await db.execute(stmt)).all()]
+
+
+async def grid_ftq_aggregates(
+    db: AsyncSession,
+    spec: geo.GridSpec,
+    *,
+    year: int | None = None,
+    quarter: int | None = None,
+    cells: Sequence[int] | None = None,
+) -> list[tuple]:
+    """셀별 (year, quarter, cell, pop 합) — year/quarter 지정 시 해당 분기만"""
+    F = FootTrafficQuarter
+    cell = _grid_cell(F, spec)
+    stmt = select(F.year, F.quarter, cell, func.sum(F.pop)).where(
+        *_grid_where(F, spec, cells)
+    )
+    if year is not None:
+        stmt = stmt.where(F.year == year, F.quarter == quarter)
+    stmt = stmt.group_by(F.year, F.quarter, cell)
+    return [tuple(r) for r in (await db.execute(stmt)).all()]
+
+
+async def load_grid_cells(db: AsyncSession, spec_key: str) -> list[tuple]:
+    stmt = select(
+        GridCell.cell,
+        GridCell.competitors,
+        GridCell.franchise,
+        GridCell.ft_sum,
+        GridCell.ft_n,
+    ).where(GridCell.spec == spec_key)
+    return [tuple(r) for r in (await db.execute(stmt)).all()]
+
+
+async def load_grid_ftq(db: AsyncSession, spec_key: str) -> list[tuple]:
+    stmt = select(GridFTQ.year, GridFTQ.quarter, GridFTQ.cell, GridFTQ.pop).where(
+        GridFTQ.spec == spec_key
+    )
+    return [tuple(r) for r in (await db.execute(stmt)).all()]
+
+
+async def grid_version(db: AsyncSession, spec_key: str) -> int:
+    """격자 데이터 버전 (저장마다 +1, 한 번도 저장 안 됐으면 0)"""
+    v = await db.scalar(select(GridMeta.version).where(GridMeta.spec == spec_key))
+    return v or 0
+
+
+async def _bump_grid_version(db: AsyncSession, spec_key: str) -> int:
+    stmt = _insert(db, GridMeta).values(spec=spec_key, version=1)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["spec"],
+        set_={"version": GridMeta.version + 1, "updated_at": func.now()},
+    )
+    await db.execute(stmt)
+    return await grid_version(db, spec_key)
+
+
+async def save_grid_cells(
+    db: AsyncSession,
+    spec_key: str,
+    rows: Sequence[tuple],
+    *,
+    cells: Sequence[int] | None = None,
+) -> int:
+    """
+    셀 집계 교체 저장 — cells=None이면 spec 전체, 아니면 해당 셀만 삭제 후 삽입.
+    같은 트랜잭션에서 격자 데이터 버전 +1, 반환: 새 버전
+    """
+    where = [GridCell.spec == spec_key]
+    if cells is None:
+        await db.execute(delete(GridCell).where(*where))
+    else:
+        for i in range(0, len(cells), _BULK_CHUNK):
+            part = [int(c) for c in cells[i : i + _BULK_CHUNK]]
+            await db.execute(delete(GridCell).where(*where, GridCell.cell.in_(part)))
+    values = [
+        {
+            "spec": spec_key,
+            "cell": int(c),
+            "competitors": int(n),
+            "franchise": int(f),
+            "ft_sum": int(s),
+            "ft_n": int(k),
+        }
+        for c, n, f, s, k in rows
+    ]
+    if values:
+        await db.execute(insert(GridCell), values)  # executemany (insertmanyvalues)
+    version = await _bump_grid_version(db, spec_key)
+    await db.commit()
+    return version
+
+
+async def save_grid_ftq(
+    db: AsyncSession,
+    spec_key: str,
+    rows: Sequence[tuple],
+    *,
+    year: int | None = None,
+    quarter: int | None = None,
+    cells: Sequence[int] | None = None,
+) -> int:
+    """
+    분기 셀 집계 교체 저장 — year/quarter(+cells) 범위만 삭제 후 삽입.
+    같은 트랜잭션에서 격자 데이터 버전 +1, 반환: 새 버전
+    """
+    where = [GridFTQ.spec == spec_key]
+    if year is not None:
+        where += [GridFTQ.year == year, GridFTQ.quarter == quarter]
+    if cells is None:
+        await db.execute(delete(GridFTQ).where(*where))
+    else:
+        for i in range(0, len(cells), _BULK_CHUNK):
+            part = [int(c) for c in cells[i : i + _BULK_CHUNK]]
+            await db.execute(delete(GridFTQ).where(*where, GridFTQ.cell.in_(part)))
+    values = [
+        {"spec": spec_key, "year": y, "quarter": q, "cell": int(c), "pop": int(p or 0)}
+        for y, q, c, p in rows
+    ]
+    if values:
+        await db.execute(insert(GridFTQ), values)  # executemany (insertmanyvalues)
+    version = await _bump_grid_version(db, spec_key)
+    await db.commit()
+    return version
+
+
+# ── 장소별 피처 스토어 ───────────────────────────────────────────────────────
+async def get_feature_store_version(db: AsyncSession, name: str) -> int | None:
+    """저장된 데이터 버전 (한 번도 구축되지 않았으면 None)"""
+    return await db.scalar(
+        select(FeatureStoreMeta.version).where(FeatureStoreMeta.name == name)
+    )
+
+
+async def save_place_features(
+    db: AsyncSession,
+    name: str,
+    columns: dict[str, np.ndarray],
+    *,
+    full: bool,
+) -> int:
+    """
+    피처 행 교체 저장 + 데이터 버전 +1 (한 트랜잭션).
+    columns: place_id와 PlaceFeature 컬럼명 → 배열 (NaN은 NULL).
+    full=True면 전체 삭제 후 삽입, 아니면 해당 place_id만. 반환: 새 버전
+    """
+    stmt = _insert(db, FeatureStoreMeta).values(name=name, version=1, rows=0)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["name"],
+        set_={"version": FeatureStoreMeta.version + 1, "updated_at": func.now()},
+    )
+    await db.execute(stmt)
+    version = await get_feature_store_version(db, name)
+
+    ids = [int(i) for i in columns["place_id"]]
+    if full:
+        await db.execute(delete(PlaceFeature))
+    else:
+        for i in range(0, len(ids), _BULK_CHUNK):
+            part = ids[i : i + _BULK_CHUNK]
+            await db.execute(
+                delete(PlaceFeature).where(PlaceFeature.place_id.in_(part))
+            )
+    lists = {}
+    for k, arr in columns.items():
+        if k == "place_id":
+            continue
+        arr = np.asarray(arr)
+        if arr.dtype.kind == "f":
+            arr = np.where(np.isnan(arr), None, arr)  # NaN → NULL
+        lists[k] = arr.tolist()
+    values = [
+        {"place_id": pid, "version": version, **{k: v[j] for k, v in lists.items()}}
+        for j, pid in enumerate(ids)
+    ]
+    if values:
+        await db.execute(insert(PlaceFeature), values)  # executemany
+    await db.execute(
+        update(FeatureStoreMeta)
+        .where(FeatureStoreMeta.name == name)
+        .values(rows=len(values))
+    )
+    await db.commit()
+    return version
+
+
+async def has_place_features(db: AsyncSession) -> bool:
+    """피처 행이 하나라도 있는지 (비워졌으면 전체 재구축 필요)"""
+    return await db.scalar(select(PlaceFeature.place_id).limit(1)) is not None
+
+
+async def get_place_features(
+    db: AsyncSession, place_ids: Sequence[int]
+) -> list[PlaceFeature]:
+    ids = [int(i) for i in place_ids]
+    out: list[PlaceFeature] = []
+    for i in range(0, len(ids), _BULK_CHUNK):
+        part = ids[i : i + _BULK_CHUNK]
+        stmt = select(PlaceFeature).where(PlaceFeature.place_id.in_(part))
+        out.extend((await db.execute(stmt)).scalars().all())
+    return out
+
+
+# ── 적재 진행 상태(페이지 체크포인트) ─────────────────────────────────────────
+async def get_ingest_state(
+    db: AsyncSession, *, source: str, year: int, quarter: int
+) -> IngestState | None:
+    stmt = select(IngestState).where(
+        IngestState.source == source,
+        IngestState.year == year,
+        IngestState.quarter == quarter,
+    )
+    return (await db.execute(stmt)).scalar_one_or_none()
+
+
+async def save_ingest_state(
+    db: AsyncSession,
+    *,
+    source: str,
+    year: int,
+    quarter: int,
+    status: str,
+    page: int | None = None,
+    rows_added: int = 0,
+    error: str | None = None,
+    commit: bool = True,
+) -> None:
+    """
+    (source, year, quarter) 상태 업서트.
+    - page가 주어지면 last_page 갱신(체크포인트), rows는 누적
+    - 페이지 데이터와 같은 트랜잭션에서 호출하려면 commit=False
+    """
+    values = {
+        "source": source,
+        "year": year,
+        "quarter": quarter,
+        "status": status,
+        "error": error,
+        "rows": rows_added,
+        "last_page": page or 0,
+    }
+    stmt = _insert(db, IngestState).values(values)
+    set_ = {
+        "status": stmt.excluded.status,
+        "error": stmt.excluded.error,
+        "rows": IngestState.rows + stmt.excluded.rows,
+        "updated_at": func.now(),
+    }
+    if page is not None:
+        set_["last_page"] = stmt.excluded.last_page
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["source", "year", "quarter"], set_=set_
+    )
+    await db.execute(stmt)
+    if commit:
+        await db.commit()
+
+
+async def list_ingest_state(db: AsyncSession, *, source: str) -> Sequence[IngestState]:
+    stmt = (
+        select(IngestState)
+        .where(IngestState.source == source)
+        .order_by(IngestState.year, IngestState.quarter)
+    )
+    return (await db.execute(stmt)).scalars().all()
+
+
+# ── 백그라운드 적재 작업 이력 ─────────────────────────────────────────────────
+async def create_ingest_job(
+    db: AsyncSession, *, kind: str, params: str, owner: str | None = None
+) -> IngestJob:
+    job = IngestJob(kind=kind, params=params, status="queued", owner=owner)
+    db.add(job)
+    await db.commit()
+    return job
+
+
+async def update_ingest_job(db: AsyncSession, job_id: int, **values) -> None:
+    await db.execute(update(IngestJob).where(IngestJob.id == job_id).values(**values))
+    await db.commit()
+
+
+async def list_active_ingest_jobs(db: AsyncSession) -> Sequence[IngestJob]:
+    stmt = select(IngestJob).where(IngestJob.status.in_(("queued", "running")))
+    return (await db.execute(stmt)).scalars().all()
+
+
+async def get_ingest_job(db: AsyncSession, job_id: int) -> IngestJob | None:
+    return await db.get(IngestJob, job_id)
+
+
+async def list_ingest_jobs(
+    db: AsyncSession, *, limit: int = 20, before_id: int | None = None
+) -> Sequence[IngestJob]:
+    """최신순 keyset 페이지네이션 (id < before_id)"""
+    stmt = select(IngestJob).order_by(desc(IngestJob.id)).limit(limit)
+    if before_id is not None:
+        stmt = stmt.where(IngestJob.id < before_id)
+    return (await db.execute(stmt)).scalars().all()
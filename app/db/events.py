@@ -0,0 +1,51 @@
+# app/db/events.py
+# -----------------------------------------------------------------------------
+# DB 쓰기 이벤트 (커밋 후 발행)
+# - crud가 쓰기 시 stage(db, topic, payload)로 이벤트를 세션에 적재
+# - 세션 커밋 성공 시 구독자에게 발행, 롤백 시 폐기
+# - 인메모리 인덱스/캐시가 쓰기에 맞춰 증분 갱신하는 용도
+# 토픽:
+#   "places" : [{"id", "lat", "lon", ...}, ...]  (신규/갱신 Place 행)
+#   "ftq"    : {"year", "quarter", "coords": [(lat, lon), ...]}  (분기 유동인구 쓰기)
+# -----------------------------------------------------------------------------
+from __future__ import annotations
+
+from collections import defaultdict
+from typing import Any, Callable
+
+from loguru import logger
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+_PENDING = "_pending_events"
+_subscribers: dict[str, list[Callable[[Any], None]]] = defaultdict(list)
+
+
+def subscribe(topic: str, fn: Callable[[Any], None]) -> None:
+    if fn not in _subscribers[topic]:
+        _subscribers[topic].append(fn)
+
+
+def publish(topic: str, payload: Any) -> None:
+    for fn in _subscribers.get(topic, ()):
+        try:
+            fn(payload)
+        except Exception:  # 구독자 오류가 쓰기 경로를 깨지 않도록
+            logger.exception(f"[events] {topic} 구독자 실패")
+
+
+def stage(db: AsyncSession, topic: str, payload: Any) -> None:
+    """현재 트랜잭션이 커밋되면 발행할 이벤트 적재"""
+    db.sync_session.info.setdefault(_PENDING, []).append((topic, payload))
+
+
+@event.listens_for(Session, "after_commit")
+def _after_commit(session: Session) -> None:
+    for topic, payload in session.info.pop(_PENDING, []):
+        publish(topic, payload)
+
+
+@event.listens_for(Session, "after_rollback")
+def _after_rollback(session: Session) -> None:
+    session.info.pop(_PENDING, None)
@@ -2,9 +2,24 @@
 # -----------------------------------------------------------------------------
 # ORM 모델 정의
 # - Place: 상권/공실/지점 등 '장소' 테이블
-# - IngestLog: 데이터 적재/부트스트랩 이력
+# - IngestJob: 백그라운드 적재 작업 이력(진행률/처리량)
+# - IngestState: 분기별 적재 진행 상태(페이지 체크포인트)
+# - GridCell/GridFTQ/GridMeta: 고정 격자 셀별 사전 집계 + 데이터 버전
+#   (app/services/grid.py)
+# - PlaceFeature/FeatureStoreMeta: 장소별 사전 계산 피처 + 데이터 버전
+#   (app/services/feature_store.py)
 # -----------------------------------------------------------------------------
-from sqlalchemy import Column, Integer, String, Float, Index
+from sqlalchemy import (
+    Boolean,
+    Column,
+    Integer,
+    String,
+    Float,
+    Index,
+    DateTime,
+    false,
+    func,
+)
 from app.db.session import Base
 
 
@@ -23,16 +38,65 @@ class Place(Base):
     # 최근 적재 유동인구
     foot_traffic = Column(Integer, default=0)
 
-    # 지오쿼리 최적화
-    __table_args__ = (Index("ix_places_lat_lon", "lat", "lon"),)
+    # 프랜차이즈 판정 (저장 시 한 번, app/core/franchise.py 브랜드 사전)
+    is_franchise = Column(
+        Boolean, index=True, nullable=False, default=False, server_default=false()
+    )
+    brand = Column(String)
+
+    # 지오쿼리 최적화 + 좌표 자연키(벌크 업서트의 ON CONFLICT 대상)
+    __table_args__ = (Index("uq_places_lat_lon", "lat", "lon", unique=True),)
+
 
+class IngestJob(Base):
+    """
+    백그라운드 적재 작업 이력
+    - kind: suseong / bootstrap
+    - params: 작업 인자(JSON 문자열)
+    - status: queued / running / done / error / cancelled
+    - pages_done/rows_done: 종료 시점(또는 마지막 기록) 진행량
+    - owner: 실행 프로세스 '호스트:pid:토큰' (재시작으로 고아가 된 작업 판별)
+    """
 
-class IngestLog(Base):
-    __tablename__ = "ingest_logs"
+    __tablename__ = "ingest_jobs"
 
     id = Column(Integer, primary_key=True)
-    source = Column(String, index=True)
-    status = Column(String)
+    kind = Column(String, index=True, nullable=False)
+    params = Column(String)
+    status = Column(String, nullable=False, default="queued")
+    pages_done = Column(Integer, nullable=False, default=0)
+    rows_done = Column(Integer, nullable=False, default=0)
+    error = Column(String)
+    owner = Column(String)
+    created_at = Column(DateTime, server_default=func.now())
+    started_at = Column(DateTime)
+    finished_at = Column(DateTime)
+
+
+class IngestState(Base):
+    """
+    분기 단위 적재 진행 상태
+    - source/year/quarter: 적재 단위 키 (예: suseong/2024/3)
+    - last_page: 마지막으로 커밋된 페이지 → 재시작 시 last_page+1부터 재개
+    - rows: 누적 적재 행 수
+    - status: running / done / error
+    """
+
+    __tablename__ = "ingest_state"
+
+    id = Column(Integer, primary_key=True)
+    source = Column(String, nullable=False)
+    year = Column(Integer, nullable=False)
+    quarter = Column(Integer, nullable=False)
+    last_page = Column(Integer, nullable=False, default=0)
+    rows = Column(Integer, nullable=False, default=0)
+    status = Column(String, nullable=False, default="running")
+    error = Column(String)
+    updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now())
+
+    __table_args__ = (
+        Index("uq_ingest_state_key", "source", "year", "quarter", unique=True),
+    )
 
 
 class FootTrafficQuarter(Base):
@@ -56,4 +120,86 @@ class FootTrafficQuarter(Base):
     __table_args__ = (
         Index("ix_ftq_year_quarter", "year", "quarter"),
         Index("ix_ftq_lat_lon", "lat", "lon"),
+        # 자연키: (연, 분기, 좌표) 당 1행
+        Index("uq_ftq_period_lat_lon", "year", "quarter", "lat", "lon", unique=True),
+    )
+
+
+class GridCell(Base):
+    """
+    격자 셀별 Place 집계
+    - spec: 격자 정의(셀 크기/원점) 키 — 설정이 바뀌면 새 spec으로 재구축
+    - cell: cy * nx + cx
+    - ft_sum/ft_n: foot_traffic > 0 인 장소의 합/개수 (평균 유동인구 계산용)
+    """
+
+    __tablename__ = "grid_cells"
+
+    id = Column(Integer, primary_key=True)
+    spec = Column(String, nullable=False)
+    cell = Column(Integer, nullable=False)
+    competitors = Column(Integer, nullable=False, default=0)
+    franchise = Column(Integer, nullable=False, default=0)
+    ft_sum = Column(Integer, nullable=False, default=0)
+    ft_n = Column(Integer, nullable=False, default=0)
+
+    __table_args__ = (Index("uq_grid_cells_spec_cell", "spec", "cell", unique=True),)
+
+
+class GridFTQ(Base):
+    """격자 셀별 분기 유동인구 합계 (FootTrafficQuarter 집계)"""
+
+    __tablename__ = "grid_ftq"
+
+    id = Column(Integer, primary_key=True)
+    spec = Column(String, nullable=False)
+    year = Column(Integer, nullable=False)
+    quarter = Column(Integer, nullable=False)
+    cell = Column(Integer, nullable=False)
+    pop = Column(Integer, nullable=False, default=0)
+
+    __table_args__ = (
+        Index("uq_grid_ftq_key", "spec", "year", "quarter", "cell", unique=True),
     )
+
+
+class GridMeta(Base):
+    """격자 집계 데이터 버전 — 셀 저장 트랜잭션마다 +1 (워커/재시작 간 공유 캐시 키)"""
+
+    __tablename__ = "grid_meta"
+
+    spec = Column(String, primary_key=True)
+    version = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now())
+
+
+class PlaceFeature(Base):
+    """
+    장소별 사전 계산 피처 (요청마다 places 원본에서 다시 계산하지 않도록)
+    - place_id: places.id
+    - cnt_300/cnt_500/cnt_1000: 반경 내 다른 장소 수
+    - nearest_franchise_m: 1km 내 최근접 프랜차이즈 거리 (없으면 NULL)
+    - ft_pct: 1km 내 유동인구 있는 장소 중 자기 유동인구 백분위 0~1 (없으면 NULL)
+    - version: 이 행을 계산한 데이터 버전 (FeatureStoreMeta.version)
+    """
+
+    __tablename__ = "place_features"
+
+    place_id = Column(Integer, primary_key=True)
+    cnt_300 = Column(Integer, nullable=False, default=0)
+    cnt_500 = Column(Integer, nullable=False, default=0)
+    cnt_1000 = Column(Integer, nullable=False, default=0)
+    nearest_franchise_m = Column(Float)
+    ft_pct = Column(Float)
+    version = Column(Integer, index=True, nullable=False)
+
+
+class FeatureStoreMeta(Base):
+    """피처 스토어 데이터 버전 — 갱신 트랜잭션마다 +1 (요청 경로의 캐시 검증용)"""
+
+    __tablename__ = "feature_store_meta"
+
+    name = Column(String, primary_key=True)
+    version = Column(Integer, nullable=False, default=0)
+    rows = Column(Integer, nullable=False, default=0)  # 마지막 갱신에서 쓴 행 수
+    updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now())
@@ -4,7 +4,10 @@
 # - FastAPI Depends(get_session)로 주입
 # - SQLite 기본, 추후 PostgreSQL로 교체 시 URL만 변경
 # -----------------------------------------------------------------------------
+import re
 from collections.abc import AsyncGenerator
+from loguru import logger
+from sqlalchemy import event, inspect, text
 from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
 from sqlalchemy.orm import declarative_base
 
@@ -14,6 +17,184 @@ engine = create_async_engine(settings.DATABASE_URL, echo=False, future=True)
 AsyncSessionLocal = async_sessionmaker(engine, expire_on_commit=False)
 Base = declarative_base()
 
+if engine.dialect.name == "sqlite":
+
+    @event.listens_for(engine.sync_engine, "connect")
+    def _sqlite_pragmas(dbapi_conn, _record):
+        # 동시 분기 적재(세션 여러 개) 중에도 읽기가 막히지 않도록 WAL + 잠금 대기
+        cur = dbapi_conn.cursor()
+        cur.execute("PRAGMA journal_mode=WAL")
+        cur.execute("PRAGMA busy_timeout=10000")
+        cur.close()
+
+
+# 기존 DB(create_all 이전 스키마)에 자연키 유니크 인덱스 보강
+# (테이블, 인덱스명, 컬럼) — 일회성 마이그레이션으로 중복 행은 최신 id만 남기고 정리
+# (좌표/키가 NULL인 행은 중복 판정 대상이 아님 → 그대로 둠)
+_NATURAL_KEYS = (
+    ("places", "uq_places_lat_lon", ("lat", "lon")),
+    (
+        "foot_traffic_quarter",
+        "uq_ftq_period_lat_lon",
+        ("year", "quarter", "lat", "lon"),
+    ),
+)
+
+
+# 기존 DB(프랜차이즈 컬럼 이전 스키마) 보강: 컬럼/인덱스 추가 후 상호명으로 판정 채움
+_FRANCHISE_DDL = (
+    "ALTER TABLE places ADD COLUMN is_franchise BOOLEAN NOT NULL DEFAULT 0",
+    "ALTER TABLE places ADD COLUMN brand VARCHAR",
+    "CREATE INDEX IF NOT EXISTS ix_places_is_franchise ON places (is_franchise)",
+)
+# 프랜차이즈 수를 물질화한 파생 테이블 → 비우면 다음 적재 때 재구축
+# (데이터 버전은 지우지 않고 올림 → 재구축 후 버전이 이전 값과 겹치지 않음 = ETag 충돌 없음)
+_FRANCHISE_DERIVED = (
+    "DELETE FROM grid_cells",
+    "DELETE FROM place_features",
+    "UPDATE feature_store_meta SET version = version + 1, rows = 0",
+)
+
+
+# 기존 DB(작업 소유자 컬럼 이전 스키마) 보강: 기동 시 중단된 작업 정리용
+_JOB_OWNER_DDL = "ALTER TABLE ingest_jobs ADD COLUMN owner VARCHAR"
+
+
+# 구 적재 이력(ingest_logs, 키 "suseong_{연}Q{분기}" + status "done") → ingest_state
+# 완료 분기로 옮김 (업그레이드 후 resume 부트스트랩이 이미 받은 분기를 다시 받지 않도록)
+_LEGACY_INGEST_KEY = re.compile(r"^(suseong)_(\d{4})Q([1-4])$")
+_SEED_INGEST_STATE = (
+    "INSERT INTO ingest_state (source, year, quarter, last_page, rows, status) "
+    "VALUES (:source, :year, :quarter, 0, 0, 'done') "
+    "ON CONFLICT (source, year, quarter) DO NOTHING"
+)
+
+
+def _has_table(sync_conn, table: str) -> bool:
+    return inspect(sync_conn).has_table(table)
+
+
+def _has_column(sync_conn, table: str, column: str) -> bool:
+    return column in {c["name"] for c in inspect(sync_conn).get_columns(table)}
+
+
+async def _add_franchise_columns(conn) -> None:
+    from app.core.franchise import classify
+
+    for ddl in _FRANCHISE_DDL:
+        await conn.execute(text(ddl))
+    rows = (await conn.execute(text("SELECT id, name, category FROM places"))).all()
+    updates = []
+    for pid, name, category in rows:
+        franchise, brand = classify(name, category)
+        if franchise:
+            updates.append({"id": pid, "brand": brand})
+    if updates:
+        await conn.execute(
+            text("UPDATE places SET is_franchise = 1, brand = :brand WHERE id = :id"),
+            updates,
+        )
+    for stmt in _FRANCHISE_DERIVED:
+        await conn.execute(text(stmt))
+
+
+# 일회성 마이그레이션 적용 기록 (이름 = 기본키)
+_MIGRATIONS_DDL = (
+    "CREATE TABLE IF NOT EXISTS schema_migrations ("
+    "name VARCHAR PRIMARY KEY, applied_at DATETIME DEFAULT CURRENT_TIMESTAMP)"
+)
+
+
+async def _applied(conn, name: str) -> bool:
+    row = await conn.execute(
+        text("SELECT 1 FROM schema_migrations WHERE name = :n"), {"n": name}
+    )
+    return row.first() is not None
+
+
+async def _mark_applied(conn, name: str) -> None:
+    await conn.execute(
+        text("INSERT INTO schema_migrations (name) VALUES (:n)"), {"n": name}
+    )
+
+
+async def _dedupe_natural_key(conn, table: str, cols: tuple[str, ...]) -> int:
+    """자연키 중복 행 정리 (키가 모두 NOT NULL인 행만, 키별 최신 id 유지)"""
+    col_list = ", ".join(cols)
+    not_null = " AND ".join(f"{c} IS NOT NULL" for c in cols)
+    res = await conn.execute(
+        text(
+            f"DELETE FROM {table} WHERE {not_null} AND id NOT IN "
+            f"(SELECT MAX(id) FROM {table} WHERE {not_null} GROUP BY {col_list})"
+        )
+    )
+    return res.rowcount or 0
+
+
+async def _seed_ingest_state(conn) -> int:
+    """구 ingest_logs의 done 키를 ingest_state에 (이미 있는 분기는 그대로)"""
+    if not await conn.run_sync(_has_table, "ingest_logs"):
+        return 0
+    rows = await conn.execute(
+        text("SELECT DISTINCT source FROM ingest_logs WHERE status = 'done'")
+    )
+    seeds = []
+    for (key,) in rows:
+        m = _LEGACY_INGEST_KEY.match(key or "")
+        if m:
+            seeds.append({"source": m[1], "year": int(m[2]), "quarter": int(m[3])})
+    if seeds:
+        await conn.execute(text(_SEED_INGEST_STATE), seeds)
+    return len(seeds)
+
+
+def _missing_natural_keys(sync_conn) -> list[tuple[str, str, tuple[str, ...]]]:
+    insp = inspect(sync_conn)
+    out = []
+    for table, name, cols in _NATURAL_KEYS:
+        if name not in {ix["name"] for ix in insp.get_indexes(table)}:
+            out.append((table, name, cols))
+    return out
+
+
+async def init_db() -> None:
+    """테이블 생성 + 기존 DB 스키마 보강"""
+    from app.db import models  # noqa: F401  (메타데이터 등록)
+    from app.db.spatial import ensure_rtree
+
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+        await conn.execute(text(_MIGRATIONS_DDL))
+
+        for table, name, cols in await conn.run_sync(_missing_natural_keys):
+            migration = f"dedupe_{name}"
+            if await _applied(conn, migration):
+                # 이미 정리했는데 인덱스만 없어짐 → 임의 삭제 대신 수동 확인 요청
+                logger.warning(f"[init_db] {name} 인덱스 없음 ({migration} 적용됨)")
+                continue
+            removed = await _dedupe_natural_key(conn, table, cols)
+            logger.info(f"[init_db] {migration}: {table} 중복 {removed}행 삭제")
+            await conn.execute(
+                text(f"CREATE UNIQUE INDEX {name} ON {table} ({', '.join(cols)})")
+            )
+            await _mark_applied(conn, migration)
+
+        if not await _applied(conn, "ingest_state_from_logs"):
+            seeded = await _seed_ingest_state(conn)
+            if seeded:
+                logger.info(
+                    f"[init_db] ingest_logs 완료 분기 {seeded}개 → ingest_state"
+                )
+            await _mark_applied(conn, "ingest_state_from_logs")
+
+        if not await conn.run_sync(_has_column, "places", "is_franchise"):
+            await _add_franchise_columns(conn)
+        if not await conn.run_sync(_has_column, "ingest_jobs", "owner"):
+            await conn.execute(text(_JOB_OWNER_DDL))
+
+        await ensure_rtree(conn)
+
 
 async def get_session() -> AsyncGenerator[AsyncSession, None]:
     """요청 스코프 세션 제공"""
@@ -0,0 +1,113 @@
+# app/db/spatial.py
+# -----------------------------------------------------------------------------
+# SQLite R*Tree 공간 인덱스
+# - places_rtree / ftq_rtree 가상 테이블 + 트리거로 원본 테이블과 자동 동기화
+# - bbox 조건을 "R*Tree 후보 id + 실제 좌표 BETWEEN 재확인"으로 치환
+#   (B-tree 복합 인덱스는 두 컬럼 범위 중 한쪽만 사용 → 위도 띠 전체 스캔)
+# - SQLite가 아니거나 rtree 모듈이 없으면 BETWEEN만 사용 (폴백)
+# -----------------------------------------------------------------------------
+from __future__ import annotations
+
+from loguru import logger
+from sqlalchemy import Float, Integer, column, select, table, text
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+from app.core.config import settings
+
+# 원본 테이블 → R*Tree 가상 테이블
+RTREES = {
+    "places": "places_rtree",
+    "foot_traffic_quarter": "ftq_rtree",
+}
+
+# 이 프로세스에서 R*Tree가 준비된 원본 테이블
+_enabled: set[str] = set()
+
+
+def _rtree(name: str):
+    return table(
+        name,
+        column("id", Integer),
+        column("min_lat", Float),
+        column("max_lat", Float),
+        column("min_lon", Float),
+        column("max_lon", Float),
+    )
+
+
+def _ddl(src: str, rt: str) -> list[str]:
+    # 좌표 변경(UPDATE OF lat, lon)일 때만 재색인 — foot_traffic 갱신 등은 무관
+    return [
+        f"CREATE VIRTUAL TABLE IF NOT EXISTS {rt} "
+        f"USING rtree(id, min_lat, max_lat, min_lon, max_lon)",
+        f"""CREATE TRIGGER IF NOT EXISTS {rt}_ai AFTER INSERT ON {src}
+            WHEN NEW.lat IS NOT NULL AND NEW.lon IS NOT NULL
+            BEGIN
+                INSERT OR REPLACE INTO {rt}
+                VALUES (NEW.id, NEW.lat, NEW.lat, NEW.lon, NEW.lon);
+            END""",
+        f"""CREATE TRIGGER IF NOT EXISTS {rt}_au AFTER UPDATE OF lat, lon ON {src}
+            BEGIN
+                DELETE FROM {rt} WHERE id = OLD.id;
+                INSERT INTO {rt}
+                SELECT NEW.id, NEW.lat, NEW.lat, NEW.lon, NEW.lon
+                WHERE NEW.lat IS NOT NULL AND NEW.lon IS NOT NULL;
+            END""",
+        f"""CREATE TRIGGER IF NOT EXISTS {rt}_ad AFTER DELETE ON {src}
+            BEGIN
+                DELETE FROM {rt} WHERE id = OLD.id;
+            END""",
+    ]
+
+
+async def ensure_rtree(conn: AsyncConnection) -> None:
+    """R*Tree 가상 테이블/동기화 트리거 생성 (최초 생성 시 기존 행 백필)"""
+    if not settings.SPATIAL_RTREE or conn.dialect.name != "sqlite":
+        return
+    for src, rt in RTREES.items():
+        exists = (
+            await conn.execute(
+                text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = :n"),
+                {"n": rt},
+            )
+        ).first() is not None
+        try:
+            for stmt in _ddl(src, rt):
+                await conn.execute(text(stmt))
+        except OperationalError as e:  # rtree 모듈 없이 빌드된 SQLite
+            logger.warning(f"[spatial] R*Tree 사용 불가 → BETWEEN 폴백: {e}")
+            return
+        if not exists:
+            await conn.execute(
+                text(
+                    f"INSERT INTO {rt} SELECT id, lat, lat, lon, lon FROM {src} "
+                    f"WHERE lat IS NOT NULL AND lon IS NOT NULL"
+                )
+            )
+        _enabled.add(src)
+
+
+def bbox_filter(
+    model, min_lat: float, min_lon: float, max_lat: float, max_lon: float
+) -> list:
+    """
+    model(lat/lon 컬럼 보유)의 bbox WHERE 조건 목록.
+    R*Tree는 float32로 바깥쪽 반올림 저장 → 겹침 조건으로 후보를 넉넉히 뽑고
+    실제 좌표 BETWEEN으로 정확히 재확인.
+    """
+    conds = [
+        model.lat.between(min_lat, max_lat),
+        model.lon.between(min_lon, max_lon),
+    ]
+    src = model.__tablename__
+    if src in _enabled:
+        rt = _rtree(RTREES[src])
+        candidates = select(rt.c.id).where(
+            rt.c.max_lat >= min_lat,
+            rt.c.min_lat <= max_lat,
+            rt.c.max_lon >= min_lon,
+            rt.c.min_lon <= max_lon,
+        )
+        conds.insert(0, model.id.in_(candidates))
+    return conds
@@ -1,16 +1,58 @@
 # app/main.py
 # -----------------------------------------------------------------------------
 # FastAPI 엔트리포인트
-# - 서버 기동 시 테이블 생성
+# - 서버 기동 시 테이블 생성 + 인메모리 공간 인덱스/격자 집계 적재
+#   + 피처 스토어 버전 확인 (비어 있으면 전체 구축 작업 제출)
+# - lifespan 동안 Kakao HTTP 커넥션 풀 + 예측 프로세스 풀 유지,
+#   종료 시 작업 취소/풀 닫기
 # -----------------------------------------------------------------------------
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from app.core.config import settings
-from app.db.session import Base, engine, get_session
+from app.db.session import AsyncSessionLocal, init_db
 from app.routers import analysis, simulate, admin, finance
-from app.services.ingest import bootstrap_suseong
+from app.services.feature_store import feature_store
+from app.services.forecast_pool import forecast_pool
+from app.services.grid import grid_layer
+from app.services.jobs import job_runner, submit_bootstrap, submit_feature_refresh
+from app.services.kakao import kakao_client
+from app.services.place_index import place_index
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    await init_db()
+    await job_runner.reconcile()  # 이전 프로세스에서 중단된 작업 행 정리
+    await kakao_client.open()
+    await forecast_pool.start()  # 예측 워커 프로세스 기동 + statsmodels/sklearn 워밍
+
+    if settings.PLACE_INDEX_ENABLED:
+        async with AsyncSessionLocal() as db:
+            await place_index.load(db)
+
+    if settings.GRID_ENABLED:
+        async with AsyncSessionLocal() as db:
+            await grid_layer.load(db)
+
+    if settings.FEATURE_STORE_ENABLED:
+        async with AsyncSessionLocal() as db:
+            built = await feature_store.load(db)
+        if not built:
+            await submit_feature_refresh(full=True)  # 백그라운드 전체 구축
+
+    if settings.AUTO_INGEST_SUSEONG:
+        await submit_bootstrap()  # 백그라운드 작업 (/admin/jobs에서 조회/취소)
+
+    yield
 
-app = FastAPI(title=settings.APP_NAME)
+    await job_runner.shutdown()
+    forecast_pool.shutdown()
+    await kakao_client.close()
+
+
+app = FastAPI(title=settings.APP_NAME, lifespan=lifespan)
 
 app.add_middleware(
     CORSMiddleware,
@@ -21,22 +63,6 @@ app.add_middleware(
 )
 
 
-@app.on_event("startup")
-async def on_startup():
-    async with engine.begin() as conn:
-        await conn.run_sync(Base.metadata.create_all)
-
-    if settings.AUTO_INGEST_SUSEONG:
-        import asyncio
-
-        async def _bg():
-            async for db in get_session():
-                await bootstrap_suseong(db)
-                break
-
-        asyncio.create_task(_bg())
-
-
 app.include_router(finance.router)
 app.include_router(admin.router)
 app.include_router(analysis.router)
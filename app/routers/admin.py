@@ -1,15 +1,26 @@
 # app/routers/admin.py
 # -----------------------------------------------------------------------------
-# 부트스트랩/수동 적재/로그 조회
+# 부트스트랩/수동 적재(백그라운드 작업)/작업 조회·취소/진행 상태/런타임 지표
+# + 피처 스토어 전체 재구축
 # -----------------------------------------------------------------------------
 import traceback
 from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.db import crud
 from app.db.session import get_session
-from app.db.models import IngestLog
-from app.services.ingest import load_mock, ingest_suseong_foot_traffic
+from app.services.feature_store import feature_store
+from app.services.forecast import fit_cache
+from app.services.forecast_pool import forecast_pool
+from app.services.ingest import SOURCE_SUSEONG, bootstrap_quarters, load_mock
+from app.services.kakao import kakao_client
+from app.services.jobs import (
+    job_row_to_dict,
+    job_runner,
+    submit_bootstrap,
+    submit_feature_refresh,
+    submit_suseong_ingest,
+)
 
 router = APIRouter(prefix="/admin", tags=["admin"])
 
@@ -23,24 +34,107 @@ async def ingest_mock(db: AsyncSession = Depends(get_session)):
         raise HTTPException(500, detail=f"{e}\n{traceback.format_exc()}")
 
 
-@router.post("/ingest/suseong")
+@router.post("/ingest/suseong", status_code=202)
 async def ingest_suseong(
     year: int = Query(..., ge=2018, le=2100),
     quarter: int = Query(..., ge=1, le=4),
     pages: int = Query(5, ge=1, le=100),
     page_size: int = Query(100, ge=1, le=1000),
-    db: AsyncSession = Depends(get_session),
+    resume: bool = Query(False, description="페이지 체크포인트 기록/재개"),
 ):
-    try:
-        return await ingest_suseong_foot_traffic(
-            db, year=year, quarter=quarter, pages=pages, page_size=page_size
+    """분기 적재 작업 제출 → job_id 즉시 반환 (진행은 /admin/jobs/{id})"""
+    job = await submit_suseong_ingest(
+        year=year, quarter=quarter, pages=pages, page_size=page_size, resume=resume
+    )
+    return {"job_id": job.id, "status": job.status}
+
+
+@router.post("/ingest/bootstrap", status_code=202)
+async def ingest_bootstrap():
+    """설정 범위 전체 부트스트랩 작업 제출 (이미 실행 중이면 그 작업)"""
+    job = await submit_bootstrap()
+    return {"job_id": job.id, "status": job.status}
+
+
+@router.post("/features/rebuild", status_code=202)
+async def rebuild_features():
+    """장소별 피처 전체 재구축 작업 제출 (이미 실행 중이면 그 작업)"""
+    job = await submit_feature_refresh(full=True)
+    return {"job_id": job.id, "status": job.status}
+
+
+@router.get("/ingest/state")
+async def get_ingest_state(db: AsyncSession = Depends(get_session)):
+    """부트스트랩 진행 상황: 분기별 마지막 커밋 페이지/행 수/상태"""
+    rows = await crud.list_ingest_state(db, source=SOURCE_SUSEONG)
+    by_key = {(x.year, x.quarter): x for x in rows}
+    quarters = []
+    for y, q in bootstrap_quarters():
+        x = by_key.get((y, q))
+        quarters.append(
+            {
+                "year": y,
+                "quarter": q,
+                "status": x.status if x else "pending",
+                "last_page": x.last_page if x else 0,
+                "rows": x.rows if x else 0,
+                "error": x.error if x else None,
+                "updated_at": x.updated_at if x else None,
+            }
         )
-    except Exception as e:
-        raise HTTPException(500, detail=f"{e}\n{traceback.format_exc()}")
+    return {
+        "total": len(quarters),
+        "done": sum(1 for x in quarters if x["status"] == "done"),
+        "running": sum(1 for x in quarters if x["status"] == "running"),
+        "error": sum(1 for x in quarters if x["status"] == "error"),
+        "rows": sum(x["rows"] for x in quarters),
+        "quarters": quarters,
+    }
+
+
+@router.get("/jobs")
+async def list_jobs(
+    limit: int = Query(20, ge=1, le=200),
+    before_id: int | None = Query(None, ge=1, description="이전 페이지의 next_before_id"),
+    db: AsyncSession = Depends(get_session),
+):
+    """작업 이력 (최신순, keyset 페이지네이션)"""
+    rows = await crud.list_ingest_jobs(db, limit=limit, before_id=before_id)
+    items = []
+    for row in rows:
+        live = job_runner.get(row.id)
+        items.append(live.to_dict() if live else job_row_to_dict(row))
+    next_before_id = rows[-1].id if len(rows) == limit else None
+    return {"items": items, "next_before_id": next_before_id}
+
+
+@router.get("/jobs/{job_id}")
+async def get_job(job_id: int, db: AsyncSession = Depends(get_session)):
+    """진행 페이지/행 수 + 처리량 (실행 중이면 메모리의 실시간 값)"""
+    live = job_runner.get(job_id)
+    if live is not None:
+        return live.to_dict()
+    row = await crud.get_ingest_job(db, job_id)
+    if row is None:
+        raise HTTPException(404, detail="job not found")
+    return job_row_to_dict(row)
+
+
+@router.post("/jobs/{job_id}/cancel")
+async def cancel_job(job_id: int):
+    if not job_runner.cancel(job_id):
+        raise HTTPException(409, detail="실행 중인 작업이 아닙니다")
+    return {"job_id": job_id, "status": "cancelling"}
 
 
-@router.get("/logs")
-async def get_ingest_logs(db: AsyncSession = Depends(get_session)):
-    res = await db.execute(select(IngestLog))
-    logs = res.scalars().all()
-    return [{"id": x.id, "source": x.source, "status": x.status} for x in logs]
+@router.get("/metrics")
+async def metrics():
+    """프로세스(워커) 단위 런타임 지표"""
+    return {
+        "kakao_cache": kakao_client.cache.stats(),
+        "kakao_bucket": await kakao_client.bucket.state(),  # 전 워커 공유 상태
+        "kakao_breaker": kakao_client.breaker.stats(),
+        "feature_store": feature_store.stats(),
+        "forecast_pool": forecast_pool.stats(),
+        "forecast_cache": fit_cache.stats(),
+    }
@@ -1,49 +1,278 @@
-from fastapi import APIRouter, Depends, HTTPException
+# app/routers/analysis.py
+# -----------------------------------------------------------------------------
+# 상권 분석
+# - POST /analysis/area       : 단일 지점 경쟁 요약 + 적합도 점수 + 거리감쇠 경쟁 압력
+# - POST /analysis/area/batch : 여러 지점 일괄 (NDJSON 스트리밍, 입력 순서대로 한 줄씩)
+# - GET  /analysis/heatmap    : bbox 적합도 래스터 (JSON 배열 또는 uint8 바이너리)
+# - GET  /analysis/places/{id}/features : 장소별 사전 계산 피처 (행 버전 ETag)
+# -----------------------------------------------------------------------------
+import json
+import time
+import traceback
+
+from typing import Literal, Optional
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Query
+from fastapi.responses import JSONResponse, Response, StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
-from app.db.session import get_session
+
+from app.core.config import settings
+from app.core.deadline import request_scope
+from app.core.etag import etag_matches
+from app.db import crud
+from app.db.session import AsyncSessionLocal, get_session
 from app.schemas.analysis import (
+    AnalysisBatchRequest,
     AnalysisRequest,
     AnalysisResult,
     CompetitorAnalysis,
     ReasoningDetails,
 )
-from app.services.analyzer import find_places_nearby
-import traceback
+from app.services.analyzer import (
+    fetch_missing_areas,
+    site_features,
+    suitability_score,
+    summarize_area,
+    summarize_areas,
+)
+from app.services.competition import competition_pressure
+from app.services.feature_store import FEATURE_RADII
+from app.services.grid import grid_layer
+from app.services.heatmap import default_bbox, get_heatmap
 
 router = APIRouter(prefix="/analysis", tags=["analysis"])
 
+_BATCH_CHUNK = 256  # 한 번에 집계할 지점 수 (메모리 상한)
+
+
+async def _site_extras(db: AsyncSession, sites: list[AnalysisRequest]) -> list[dict]:
+    """지점별 경쟁 압력 + 반경 피처 (ReasoningDetails 추가 필드, 일괄 계산)"""
+    lats = [s.lat for s in sites]
+    lons = [s.lon for s in sites]
+    cp = await competition_pressure(db, lats, lons)
+    feats = await site_features(db, lats, lons, [s.radius_m for s in sites])
+    return [
+        {
+            **cp.row(i),
+            "flow_score": float(feats["flow_score"][i]),
+            "competition_density": round(float(feats["competition_density"][i]), 3),
+        }
+        for i in range(len(sites))
+    ]
+
+
+def _area_result(
+    req: AnalysisRequest,
+    agg: crud.AreaAggregate,
+    reasons: list[str],
+    extras: dict | None = None,
+) -> AnalysisResult:
+    """집계(+ _site_extras) → 적합도 점수/응답 (단건/일괄 공용)"""
+    radius_km = req.radius_m / 1000
+    competitor_count = agg.count
+    franchise = agg.franchise
+    personal = agg.personal
+    floating_population = 0
+
+    score = suitability_score(competitor_count, floating_population)
+
+    return AnalysisResult(
+        suitability_score=int(score),
+        reasoning=ReasoningDetails(
+            competitor_count=competitor_count,
+            franchise_count=franchise,
+            personal_count=personal,
+            floating_population=floating_population,
+            radius_km=int(radius_km),
+            **(extras or {}),
+        ),
+        competitor_analysis=CompetitorAnalysis(
+            count=competitor_count,
+            types={"franchise": franchise, "personal": personal},
+            avg_rating=None,
+        ),
+        lat=req.lat,
+        lon=req.lon,
+        degraded=bool(reasons),
+        degraded_reasons=list(reasons),
+    )
+
 
 @router.post("/area", response_model=AnalysisResult)
 async def analyze_area(req: AnalysisRequest, db: AsyncSession = Depends(get_session)):
     try:
-        radius_km = req.radius_m / 1000
-        places = await find_places_nearby(
-            db, lat=req.lat, lon=req.lon, radius_km=radius_km
+        # 요청 예산: summarize_area → Kakao 클라이언트까지 contextvar로 전달
+        with request_scope(settings.ANALYSIS_DEADLINE_S) as scope:
+            agg = await summarize_area(
+                db, lat=req.lat, lon=req.lon, radius_m=req.radius_m
+            )
+        (extras,) = await _site_extras(db, [req])
+        return _area_result(req, agg, scope.reasons, extras)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"{e}\n{traceback.format_exc()}")
+
+
+def _ndjson(obj: dict) -> str:
+    return json.dumps(obj, ensure_ascii=False) + "\n"
+
+
+@router.post("/area/batch")
+async def analyze_area_batch(req: AnalysisBatchRequest):
+    """
+    여러 지점 일괄 분석. 줄마다 {"index": i, ...AnalysisResult} (실패 시 "error").
+    - _BATCH_CHUNK개씩: 격자/합집합 상자 한 번 조회 + NumPy 집계 (summarize_areas),
+      경쟁 압력/반경 피처도 청크 단위 일괄 계산 (_site_extras)
+    - 빈 지점은 fetch_missing이면 청크별로 Kakao 수집 (fetch_missing_areas:
+      동시 수 제한 + 지점별 예산), 배치 전체 수집 예산
+      ANALYSIS_BATCH_FETCH_BUDGET_S를 다 쓰면 나머지는 DB 결과 + degraded
+    점수는 같은 입력의 POST /analysis/area와 동일.
+    """
+    budget_end = time.monotonic() + settings.ANALYSIS_BATCH_FETCH_BUDGET_S
+
+    async def fill(db: AsyncSession, chunk, aggs, extras) -> dict[int, tuple | str]:
+        """
+        빈 지점 j → (집계, degraded 사유, extras). 수집/저장 실패 시 빈 지점만
+        오류 메시지로 (세션 롤백 → 나머지 지점/다음 청크는 계속)
+        """
+        empty = [j for j, agg in enumerate(aggs) if not agg.count]
+        if not empty:
+            return {}
+        left = budget_end - time.monotonic()
+        if left <= 0:
+            return {j: (aggs[j], ["batch_fetch_budget"], extras[j]) for j in empty}
+        sites = [chunk[j] for j in empty]
+        try:
+            with request_scope(left):
+                filled = await fetch_missing_areas(
+                    db, [(s.lat, s.lon, s.radius_m) for s in sites]
+                )
+            # 수집으로 장소가 늘었을 수 있으니 빈 지점만 다시
+            new_extras = await _site_extras(db, sites)
+        except Exception as e:
+            await db.rollback()
+            return {j: str(e) for j in empty}
+        return {
+            j: (agg, reasons, ex)
+            for j, (agg, reasons), ex in zip(empty, filled, new_extras)
+        }
+
+    async def lines():
+        # 스트리밍 중에도 살아 있도록 세션을 응답 생성기 안에서 연다
+        async with AsyncSessionLocal() as db:
+            for start in range(0, len(req.sites), _BATCH_CHUNK):
+                chunk = req.sites[start : start + _BATCH_CHUNK]
+                try:
+                    aggs = await summarize_areas(
+                        db, [(s.lat, s.lon, s.radius_m) for s in chunk]
+                    )
+                    extras = await _site_extras(db, chunk)
+                except Exception as e:
+                    await db.rollback()
+                    for j in range(len(chunk)):
+                        yield _ndjson({"index": start + j, "error": str(e)})
+                    continue
+                filled = (
+                    await fill(db, chunk, aggs, extras) if req.fetch_missing else {}
+                )
+
+                for j, (site, agg) in enumerate(zip(chunk, aggs)):
+                    reasons: list[str] = []
+                    site_extras = extras[j]
+                    entry = filled.get(j)
+                    if isinstance(entry, str):
+                        yield _ndjson({"index": start + j, "error": entry})
+                        continue
+                    if entry is not None:
+                        agg, reasons, site_extras = entry
+                    try:
+                        res = _area_result(site, agg, reasons, site_extras)
+                    except Exception as e:
+                        yield _ndjson({"index": start + j, "error": str(e)})
+                        continue
+                    yield _ndjson({"index": start + j, **res.model_dump()})
+
+    return StreamingResponse(lines(), media_type="application/x-ndjson")
+
+
+@router.get("/heatmap")
+async def heatmap(
+    min_lat: Optional[float] = None,
+    min_lon: Optional[float] = None,
+    max_lat: Optional[float] = None,
+    max_lon: Optional[float] = None,
+    cell_m: float = Query(100.0, ge=25.0, le=2000.0),
+    radius_m: float = Query(500.0, ge=100.0, le=5000.0),
+    use_foot_traffic: bool = False,
+    format: Literal["json", "bin"] = "json",
+    if_none_match: Optional[str] = Header(None),
+    db: AsyncSession = Depends(get_session),
+):
+    """
+    bbox(생략 시 수성구 전체)를 cell_m 셀로 나눈 적합도 점수 래스터.
+    - 셀 중심 기준 반경 radius_m 경쟁 수 → /analysis/area와 같은 점수식
+      (use_foot_traffic이면 최신 분기 FTQ 유동인구 합도 점수에 반영)
+    - json: 행 우선 평탄화 배열 + shape (0행 = 남쪽)
+    - bin : 점수 uint8 원시 바이트, 메타데이터는 X-Heatmap-* 헤더
+    - ETag(격자 데이터 버전 포함)로 조건부 요청 시 304
+    """
+    if not grid_layer.ready:
+        raise HTTPException(503, detail="격자 집계가 적재되지 않았습니다")
+    await grid_layer.refresh(db)
+    bbox = default_bbox()
+    bbox = (
+        bbox[0] if min_lat is None else min_lat,
+        bbox[1] if min_lon is None else min_lon,
+        bbox[2] if max_lat is None else max_lat,
+        bbox[3] if max_lon is None else max_lon,
+    )
+    try:
+        hm = await get_heatmap(
+            bbox, cell_m, radius_m, use_foot_traffic=use_foot_traffic
         )
+    except ValueError as e:
+        raise HTTPException(400, detail=str(e))
 
-        competitor_count = len(places)
-        franchise = sum(1 for p in places if (p.category or "").find("프랜차이즈") >= 0)
-        personal = competitor_count - franchise
-        floating_population = 0
-
-        score = max(0, min(100, 80 - competitor_count + (floating_population // 10000)))
-
-        return AnalysisResult(
-            suitability_score=int(score),
-            reasoning=ReasoningDetails(
-                competitor_count=competitor_count,
-                franchise_count=franchise,
-                personal_count=personal,
-                floating_population=floating_population,
-                radius_km=int(radius_km),
-            ),
-            competitor_analysis=CompetitorAnalysis(
-                count=competitor_count,
-                types={"franchise": franchise, "personal": personal},
-                avg_rating=None,
-            ),
-            lat=req.lat,
-            lon=req.lon,
+    headers = {"ETag": hm.etag, "Cache-Control": "no-cache"}
+    if etag_matches(if_none_match, hm.etag):
+        return Response(status_code=304, headers=headers)
+    if format == "bin":
+        headers.update(
+            {
+                "X-Heatmap-Shape": f"{hm.shape[0]},{hm.shape[1]}",
+                "X-Heatmap-Bbox": ",".join(f"{v:.7f}" for v in hm.bbox),
+                "X-Heatmap-Cell-M": f"{hm.cell_m:g}",
+                "X-Heatmap-Radius-M": f"{hm.radius_m:g}",
+            }
         )
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"{e}\n{traceback.format_exc()}")
+        return Response(
+            hm.score.tobytes(), media_type="application/octet-stream", headers=headers
+        )
+    return JSONResponse(hm.to_json(), headers=headers)
+
+
+@router.get("/places/{place_id}/features")
+async def place_features(
+    place_id: int,
+    if_none_match: Optional[str] = Header(None),
+    db: AsyncSession = Depends(get_session),
+):
+    """
+    피처 스토어의 장소별 피처 (300/500/1000m 장소 수, 최근접 프랜차이즈,
+    유동인구 백분위). ETag = 행 계산 버전 → 갱신 전까지 304.
+    """
+    rows = await crud.get_place_features(db, [place_id])
+    if not rows:
+        raise HTTPException(404, detail="피처가 아직 계산되지 않은 장소입니다")
+    row = rows[0]
+    etag = f'W/"pf-{place_id}-{row.version}"'
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if etag_matches(if_none_match, etag):
+        return Response(status_code=304, headers=headers)
+    body = {
+        "place_id": row.place_id,
+        **{f"cnt_{r}": getattr(row, f"cnt_{r}") for r in FEATURE_RADII},
+        "nearest_franchise_m": row.nearest_franchise_m,
+        "ft_pct": row.ft_pct,
+        "version": row.version,
+    }
+    return JSONResponse(body, headers=headers)
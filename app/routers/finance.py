@@ -1,24 +1,67 @@
 # app/routers/finance.py
 # -----------------------------------------------------------------------------
 # /finance/forecast   : 유동인구(exog) 자동 결합 예측
+# - 적합은 forecast_pool 워커 프로세스에서, 풀 포화 시 429 + Retry-After
+# - 결정적 모드(seed 고정)면 ETag, If-None-Match 일치 시 적합 없이 304
+# /finance/forecast_auto/batch : 여러 매장 일괄 (NDJSON, 끝나는 순서대로 한 줄씩)
 # -----------------------------------------------------------------------------
-from fastapi import APIRouter, Depends, HTTPException
+import json
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Header, HTTPException
+from fastapi.responses import JSONResponse, Response, StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
-from app.db.session import get_session
-from app.schemas.finance import FinanceForecastAutoRequest, FinanceForecastAutoResponse
-from app.services.forecast import forecast_finance_auto
+from app.core.etag import etag_matches
+from app.db.session import AsyncSessionLocal, get_session
+from app.schemas.finance import (
+    FinanceForecastAutoRequest,
+    FinanceForecastAutoResponse,
+    FinanceForecastBatchRequest,
+)
+from app.services.forecast import forecast_finance_batch, plan_forecast, run_forecast
+from app.services.forecast_pool import ForecastBusy
 
 router = APIRouter(prefix="/finance", tags=["finance"])
 
 
 @router.post("/forecast_auto", response_model=FinanceForecastAutoResponse)
 async def forecast_auto(
-    req: FinanceForecastAutoRequest, db: AsyncSession = Depends(get_session)
+    req: FinanceForecastAutoRequest,
+    if_none_match: Optional[str] = Header(None),
+    db: AsyncSession = Depends(get_session),
 ):
 
     try:
         lat = getattr(req, "lat", None)
         lon = getattr(req, "lon", None)
-        return await forecast_finance_auto(db, req, lat=lat, lon=lon)
+        plan = await plan_forecast(db, req, lat=lat, lon=lon)
+        headers = {"ETag": plan.etag, "Cache-Control": "no-cache"} if plan.etag else {}
+        if etag_matches(if_none_match, plan.etag):
+            return Response(status_code=304, headers=headers)
+        out = await run_forecast(plan)
+        return JSONResponse(out.model_dump(), headers=headers)
+    except ForecastBusy as e:
+        raise HTTPException(
+            status_code=429,
+            detail=str(e),
+            headers={"Retry-After": str(e.retry_after)},
+        )
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.post("/forecast_auto/batch")
+async def forecast_auto_batch(req: FinanceForecastBatchRequest):
+    """
+    여러 매장 일괄 예측. 줄마다 {"index": i, "store_id", ...단건 응답} (실패 시 "error").
+    exog 기준값은 한 번에 조회, 적합은 프로세스 풀에 청크로 분산,
+    매장이 끝나는 순서대로 스트리밍 (index로 입력 순서 복원).
+    """
+
+    async def lines():
+        # 스트리밍 중에도 살아 있도록 세션을 응답 생성기 안에서 연다
+        async with AsyncSessionLocal() as db:
+            async for line in forecast_finance_batch(db, req.stores):
+                yield json.dumps(line, ensure_ascii=False) + "\n"
+
+    return StreamingResponse(lines(), media_type="application/x-ndjson")
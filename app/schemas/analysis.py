@@ -1,7 +1,9 @@
 # app/schemas/analysis.py
 
 from pydantic import BaseModel, Field
-from typing import Dict, Optional
+from typing import Dict, List, Optional
+
+from app.core.config import settings
 
 
 class AnalysisRequest(BaseModel):
@@ -10,6 +12,14 @@ class AnalysisRequest(BaseModel):
     radius_m: int = Field(2000, ge=100, le=5000)
 
 
+class AnalysisBatchRequest(BaseModel):
+    sites: List[AnalysisRequest] = Field(
+        ..., min_length=1, max_length=settings.ANALYSIS_BATCH_MAX
+    )
+    # 반경 내 장소가 없는 지점은 단건과 같이 Kakao 수집 후 재집계
+    fetch_missing: bool = True
+
+
 class CompetitorAnalysis(BaseModel):
     count: int
     types: Dict[str, int]
@@ -22,6 +32,13 @@ class ReasoningDetails(BaseModel):
     personal_count: int
     floating_population: int
     radius_km: int = 2
+    # 거리감쇠 경쟁 압력 (app/services/competition.py, 탐색 반경 COMPETITION_RADIUS_M)
+    competition_pressure: Optional[float] = None
+    huff_share: Optional[float] = None  # 신규 점포 기대 점유율 1 / (1 + 압력)
+    nearest_competitor_m: Optional[float] = None
+    # 반경 내 피처 (app/services/feature_engine.py)
+    flow_score: Optional[float] = None
+    competition_density: Optional[float] = None
 
 
 class AnalysisResult(BaseModel):
@@ -30,3 +47,6 @@ class AnalysisResult(BaseModel):
     competitor_analysis: CompetitorAnalysis
     lat: float
     lon: float
+    # 외부 호출 실패/마감으로 DB-only·만료 캐시 기반 응답이면 True
+    degraded: bool = False
+    degraded_reasons: List[str] = Field(default_factory=list)
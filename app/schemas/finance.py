@@ -5,6 +5,8 @@
 from pydantic import BaseModel, Field
 from typing import List, Optional
 
+from app.core.config import settings
+
 
 class FinancePoint(BaseModel):
     month: str
@@ -54,6 +56,16 @@ class FinanceForecastAutoRequest(BaseModel):
     assumptions: dict | None = None
     lat: float | None = None
     lon: float | None = None
+    # 난수 seed 고정 (없으면 설정에 따라 입력 해시로 유도), numpy 32비트 범위
+    seed: int | None = Field(None, ge=0, le=2**32 - 1)
+    store_id: str | None = None  # 주면 매장별 적합 상태로 증분 예측
+
+
+class FinanceForecastBatchRequest(BaseModel):
+    # 매장별 단건 요청과 같은 형식 (store_id로 결과/증분 상태 구분)
+    stores: list[FinanceForecastAutoRequest] = Field(
+        ..., min_length=1, max_length=settings.FORECAST_BATCH_MAX
+    )
 
 
 class FinanceForecastAutoResponse(FinanceForecastResponse):
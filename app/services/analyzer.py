@@ -1,45 +1,26 @@
 # app/services/analyzer.py
 
 from __future__ import annotations
-import requests
+import asyncio
+from collections import defaultdict
 from typing import Sequence
+
+import numpy as np
 from sqlalchemy.ext.asyncio import AsyncSession
+from app.core import geo
 from app.core.config import settings
+from app.core.deadline import request_scope
 from app.db import crud
 from app.db.models import Place
+from app.services.feature_engine import CAFE_CATEGORY, FeatureEngine
+from app.services.grid import grid_layer
+from app.services.kakao import get_nearby_cafes
+from app.services.place_index import place_index
 
-KAKAO_API_KEY = settings.KAKAO_API_KEY
-
-
-async def fetch_kakao_cafes(lat: float, lon: float, radius_m: int = 2000) -> list[dict]:
-    """
-    카카오 카테고리 검색(카페: CE7) 호출. 원본 문서 리스트 반환.
-    """
-    url = "https://dapi.kakao.com/v2/local/search/category.json"
-    headers = {"Authorization": f"KakaoAK {KAKAO_API_KEY}"}
-    out: list[dict] = []
-    page = 1
-    while True:
-        params = {
-            "category_group_code": "CE7",
-            "x": lon,
-            "y": lat,
-            "radius": radius_m,
-            "sort": "distance",
-            "page": page,
-        }
-        r = requests.get(url, headers=headers, params=params, timeout=10)
-        r.raise_for_status()
-        data = r.json()
-        docs = data.get("documents", []) or []
-        if not docs:
-            break
-        out.extend(docs)
-        meta = data.get("meta", {}) or {}
-        if meta.get("is_end") or page >= 3:
-            break
-        page += 1
-    return out
+
+def suitability_score(competitors, floating_population=0):
+    """적합도 점수 0~100 = 80 - 경쟁 수 + 유동인구/1만 (스칼라/NumPy 배열 공용)"""
+    return np.clip(80 - competitors + floating_population // 10000, 0, 100)
 
 
 def _kakao_docs_to_places(docs: list[dict]) -> list[dict]:
@@ -73,25 +54,193 @@ async def upsert_kakao_places(db: AsyncSession, docs: list[dict]) -> int:
     return await crud.save_kakao_places(db, to_save)
 
 
+async def _lookup_places(
+    db: AsyncSession, lat: float, lon: float, radius_m: float
+) -> Sequence[Place]:
+    """인메모리 인덱스 우선, 미적재 시 DB 선필터 + haversine 후필터 (둘 다 실반경/거리순)"""
+    if place_index.ready:
+        await place_index.refresh_if_stale(db)
+        ids, _ = place_index.query_radius(lat, lon, radius_m)
+        return await crud.get_places_by_ids(db, ids)
+    places, _ = await crud.get_places_within_radius(db, lat, lon, radius_m)
+    return places
+
+
 async def find_places_nearby(
     db: AsyncSession, *, lat: float, lon: float, radius_km: float = 2.0
 ) -> Sequence[Place]:
     """
-    반경 rkm ≈ 위도/경도 상자 검색으로 근사. (1도 ≈ ~111km 가정)
+    반경 radius_km 내 Place (실제 대원거리 기준, 가까운 순).
+    - 인메모리 BallTree가 있으면 SQLite 조회 없이 id 산출
+    - 없으면 축별 deg 상자로 SQL 선필터 → NumPy haversine 후필터
+    - 비어 있으면 Kakao 수집/저장 후 재조회
+      (요청 스코프의 마감/서킷 상태에 따라 생략될 수 있음 → degraded 표시)
     """
-    deg = radius_km / 111.0
-    rows = await crud.get_places_bbox(db, lat - deg, lon - deg, lat + deg, lon + deg)
+    radius_m = radius_km * 1000
+    rows = await _lookup_places(db, lat, lon, radius_m)
     if rows:
         return rows
 
-    docs = await fetch_kakao_cafes(lat, lon, int(radius_km * 1000))
+    docs = await get_nearby_cafes(lat, lon, int(radius_m))
+    if docs:
+        await upsert_kakao_places(db, docs)  # 커밋 이벤트로 인덱스에도 반영
+        rows = await _lookup_places(db, lat, lon, radius_m)
+    return rows
+
+
+async def _aggregate(
+    db: AsyncSession, lat: float, lon: float, radius_m: float, *, force: bool = False
+) -> crud.AreaAggregate:
+    """격자 사전 집계로 답할 수 있으면 격자, 아니면 SQL 집계 한 번"""
+    if grid_layer.usable(lat, lon, radius_m):
+        await grid_layer.refresh(db, force=force)
+        return grid_layer.area_aggregate(lat, lon, radius_m)
+    return await crud.aggregate_places_in_radius(db, lat, lon, radius_m)
+
+
+async def summarize_area(
+    db: AsyncSession, *, lat: float, lon: float, radius_m: float
+) -> crud.AreaAggregate:
+    """
+    반경 내 경쟁 요약(수/프랜차이즈/개인/평균 유동인구).
+    비어 있으면 Kakao 수집/저장 후 재집계 (마감/서킷 open이면 DB 결과 그대로).
+    """
+    agg = await _aggregate(db, lat, lon, radius_m)
+    if agg.count:
+        return agg
+
+    docs = await get_nearby_cafes(lat, lon, int(radius_m))
     if docs:
         await upsert_kakao_places(db, docs)
-        rows = await crud.get_places_bbox(
-            db, lat - deg, lon - deg, lat + deg, lon + deg
+        agg = await _aggregate(db, lat, lon, radius_m, force=True)
+    return agg
+
+
+async def fetch_missing_areas(
+    db: AsyncSession, sites: Sequence[tuple[float, float, float]]
+) -> list[tuple[crud.AreaAggregate, list[str]]]:
+    """
+    빈 지점 여러 개를 summarize_area처럼 Kakao 수집 후 재집계 → (집계, degraded 사유).
+    - Kakao 호출만 ANALYSIS_BATCH_FETCH_CONCURRENCY개씩 동시에 (지점별 예산
+      ANALYSIS_DEADLINE_S, 바깥 스코프의 배치 예산이 더 이르면 그쪽)
+    - 저장/재집계는 세션을 공유하므로 순차
+    """
+
+    slots = asyncio.Semaphore(max(1, settings.ANALYSIS_BATCH_FETCH_CONCURRENCY))
+
+    async def fetch(lat: float, lon: float, radius_m: float):
+        async with slots:
+            with request_scope(settings.ANALYSIS_DEADLINE_S) as scope:
+                docs = await get_nearby_cafes(lat, lon, int(radius_m))
+        return docs, scope.reasons
+
+    fetched = await asyncio.gather(*(fetch(*s) for s in sites))
+    saved = False
+    for docs, _ in fetched:
+        if docs:
+            await upsert_kakao_places(db, docs)
+            saved = True
+    out = []
+    for (lat, lon, radius_m), (_, reasons) in zip(sites, fetched):
+        agg = await _aggregate(db, lat, lon, radius_m, force=saved)
+        out.append((agg, reasons))
+    return out
+
+
+def _aggregate_arrays(
+    cols: dict[str, np.ndarray], lat: float, lon: float, radius_m: float
+) -> crud.AreaAggregate:
+    """
+    lat 정렬된 후보 컬럼에서 한 지점의 반경 집계.
+    crud.aggregate_places_in_radius와 같은 거리식(geo.planar_dist2) → 같은 결과.
+    """
+    min_lat, min_lon, max_lat, max_lon = geo.bounding_box(lat, lon, radius_m)
+    sl = slice(
+        np.searchsorted(cols["lat"], min_lat, side="left"),
+        np.searchsorted(cols["lat"], max_lat, side="right"),
+    )
+    lons = cols["lon"][sl]
+    d2 = geo.planar_dist2(lat, lon, cols["lat"][sl], lons)
+    hit = (d2 <= radius_m * radius_m) & (lons >= min_lon) & (lons <= max_lon)
+    count = int(hit.sum())
+    franchise = int(cols["franchise"][sl][hit].sum())
+    ft = cols["foot_traffic"][sl][hit]
+    ft = ft[ft > 0]
+    return crud.AreaAggregate(
+        count=count,
+        franchise=franchise,
+        personal=count - franchise,
+        avg_foot_traffic=float(ft.sum()) / len(ft) if len(ft) else None,
+    )
+
+
+async def summarize_areas(
+    db: AsyncSession, sites: Sequence[tuple[float, float, float]]
+) -> list[crud.AreaAggregate]:
+    """
+    여러 (lat, lon, radius_m) 지점의 반경 요약을 일괄로 (Kakao 폴백 없음).
+    지점마다 summarize_area의 첫 집계와 같은 값:
+    - 격자로 답할 수 있는 지점: 반경별로 묶어 disk_sums 한 번
+    - 나머지: 합집합 상자 한 번 조회 → lat 정렬 + NumPy 거리 필터
+    """
+    out: list[crud.AreaAggregate | None] = [None] * len(sites)
+    by_radius: dict[float, list[int]] = defaultdict(list)
+    rest: list[int] = []
+    for i, (lat, lon, r) in enumerate(sites):
+        (by_radius[r] if grid_layer.usable(lat, lon, r) else rest).append(i)
+
+    if by_radius:
+        await grid_layer.refresh(db)
+        for r, idx in by_radius.items():
+            aggs = grid_layer.area_aggregates(
+                [sites[i][0] for i in idx], [sites[i][1] for i in idx], r
+            )
+            for i, agg in zip(idx, aggs):
+                out[i] = agg
+
+    if rest:
+        boxes = np.array([geo.bounding_box(*sites[i]) for i in rest])
+        cols = await crud.fetch_place_stats_bbox(
+            db,
+            boxes[:, 0].min(),
+            boxes[:, 1].min(),
+            boxes[:, 2].max(),
+            boxes[:, 3].max(),
         )
-        if rows:
-            return rows
+        order = np.argsort(cols["lat"], kind="stable")
+        cols = {k: v[order] for k, v in cols.items()}
+        for i in rest:
+            out[i] = _aggregate_arrays(cols, *sites[i])
+    return out
 
-    rows = await crud.widen_bbox_places(db, lat, lon, radii=(0.01, 0.02, 0.03))
-    return rows
+
+async def site_features(
+    db: AsyncSession, lats, lons, radius_m
+) -> dict[str, np.ndarray]:
+    """
+    지점 N개의 flow_score / competition_density (feature_engine.is_cafe = 경쟁).
+    인메모리 place_index가 있으면 그 BallTree/카테고리 코드로 (DB 조회 없음),
+    없으면 합집합 상자 한 번 조회 → 임시 엔진 (radius_m: 스칼라/지점별).
+    """
+    if place_index.ready:
+        await place_index.refresh_if_stale(db)
+        engine = FeatureEngine.from_index(place_index)
+    else:
+        engine = await FeatureEngine.for_sites(db, lats, lons, radius_m)
+    return engine.compute(
+        lats,
+        lons,
+        radius_m,
+        ("flow_score", "competition_density"),
+        category_contains=CAFE_CATEGORY,
+    )
+
+
+async def find_nearest_places(
+    db: AsyncSession, *, lat: float, lon: float, k: int = 10
+) -> list[Place]:
+    """최근접 k개 Place (거리순). 인메모리 인덱스 필요"""
+    if not place_index.ready:
+        return []
+    ids, _ = place_index.query_knn(lat, lon, k)
+    return await crud.get_places_by_ids(db, ids)
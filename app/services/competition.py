@@ -0,0 +1,185 @@
+# app/services/competition.py
+# -----------------------------------------------------------------------------
+# 거리감쇠 경쟁 압력 (Huff / 중력 모형)
+# - 경쟁점 j가 지점 i에 주는 압력 = 매력도 A_j × 거리감쇠 K(d_ij)
+#   · A_j = (1 + 유동인구_j / FT_REF)^ALPHA  (유동인구 없으면 1)
+#   · K: exponential e^(-d/h) | gaussian e^(-d²/2h²)
+#        | power (1 + d/h)^(-β) | linear max(0, 1 - d/R)
+#   · 탐색 반경 R(COMPETITION_RADIUS_M) 밖은 0 (커널 절단)
+# - Huff 점유율: 지점에 새로 여는 점포(A=1, d=0 → K=1) 기준 1 / (1 + 압력)
+# - 경쟁점 = 카페 카테고리 행만 (feature_engine.is_cafe, competition_density와 같은 규칙)
+#   → 카테고리 없는 수성구 유동인구 표본 지점은 압력에서 제외
+# - 이웃 탐색은 place_index.query_radius_many (BallTree 일괄 질의),
+#   인덱스 미적재 시 합집합 상자 한 번 조회 → 임시 인덱스로 같은 경로
+# - 지점별 합은 np.bincount → 지점/장소 단위 파이썬 루프 없음
+# -----------------------------------------------------------------------------
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+import numpy as np
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core import geo
+from app.core.config import settings
+from app.db import crud
+from app.services.feature_engine import is_cafe
+from app.services.place_index import PlaceIndex, place_index
+
+KERNELS = ("exponential", "gaussian", "power", "linear")
+
+
+@dataclass(slots=True, frozen=True)
+class DecayConfig:
+    kernel: str = "exponential"
+    bandwidth_m: float = 500.0
+    radius_m: float = 2000.0
+    beta: float = 2.0
+    ft_ref: float = 10000.0
+    ft_alpha: float = 0.5
+
+    def __post_init__(self):
+        if self.kernel not in KERNELS:
+            raise ValueError(f"알 수 없는 커널 {self.kernel!r} (가능: {KERNELS})")
+        if self.bandwidth_m <= 0 or self.radius_m <= 0 or self.ft_ref <= 0:
+            raise ValueError("bandwidth_m/radius_m/ft_ref는 양수여야 합니다")
+
+    @classmethod
+    def from_settings(cls) -> DecayConfig:
+        return cls(
+            kernel=settings.COMPETITION_KERNEL,
+            bandwidth_m=settings.COMPETITION_BANDWIDTH_M,
+            radius_m=settings.COMPETITION_RADIUS_M,
+            beta=settings.COMPETITION_POWER_BETA,
+            ft_ref=settings.COMPETITION_FT_REF,
+            ft_alpha=settings.COMPETITION_FT_ALPHA,
+        )
+
+
+@dataclass(slots=True)
+class CompetitionPressure:
+    """지점 N개의 (N,) 배열 묶음"""
+
+    pressure: np.ndarray  # Σ A_j K(d_ij)
+    count: np.ndarray  # 탐색 반경 내 경쟁점 수
+    nearest_m: np.ndarray  # 최근접 경쟁점 거리 (없으면 NaN)
+    huff_share: np.ndarray  # 1 / (1 + pressure)
+
+    def __len__(self) -> int:
+        return len(self.pressure)
+
+    def row(self, i: int) -> dict:
+        """응답용 i번째 지점 값"""
+        nearest = float(self.nearest_m[i])
+        return {
+            "competition_pressure": round(float(self.pressure[i]), 4),
+            "huff_share": round(float(self.huff_share[i]), 4),
+            "nearest_competitor_m": None if np.isnan(nearest) else round(nearest, 1),
+        }
+
+
+def kernel_weights(dist_m, cfg: DecayConfig) -> np.ndarray:
+    """거리(m) 배열 → 감쇠 가중치 (d=0에서 1, 탐색 반경 밖 0)"""
+    d = np.asarray(dist_m, dtype=np.float64)
+    h = cfg.bandwidth_m
+    if cfg.kernel == "exponential":
+        w = np.exp(-d / h)
+    elif cfg.kernel == "gaussian":
+        w = np.exp(-0.5 * (d / h) ** 2)
+    elif cfg.kernel == "power":
+        w = (1.0 + d / h) ** -cfg.beta
+    else:
+        w = 1.0 - d / cfg.radius_m
+    return np.where(d <= cfg.radius_m, np.maximum(w, 0.0), 0.0)
+
+
+def attractiveness(foot_traffic, cfg: DecayConfig) -> np.ndarray:
+    """경쟁점 매력도 (유동인구가 많을수록 큼, 결측/음수는 0으로)"""
+    ft = np.nan_to_num(np.asarray(foot_traffic, dtype=np.float64)).clip(min=0.0)
+    return (1.0 + ft / cfg.ft_ref) ** cfg.ft_alpha
+
+
+def pressure_from_neighbours(
+    n_sites: int,
+    site: np.ndarray,
+    dist_m: np.ndarray,
+    foot_traffic: np.ndarray,
+    cfg: DecayConfig,
+) -> CompetitionPressure:
+    """
+    평탄화된 이웃 목록(site[k]번 지점 ↔ 거리 dist_m[k], 유동인구 foot_traffic[k])
+    → 지점별 경쟁 압력. 반경 밖 항목은 무시.
+    """
+    keep = dist_m <= cfg.radius_m
+    site, dist_m = site[keep], dist_m[keep]
+    w = kernel_weights(dist_m, cfg) * attractiveness(foot_traffic[keep], cfg)
+    pressure = np.bincount(site, weights=w, minlength=n_sites)
+    count = np.bincount(site, minlength=n_sites)
+    nearest = np.full(n_sites, np.inf)
+    np.minimum.at(nearest, site, dist_m)
+    nearest[np.isinf(nearest)] = np.nan
+    return CompetitionPressure(
+        pressure=pressure,
+        count=count,
+        nearest_m=nearest,
+        huff_share=1.0 / (1.0 + pressure),
+    )
+
+
+async def _fallback_index(
+    db: AsyncSession, lats: np.ndarray, lons: np.ndarray, radius_m: float
+) -> PlaceIndex:
+    """인덱스 미적재 시: 모든 지점의 합집합 상자 한 번 조회 → 임시 BallTree"""
+    # 경도 폭은 가장 고위도 지점 기준 (상자 안쪽이 잘리지 않게)
+    dlat, dlon = geo.degree_deltas(float(np.abs(lats).max()), radius_m)
+    cols = await crud.fetch_place_stats_bbox(
+        db,
+        lats.min() - dlat,
+        lons.min() - dlon,
+        lats.max() + dlat,
+        lons.max() + dlon,
+        with_category=True,
+    )
+    idx = PlaceIndex()
+    idx.build(
+        np.arange(len(cols["lat"])),
+        cols["lat"],
+        cols["lon"],
+        cols["foot_traffic"],
+        cols["category"],
+    )
+    return idx
+
+
+def pressure_in_index(
+    idx: PlaceIndex, lats: np.ndarray, lons: np.ndarray, cfg: DecayConfig
+) -> CompetitionPressure:
+    """인덱스의 카페 행만 경쟁점으로 지점별 압력"""
+    site, rows, dist = idx.query_radius_many(lats, lons, cfg.radius_m)
+    cafe_codes = np.fromiter(map(is_cafe, idx.categories), bool, len(idx.categories))
+    keep = cafe_codes[idx.cat[rows]]
+    return pressure_from_neighbours(
+        len(lats), site[keep], dist[keep], idx.ft[rows[keep]], cfg
+    )
+
+
+async def competition_pressure(
+    db: AsyncSession, lats, lons, cfg: DecayConfig | None = None
+) -> CompetitionPressure:
+    """
+    지점 N개의 거리감쇠 경쟁 압력 일괄 계산 (경쟁점 = 카페 행).
+    인메모리 인덱스가 있으면 SQLite 조회 없이 BallTree 한 번 질의.
+    """
+    cfg = cfg or DecayConfig.from_settings()
+    lats = np.atleast_1d(np.asarray(lats, dtype=np.float64))
+    lons = np.atleast_1d(np.asarray(lons, dtype=np.float64))
+    if not len(lats):
+        empty = np.empty(0, dtype=np.int64)
+        return pressure_from_neighbours(0, empty, empty.astype(float), empty, cfg)
+
+    if place_index.ready:
+        await place_index.refresh_if_stale(db)
+        idx = place_index
+    else:
+        idx = await _fallback_index(db, lats, lons, cfg.radius_m)
+    return pressure_in_index(idx, lats, lons, cfg)
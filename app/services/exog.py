@@ -4,7 +4,9 @@ from __future__ import annotations
 from typing import List, Tuple, Optional
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, func
+from app.core.geo import bounding_box
 from app.db.models import Place
+from app.db.spatial import bbox_filter
 
 
 def quarter_to_monthly(q_value: int) -> list[int]:
@@ -29,15 +31,12 @@ async def get_latest_quarter_foot_traffic(
     - 없으면 테이블 전체의 최신 레코드들 중 평균 사용
     """
     if lat is not None and lon is not None:
-        d = radius_m / 111_000
+        box = bounding_box(lat, lon, radius_m)
         stmt = select(
             func.avg(Place.foot_traffic)
             if agg == "avg"
             else func.sum(Place.foot_traffic)
-        ).where(
-            Place.lat.between(lat - d, lat + d),
-            Place.lon.between(lon - d, lon + d),
-        )
+        ).where(*bbox_filter(Place, *box))
     else:
         stmt = select(func.avg(Place.foot_traffic))
 
@@ -0,0 +1,363 @@
+# app/services/feature_engine.py
+# -----------------------------------------------------------------------------
+# 컬럼형 지점 피처 엔진 (features.py 스칼라 함수의 일괄 버전)
+# - 장소는 NumPy 열로 보관: lat, lon, 카테고리 코드(int32), 유동인구
+#   · 카테고리 문자열은 어휘(CategoryVocab)로 한 번만 인코딩
+#   · 대상 카테고리 판정은 어휘 수준에서 코드 집합으로 바꾼 뒤 정수 비교
+#   · 경쟁(카페) 판정은 is_cafe 하나로 통일 (분석/예측 공용)
+# - 지점 N개(지점별 반경 가능): BallTree 일괄 질의 → 평탄화 이웃 목록(NeighbourFrame)
+#   (인메모리 place_index가 있으면 그 BallTree/열을 그대로 사용 — from_index)
+# - 피처는 FEATURES 레지스트리 함수(frame → (N,) 배열), 계산 결과는 frame에 메모
+#   → 새 피처는 @feature("이름")으로 추가, 다른 피처를 frame.get()으로 재사용
+# -----------------------------------------------------------------------------
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Callable, Iterable, Sequence
+
+import numpy as np
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core import geo
+from app.db import crud
+from app.db.models import Place
+from app.services import features
+from app.services.place_index import PlaceIndex
+
+CAFE_CATEGORY = "카페"
+
+
+def is_cafe(category: str) -> bool:
+    """
+    경쟁(카페) 카테고리: 경로 어디든 '카페' 포함
+    (Kakao '음식점 > 카페 > 커피전문점', 적재 기본값 '카페' 모두)
+    """
+    return CAFE_CATEGORY in category
+
+
+class CategoryVocab:
+    """카테고리 문자열 ↔ 정수 코드 (None은 "")"""
+
+    def __init__(self, names: Sequence[str]):
+        self.names = np.asarray(names, dtype=object)
+        self._code = {n: i for i, n in enumerate(self.names.tolist())}
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    @classmethod
+    def encode(cls, categories) -> tuple[CategoryVocab, np.ndarray]:
+        """문자열 열 → (어휘, int32 코드 열)"""
+        values = np.asarray(["" if c is None else c for c in categories], dtype=object)
+        if not len(values):
+            return cls([]), np.empty(0, dtype=np.int32)
+        names, codes = np.unique(values, return_inverse=True)
+        return cls(names), codes.astype(np.int32)
+
+    def code(self, name: str) -> int:
+        """정확히 일치하는 코드 (없으면 -1)"""
+        return self._code.get(name, -1)
+
+    def codes_where(self, pred: Callable[[str], bool]) -> np.ndarray:
+        """조건을 만족하는 카테고리 코드 (판정은 어휘 크기만큼만)"""
+        return np.fromiter(
+            (i for i, n in enumerate(self.names.tolist()) if pred(n)), np.int32
+        )
+
+    def mask(self, codes: np.ndarray, targets: np.ndarray) -> np.ndarray:
+        """코드 열 중 targets에 속하는 행 (어휘 크기 룩업 테이블 → 정수 인덱싱)"""
+        lut = np.zeros(len(self) + 1, dtype=bool)
+        lut[targets] = True
+        return lut[codes]
+
+
+@dataclass(slots=True)
+class PlaceColumns:
+    lat: np.ndarray  # float64
+    lon: np.ndarray  # float64
+    category: np.ndarray  # int32 (vocab 코드)
+    foot_traffic: np.ndarray  # float64 (없으면 0)
+    vocab: CategoryVocab
+    franchise: np.ndarray | None = None  # bool (crud.is_franchise 판정)
+
+    def __len__(self) -> int:
+        return len(self.lat)
+
+    @classmethod
+    def from_arrays(
+        cls, lat, lon, category, foot_traffic, franchise=None
+    ) -> PlaceColumns:
+        """category=None이면 카테고리 없이 (모두 코드 0 = "")"""
+        lat = np.asarray(lat, dtype=np.float64)
+        if category is None:
+            vocab, codes = CategoryVocab([""]), np.zeros(len(lat), dtype=np.int32)
+        else:
+            vocab, codes = CategoryVocab.encode(category)
+        return cls(
+            lat=lat,
+            lon=np.asarray(lon, dtype=np.float64),
+            category=codes,
+            foot_traffic=np.nan_to_num(np.asarray(foot_traffic, dtype=np.float64)),
+            vocab=vocab,
+            franchise=None if franchise is None else np.asarray(franchise, dtype=bool),
+        )
+
+    @classmethod
+    def from_places(cls, places: Sequence[Place]) -> PlaceColumns:
+        """ORM 목록 → 열 (이미 메모리에 있는 결과를 재사용할 때)"""
+        return cls.from_arrays(
+            [p.lat for p in places],
+            [p.lon for p in places],
+            [p.category for p in places],
+            [p.foot_traffic or 0 for p in places],
+        )
+
+    @classmethod
+    async def from_bbox(
+        cls,
+        db: AsyncSession,
+        min_lat: float,
+        min_lon: float,
+        max_lat: float,
+        max_lon: float,
+    ) -> PlaceColumns:
+        """상자 내 장소를 ORM 객체 없이 한 번에"""
+        cols = await crud.fetch_place_stats_bbox(
+            db, min_lat, min_lon, max_lat, max_lon, with_category=True
+        )
+        return cls.from_arrays(
+            cols["lat"],
+            cols["lon"],
+            cols["category"],
+            cols["foot_traffic"],
+            cols["franchise"],
+        )
+
+
+@dataclass(slots=True)
+class NeighbourFrame:
+    """
+    지점 N개의 반경 내 이웃 (평탄화): site[k]번 지점 ↔ 장소 행 rows[k], 거리 dist_m[k].
+    params: 피처 인자 (target_codes, transit_nodes 등)
+    """
+
+    n_sites: int
+    site: np.ndarray
+    rows: np.ndarray
+    dist_m: np.ndarray
+    cols: PlaceColumns
+    params: dict = field(default_factory=dict)
+    _memo: dict = field(default_factory=dict)
+
+    def get(self, name: str) -> np.ndarray:
+        out = self._memo.get(name)
+        if out is None:
+            out = self._memo[name] = FEATURES[name](self)
+        return out
+
+    def count(self, mask: np.ndarray | None = None) -> np.ndarray:
+        """지점별 이웃 수 (mask: 이웃 단위 bool)"""
+        site = self.site if mask is None else self.site[mask]
+        return np.bincount(site, minlength=self.n_sites)
+
+    def sum(self, values: np.ndarray) -> np.ndarray:
+        """지점별 합 (values: 이웃 단위)"""
+        return np.bincount(self.site, weights=values, minlength=self.n_sites)
+
+    def max(self, values: np.ndarray, empty: float = 0.0) -> np.ndarray:
+        out = np.full(self.n_sites, -np.inf)
+        np.maximum.at(out, self.site, values)
+        out[np.isinf(out)] = empty
+        return out
+
+    def min(
+        self, values: np.ndarray, mask: np.ndarray | None = None, empty=np.nan
+    ) -> np.ndarray:
+        site = self.site if mask is None else self.site[mask]
+        values = values if mask is None else values[mask]
+        out = np.full(self.n_sites, np.inf)
+        np.minimum.at(out, site, values)
+        out[np.isinf(out)] = empty
+        return out
+
+    def column(self, name: str) -> np.ndarray:
+        """장소 열을 이웃 단위로 (예: column("foot_traffic"))"""
+        return getattr(self.cols, name)[self.rows]
+
+
+# ── 피처 레지스트리 ───────────────────────────────────────────────────────────
+FEATURES: dict[str, Callable[[NeighbourFrame], np.ndarray]] = {}
+
+
+def feature(name: str):
+    def deco(fn: Callable[[NeighbourFrame], np.ndarray]):
+        FEATURES[name] = fn
+        return fn
+
+    return deco
+
+
+@feature("num_poi")
+def _num_poi(f: NeighbourFrame) -> np.ndarray:
+    return f.count()
+
+
+@feature("avg_foot_traffic")
+def _avg_foot_traffic(f: NeighbourFrame) -> np.ndarray:
+    """유동인구 > 0 인 이웃 평균 (없으면 0)"""
+    ft = f.column("foot_traffic")
+    n = f.count(ft > 0)
+    return np.divide(f.sum(ft), n, out=np.zeros(f.n_sites), where=n > 0)
+
+
+@feature("max_foot_traffic")
+def _max_foot_traffic(f: NeighbourFrame) -> np.ndarray:
+    return f.max(f.column("foot_traffic"))
+
+
+@feature("nearest_franchise_m")
+def _nearest_franchise_m(f: NeighbourFrame) -> np.ndarray:
+    """반경 내 최근접 프랜차이즈 거리 (없으면 NaN)"""
+    return f.min(f.dist_m, mask=f.column("franchise"))
+
+
+@feature("foot_traffic_pct")
+def _foot_traffic_pct(f: NeighbourFrame) -> np.ndarray:
+    """
+    반경 내 (유동인구 > 0) 이웃 중 지점 유동인구(params["site_foot_traffic"])
+    이하인 비율 0~1. 지점 값이 없거나 비교 대상이 없으면 NaN.
+    """
+    own = np.asarray(f.params["site_foot_traffic"], dtype=np.float64)
+    ft = f.column("foot_traffic")
+    pos = ft > 0
+    n = f.count(pos)
+    below = f.count(pos & (ft <= own[f.site]))
+    out = np.full(f.n_sites, np.nan)
+    ok = (own > 0) & (n > 0)
+    out[ok] = below[ok] / n[ok]
+    return out
+
+
+@feature("category_count")
+def _category_count(f: NeighbourFrame) -> np.ndarray:
+    """대상 카테고리(params["target_codes"]) 이웃 수"""
+    targets = f.params.get("target_codes")
+    if targets is None:
+        return np.zeros(f.n_sites, dtype=np.int64)
+    return f.count(f.cols.vocab.mask(f.column("category"), targets))
+
+
+@feature("competition_density")
+def _competition_density(f: NeighbourFrame) -> np.ndarray:
+    return features.competition_densities(f.get("category_count"))
+
+
+@feature("flow_score")
+def _flow_score(f: NeighbourFrame) -> np.ndarray:
+    return features.flow_scores(
+        f.get("num_poi"), f.params.get("transit_nodes", 0), f.get("avg_foot_traffic")
+    )
+
+
+# ── 엔진 ────────────────────────────────────────────────────────────────────
+class FeatureEngine:
+    """PlaceColumns 위의 BallTree + 레지스트리 피처 일괄 계산"""
+
+    def __init__(self, cols: PlaceColumns):
+        self.cols = cols
+        self._index = PlaceIndex()
+        self._index.build(np.arange(len(cols)), cols.lat, cols.lon)
+
+    @classmethod
+    def from_index(cls, index: PlaceIndex) -> FeatureEngine:
+        """적재된 인메모리 인덱스 재사용 (DB 조회/BallTree 재구축 없음, 행 = 인덱스 행)"""
+        engine = cls.__new__(cls)
+        lat, lon = np.degrees(index.rad).T
+        engine.cols = PlaceColumns(
+            lat=lat,
+            lon=lon,
+            category=index.cat,
+            foot_traffic=index.ft,
+            vocab=CategoryVocab(index.categories),
+        )
+        engine._index = index
+        return engine
+
+    @classmethod
+    async def for_sites(cls, db: AsyncSession, lats, lons, radius_m) -> FeatureEngine:
+        """지점들의 반경을 모두 덮는 합집합 상자 한 번 조회로 엔진 구성"""
+        lats = np.atleast_1d(np.asarray(lats, dtype=np.float64))
+        lons = np.atleast_1d(np.asarray(lons, dtype=np.float64))
+        if not len(lats):
+            return cls(PlaceColumns.from_arrays([], [], [], []))
+        r = float(np.max(radius_m))
+        dlat, dlon = geo.degree_deltas(float(np.abs(lats).max()), r)
+        cols = await PlaceColumns.from_bbox(
+            db,
+            lats.min() - dlat,
+            lons.min() - dlon,
+            lats.max() + dlat,
+            lons.max() + dlon,
+        )
+        return cls(cols)
+
+    def target_codes(
+        self, *, category: str | None = None, contains: str | None = None
+    ) -> np.ndarray | None:
+        """대상 카테고리 → 코드 집합 (정확 일치 또는 부분 문자열, 카페는 is_cafe 규칙)"""
+        vocab = self.cols.vocab
+        if category is not None:
+            code = vocab.code(category)
+            return np.array([code] if code >= 0 else [], dtype=np.int32)
+        if contains == CAFE_CATEGORY:
+            return vocab.codes_where(is_cafe)
+        if contains is not None:
+            return vocab.codes_where(lambda n: contains in n)
+        return None
+
+    def frame(
+        self, lats, lons, radius_m, *, exclude_rows=None, **params
+    ) -> NeighbourFrame:
+        """
+        radius_m: 스칼라 또는 지점별 배열.
+        exclude_rows: 지점 i가 장소 행이면 그 행(자기 자신)을 이웃에서 제외.
+        """
+        lats = np.atleast_1d(np.asarray(lats, dtype=np.float64))
+        lons = np.atleast_1d(np.asarray(lons, dtype=np.float64))
+        radius = np.broadcast_to(np.asarray(radius_m, dtype=np.float64), lats.shape)
+        r_max = float(radius.max()) if len(radius) else 0.0
+        site, rows, dist = self._index.query_radius_many(lats, lons, r_max)
+        keep = dist <= radius[site]
+        if exclude_rows is not None:
+            keep &= rows != np.asarray(exclude_rows)[site]
+        return NeighbourFrame(
+            n_sites=len(lats),
+            site=site[keep],
+            rows=rows[keep],
+            dist_m=dist[keep],
+            cols=self.cols,
+            params=params,
+        )
+
+    def compute(
+        self,
+        lats,
+        lons,
+        radius_m,
+        names: Iterable[str] = ("num_poi", "avg_foot_traffic", "flow_score"),
+        *,
+        category: str | None = None,
+        category_contains: str | None = None,
+        transit_nodes=0,
+    ) -> dict[str, np.ndarray]:
+        """{피처 이름: (N,) 배열}"""
+        frame = self.frame(
+            lats,
+            lons,
+            radius_m,
+            target_codes=self.target_codes(
+                category=category, contains=category_contains
+            ),
+            transit_nodes=transit_nodes,
+        )
+        return {name: frame.get(name) for name in names}
@@ -0,0 +1,172 @@
+# app/services/feature_store.py
+# -----------------------------------------------------------------------------
+# 장소별 사전 계산 피처 스토어 (place_features 테이블)
+# - 피처: 300/500/1000m 내 다른 장소 수, 1km 내 최근접 프랜차이즈 거리,
+#         1km 내 유동인구 백분위 (feature_engine 일괄 계산)
+# - 전체 구축/증분 갱신 모두 백그라운드 작업(job_runner, kind="feature_store")
+# - 증분: 커밋 이벤트("places" — 수성구 적재/Kakao 저장)의 좌표를 모아 두었다가
+#   FEATURE_STORE_DEBOUNCE_S 뒤 한 번에, 그 좌표 1km 안 장소만 재계산
+#   (그 장소들의 이웃까지 덮도록 2km 확장 상자만 조회)
+# - 갱신마다 데이터 버전(feature_store_meta.version) +1, 행마다 계산 버전 기록
+#   → 요청 경로는 버전으로 캐시 검증(ETag)
+# -----------------------------------------------------------------------------
+from __future__ import annotations
+
+import asyncio
+import time
+
+import numpy as np
+from loguru import logger
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core import geo
+from app.core.config import settings
+from app.db import crud, events
+from app.services.feature_engine import FeatureEngine, PlaceColumns
+from app.services.place_index import PlaceIndex
+
+STORE_NAME = "place_features"
+FEATURE_RADII = (300, 500, 1000)
+_REACH_M = float(max(FEATURE_RADII))
+_WORLD = (-90.0, -180.0, 90.0, 180.0)
+_SITE_CHUNK = 2048  # 한 번에 이웃 목록을 만들 장소 수 (메모리 상한)
+_MAX_TOUCHED = 20_000  # 쌓인 좌표가 이보다 많으면 증분 대신 전체 재구축
+
+
+def compute_place_features(cols: dict, rows: np.ndarray) -> dict[str, np.ndarray]:
+    """
+    cols(fetch_place_stats_bbox(with_id=True) 결과) 중 rows 장소의 피처.
+    이웃은 cols 전체에서 찾으므로 cols가 rows 주변 _REACH_M를 덮어야 함.
+    """
+    pc = PlaceColumns.from_arrays(
+        cols["lat"], cols["lon"], None, cols["foot_traffic"], cols["franchise"]
+    )
+    engine = FeatureEngine(pc)
+    parts: list[dict[str, np.ndarray]] = []
+    for i in range(0, len(rows), _SITE_CHUNK):
+        r = rows[i : i + _SITE_CHUNK]
+        frame = engine.frame(
+            pc.lat[r],
+            pc.lon[r],
+            _REACH_M,
+            exclude_rows=r,
+            site_foot_traffic=pc.foot_traffic[r],
+        )
+        part = {"place_id": cols["id"][r]}
+        for radius in FEATURE_RADII:
+            part[f"cnt_{radius}"] = frame.count(frame.dist_m <= radius)
+        part["nearest_franchise_m"] = frame.get("nearest_franchise_m")
+        part["ft_pct"] = frame.get("foot_traffic_pct")
+        parts.append(part)
+    if not parts:
+        return {"place_id": np.empty(0, dtype=np.int64)}
+    return {k: np.concatenate([p[k] for p in parts]) for k in parts[0]}
+
+
+class PlaceFeatureStore:
+    def __init__(self):
+        self.ready = False
+        self.version: int | None = None  # 이 워커가 마지막으로 본 데이터 버전
+        self._touched: list[tuple[float, float]] = []
+        self._timer: asyncio.TimerHandle | None = None
+        self.last_refresh: dict | None = None
+
+    async def load(self, db: AsyncSession) -> bool:
+        """저장된 버전 적재. 한 번도 구축되지 않았거나 피처 행이 비워졌으면 False"""
+        self.version = await crud.get_feature_store_version(db, STORE_NAME)
+        self.ready = True
+        return self.version is not None and await crud.has_place_features(db)
+
+    # ── 갱신 ────────────────────────────────────────────────────────────────
+    async def _save(
+        self, db: AsyncSession, cols: dict, rows: np.ndarray, *, full: bool
+    ) -> dict:
+        t0 = time.perf_counter()
+        feats = await asyncio.to_thread(compute_place_features, cols, rows)
+        self.version = await crud.save_place_features(db, STORE_NAME, feats, full=full)
+        self.last_refresh = {
+            "mode": "full" if full else "incremental",
+            "places": int(len(rows)),
+            "version": self.version,
+            "elapsed_s": round(time.perf_counter() - t0, 3),
+        }
+        logger.info(f"[feature_store] {self.last_refresh}")
+        return self.last_refresh
+
+    async def rebuild(self, db: AsyncSession) -> dict:
+        """전체 장소 재계산 (이전에 쌓인 좌표도 함께 반영됨)"""
+        self._touched.clear()
+        cols = await crud.fetch_place_stats_bbox(db, *_WORLD, with_id=True)
+        return await self._save(db, cols, np.arange(len(cols["id"])), full=True)
+
+    async def refresh(self, db: AsyncSession) -> dict:
+        """쌓인 좌표 주변 장소만 재계산 (갱신 중 새로 쌓인 좌표는 다음 바퀴)"""
+        result = {"mode": "incremental", "places": 0, "version": self.version}
+        while self._touched:
+            touched, self._touched = self._touched, []
+            if len(touched) > _MAX_TOUCHED:
+                return await self.rebuild(db)
+            try:
+                result = await self._refresh_around(db, np.array(touched))
+            except Exception:
+                self._touched.extend(touched)
+                raise
+        return result
+
+    async def _refresh_around(self, db: AsyncSession, touched: np.ndarray) -> dict:
+        lats, lons = touched[:, 0], touched[:, 1]
+        # 영향 장소(좌표 1km 내) + 그 이웃(다시 1km)까지 덮는 상자
+        dlat, dlon = geo.degree_deltas(float(np.abs(lats).max()), 2 * _REACH_M)
+        cols = await crud.fetch_place_stats_bbox(
+            db,
+            lats.min() - dlat,
+            lons.min() - dlon,
+            lats.max() + dlat,
+            lons.max() + dlon,
+            with_id=True,
+        )
+        near = PlaceIndex()
+        near.build(np.arange(len(lats)), lats, lons)
+        site, _, _ = near.query_radius_many(cols["lat"], cols["lon"], _REACH_M)
+        return await self._save(db, cols, np.unique(site), full=False)
+
+    # ── 쓰기 이벤트 → 디바운스된 증분 작업 ──────────────────────────────────
+    def on_places_written(self, rows: list[dict]) -> None:
+        if not self.ready or not rows:
+            return
+        self._touched.extend((r["lat"], r["lon"]) for r in rows)
+        self._schedule()
+
+    def _schedule(self) -> None:
+        if self._timer is not None:
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:  # 루프 밖 쓰기(스크립트) → 다음 갱신 때 함께 반영
+            return
+        self._timer = loop.call_later(
+            settings.FEATURE_STORE_DEBOUNCE_S,
+            lambda: asyncio.ensure_future(self._fire()),
+        )
+
+    async def _fire(self) -> None:
+        self._timer = None
+        if not self._touched:
+            return
+        from app.services.jobs import submit_feature_refresh
+
+        job = await submit_feature_refresh()
+        if job.status == "running":
+            # 이미 돌던 작업이 반환됨 → 끝난 뒤 남은 좌표를 처리하도록 재예약
+            self._schedule()
+
+    def stats(self) -> dict:
+        return {
+            "version": self.version,
+            "pending_coords": len(self._touched),
+            "last_refresh": self.last_refresh,
+        }
+
+
+feature_store = PlaceFeatureStore()
+events.subscribe("places", feature_store.on_places_written)
@@ -1,6 +1,9 @@
 # app/services/features.py
 
 from typing import Sequence
+
+import numpy as np
+
 from app.db.models import Place
 
 
@@ -20,3 +23,28 @@ def flow_score(
 def competition_density(places: Sequence[Place], target_cat: str) -> float:
     k = sum(1 for p in places if p.category == target_cat)
     return min(1.0, k / 10)
+
+
+# ── 배열판 (feature_engine: 지점 N개 일괄, 위 스칼라 함수와 같은 식) ─────────
+def flow_scores(num_poi, transit_nodes, avg_foot_traffic) -> np.ndarray:
+    """flow_score의 NumPy 판 (인자는 스칼라/배열 브로드캐스트)"""
+    s_poi = np.minimum(1.0, np.asarray(num_poi, dtype=np.float64) / 50)
+    s_transit = np.minimum(1.0, np.asarray(transit_nodes, dtype=np.float64) / 10)
+    foot = np.nan_to_num(np.asarray(avg_foot_traffic, dtype=np.float64))
+    s_foot = np.minimum(1.0, foot / 20000)
+    return np.round(0.4 * s_poi + 0.2 * s_transit + 0.4 * s_foot, 3)
+
+
+def competition_densities(category_count) -> np.ndarray:
+    """competition_density의 NumPy 판 (대상 카테고리 개수 배열 → 0~1)"""
+    return np.minimum(1.0, np.asarray(category_count, dtype=np.float64) / 10)
+
+
+def competition_pressure_score(pressure, scale: float = 10.0):
+    """
+    거리감쇠 경쟁 압력(competition.competition_pressure) → 0~1.
+    competition_density(반경 내 개수/10)와 달리 가깝고 붐비는 경쟁점일수록 크게.
+    스칼라/NumPy 배열 공용 (일괄 지점은 배열 그대로).
+    """
+    s = 1.0 - np.exp(-np.asarray(pressure, dtype=np.float64) / scale)
+    return float(s) if s.ndim == 0 else s
@@ -1,22 +1,33 @@
 # app/services/forecast.py
 
 from __future__ import annotations
-from dataclasses import dataclass
-from typing import Iterable, Optional, Sequence
+import asyncio
+import hashlib
+import os
+import time
+from collections import defaultdict
+from dataclasses import asdict, dataclass
+from functools import lru_cache
+from typing import AsyncIterator, Iterable, Optional, Sequence
 
 import numpy as np
 import pandas as pd
+from loguru import logger
 from statsmodels.tsa.statespace.sarimax import SARIMAX
 
 from app.schemas.finance import (
-    FinancePoint,
     FinanceForecastAutoRequest,
     FinanceForecastAutoResponse,
     ForecastItem,
 )
-from app.db.crud import get_places_bbox
+from app.core.cache import AsyncTTLCache
+from app.core.config import settings
 from app.db.session import AsyncSession
-from app.db.crud import get_ftq_recent_near
+from app.services import forecast_state
+from app.services.feature_engine import PlaceColumns, is_cafe
+from app.services.forecast_pool import ForecastBusy, forecast_pool
+from app.services.forecast_state import SeriesState
+from app.services.ftq_snapshot import ftq_snapshot
 
 from sklearn.ensemble import RandomForestRegressor
 
@@ -41,12 +52,6 @@ def _assumption_dict(a_like) -> dict:
     return dump() if callable(dump) else dict(a_like)
 
 
-def _to_month_index(series: Sequence[FinancePoint]) -> pd.Series:
-    idx = pd.PeriodIndex([p.month for p in series], freq="M")
-    vals = [p.sales for p in series]
-    return pd.Series(vals, index=idx)
-
-
 def _calc_costs(sales: int, a: CostAssumptions) -> dict:
     cogs = int(sales * a.cogs_rate)
     return {
@@ -60,7 +65,7 @@ def _calc_costs(sales: int, a: CostAssumptions) -> dict:
 
 
 def _make_items_with_conf(
-    months: pd.PeriodIndex,
+    months: Iterable,
     mean: Iterable[float],
     lower: Iterable[float],
     upper: Iterable[float],
@@ -85,23 +90,28 @@ def _quarter_weights() -> list[float]:
     return [0.98, 1.00, 1.02]
 
 
-def _apply_monthly_weights(start_period: pd.Period, h: int, base: Iterable[float]):
-    months = pd.period_range(start=start_period, periods=h, freq="M")
+@lru_cache(maxsize=256)
+def _month_weights(start: str, h: int) -> tuple[tuple[str, ...], np.ndarray]:
+    """(월 라벨, 월 가중치) — 같은 (시작 월, 기간)은 한 번만 계산 (읽기 전용)"""
+    months = pd.period_range(start=start, periods=h, freq="M")
     w = _quarter_weights()
     weights = np.array([w[(per.month - 1) % 3] for per in months], dtype=float)
-    base = np.array(list(base), dtype=float)
-    return base * weights, months
+    weights.flags.writeable = False
+    return tuple(str(m) for m in months), weights
 
 
-def _random_monthly_noise(h: int) -> np.ndarray:
-    return np.random.default_rng().uniform(0.90, 1.10, size=h)
+def _random_monthly_noise(h: int, seed: Optional[int] = None) -> np.ndarray:
+    """seed가 있으면 재현 가능 (결정적 모드)"""
+    return np.random.default_rng(seed).uniform(0.90, 1.10, size=h)
 
 
-def _apply_monthly_noise(start_period: pd.Period, h: int, base: Iterable[float]):
-    months = pd.period_range(start=start_period, periods=h, freq="M")
-    noise = _random_monthly_noise(h)
-    base = np.array(list(base), dtype=float)
-    return base * noise, months
+# ── 적합 설정 (바꾸면 적합 캐시 키도 바뀜) ─────────────────────────────────
+MODEL_CONFIG: dict = {
+    "order": (1, 1, 1),
+    "seasonal_order": (1, 1, 1, 12),
+    "rf_trees": 300,
+    "ensemble_alpha": 0.6,  # SARIMAX 비중 (나머지 RF)
+}
 
 
 # ── ML 유틸 ──────────────────────────────────────────────────────────────────
@@ -120,14 +130,16 @@ def _make_features(y: pd.Series, exog: Optional[pd.Series]) -> pd.DataFrame:
     return df
 
 
-def _fit_ml_model(df: pd.DataFrame):
+def _fit_ml_model(df: pd.DataFrame, seed: Optional[int] = None):
     feats = ["month", "quarter", "exog", "lag1", "lag2", "lag3"]
     train = df.dropna().copy()
     if len(train) < 6:
         return None, feats  # 데이터가 너무 적으면 ML 생략
     X = train[feats].values
     y = train["y"].values
-    model = RandomForestRegressor(n_estimators=300, random_state=None)  # seed 없음
+    model = RandomForestRegressor(
+        n_estimators=MODEL_CONFIG["rf_trees"], random_state=seed
+    )  # seed=None이면 호출마다 다름
     model.fit(X, y)
     return model, feats
 
@@ -161,91 +173,141 @@ def _predict_ml_recursive(
 
 
 # ── AUTO: 수성구 유동인구 -> 월 분할(가중치) -> 외생변수 결합 + 경량 ML 앙상블 ──
-async def forecast_finance_auto(
-    db: AsyncSession,
-    req: FinanceForecastAutoRequest,
-    *,
-    lat: float | None,
-    lon: float | None,
-) -> FinanceForecastAutoResponse:
+_FTQ_DEG = 0.1  # FTQ 최신 분기 탐색 상자 (±도)
+_PLACE_DEG = 0.002  # FTQ가 없을 때 Place 폴백 상자 (±도)
+_TILE_DEG = 0.02  # 배치 Place 폴백: 타일(±도) 단위로 묶어 조회
+
+
+@dataclass(slots=True)
+class FitInputs:
+    """적합 입력 (프로세스 풀로 보낼 수 있도록 순수 데이터만)"""
+
+    months: tuple[str, ...]
+    sales: tuple[float, ...]
+    horizon: int
+    base_quarter_pop: Optional[int] = None  # 분기 유동인구 (없으면 exog 없이)
+    seed: Optional[int] = None  # RF/노이즈 난수 seed (None이면 비결정적)
+    # 증분 예측 (forecast_state): 이전 적합 파라미터 + 재최적화 여부
+    start_params: Optional[tuple[float, ...]] = None
+    refit: bool = True  # False면 start_params 고정 (최적화 없이 상태만 갱신)
+    state_fp: str = ""  # 재사용한 저장 상태 지문 (forecast_state.state_fingerprint)
+
+    def _digest(self, *extra) -> str:
+        raw = repr(
+            (
+                self.months,
+                self.sales,
+                self.horizon,
+                self.base_quarter_pop,
+                sorted(MODEL_CONFIG.items()),
+                self.state_fp,
+                *extra,
+            )
+        )
+        return hashlib.blake2b(raw.encode(), digest_size=16).hexdigest()
+
+    def derived_seed(self) -> int:
+        """입력(시계열/exog/horizon/설정/재사용 상태) 해시에서 뽑은 32비트 seed"""
+        return int(self._digest()[:8], 16)
+
+    def model_fingerprint(self) -> str:
+        """파라미터 재사용 가능 조건: exog 기준값 + 적합 설정"""
+        raw = repr((self.base_quarter_pop, sorted(MODEL_CONFIG.items())))
+        return hashlib.blake2b(raw.encode(), digest_size=16).hexdigest()
+
+    def key(self) -> str:
+        """적합 캐시 키: 시계열 + exog 기준값 + horizon + 적합 설정 + seed
+        + 시작 파라미터 해시"""
+        return self._digest(self.seed, self.start_params, self.refit)
+
+
+@dataclass(slots=True)
+class FittedForecast:
+    """SARIMAX(+RF) 앙상블 결과 (가중치/노이즈/비용 적용 전)"""
+
+    start: str  # 예측 첫 달 'YYYY-MM'
+    mean: np.ndarray
+    lower: np.ndarray
+    upper: np.ndarray
+    model_name: str
+    exog_coef: Optional[float] = None
+    exog_last: Optional[float] = None  # 학습 구간 마지막 exog 값
+    ml: Optional[np.ndarray] = None  # RF 재귀 예측 (앙상블에 쓰였을 때)
+    params: tuple[float, ...] = ()  # SARIMAX 파라미터 (다음 증분 적합 시작점)
+    fit_mode: str = "cold"  # cold | warm | append
+    iterations: int = 0  # 최적화 반복 수 (append는 0)
+    sarimax_s: float = 0.0  # SARIMAX 적합 시간 (RF 제외)
+
+    def nbytes(self) -> int:
+        """캐시 메모리 예산용 대략 크기"""
+        arrays = (self.mean, self.lower, self.upper, self.ml)
+        return 256 + sum(a.nbytes for a in arrays if a is not None)
+
+
+def _exog_series(base_quarter_pop: int, index: pd.PeriodIndex) -> pd.Series:
+    """분기 유동인구 → 월 exog (분기 내 가중치 / 3)"""
+    w = _quarter_weights()
+    vals = [base_quarter_pop * w[i % 3] / 3.0 for i in range(len(index))]
+    return pd.Series(vals, index=index)
+
+
+def _fit_sarimax(
+    model: SARIMAX,
+    start_params: Optional[Sequence[float]] = None,
+    refit: bool = True,
+):
     """
-    최근 n개월 매출 + (선택) lat/lon 근처의 '분기 유동인구'를
-    월로 분할(0.98/1.00/1.02)하여 exog 구성.
-    SARIMAX + (옵션)RandomForest를 0.6:0.4로 앙상블.
-    출력단에 월별 랜덤 노이즈(0.90~1.10) 적용.
+    (결과, 모드, 최적화 반복 수).
+    - start_params + refit=False → 파라미터 고정 smooth ("append", 반복 0)
+    - start_params → 그 값에서 최적화 시작 ("warm"), 없으면 기본 시작값 ("cold")
     """
-    a = CostAssumptions(**_assumption_dict(req.assumptions))
-    y = _to_month_index(req.series).asfreq("M")
-    h = int(req.horizon_months)
+    if start_params is not None and len(start_params) != model.k_params:
+        start_params = None  # 모양이 다르면(exog 유무 등) 재사용 불가
+    if start_params is None:
+        fit, mode = model.fit(disp=False), "cold"
+    elif not refit:
+        return model.smooth(np.asarray(start_params, dtype=float)), "append", 0
+    else:
+        fit = model.fit(start_params=np.asarray(start_params, dtype=float), disp=False)
+        mode = "warm"
+    retvals = getattr(fit, "mle_retvals", None) or {}
+    return fit, mode, int(retvals.get("iterations", 0))
+
+
+def fit_forecast(inp: FitInputs) -> FittedForecast:
+    """
+    CPU 구간: SARIMAX 적합/예측 + (옵션)RandomForest 0.6:0.4 앙상블.
+    DB/이벤트 루프와 무관한 순수 함수 → forecast_pool 워커 프로세스에서 실행.
+    """
+    y = pd.Series(
+        inp.sales, index=pd.PeriodIndex(inp.months, freq="M"), dtype=float
+    ).asfreq("M")
+    h = int(inp.horizon)
+    future_idx = pd.period_range(y.index[-1] + 1, periods=h, freq="M")
 
-    # ── 1) 외생변수(exog) 준비
+    # 1) 외생변수(exog)
     exog_hist: Optional[pd.Series] = None
     future_exog: Optional[pd.Series] = None
-    base_quarter_pop: Optional[int] = None
-    debug_reason: Optional[str] = None
-
-    if lat is not None and lon is not None:
-        # 1-1) 먼저 FTQ에서 최신 분기값 시도
-        base_quarter_pop = await get_ftq_recent_near(db, lat, lon, deg=0.1)
-
-        if base_quarter_pop is None:
-            # 1-2) FTQ 없음 → Place.foot_traffic 로 폴백
-            d = 0.002
-            places = await get_places_bbox(db, lat - d, lon - d, lat + d, lon + d)
-            foot_vals = [
-                int(p.foot_traffic) for p in places if (p.foot_traffic or 0) > 0
-            ]
-
-            if foot_vals:
-                base_quarter_pop = max(foot_vals)
-                debug_reason = "FTQ 없음 → Place.foot_traffic로 대체"
-            else:
-                # 1-3) 그래도 없으면, 카페 수 기반 추정
-                cafe_count = sum(
-                    1 for p in places if (p.category or "").startswith("카페")
-                )
-                if cafe_count > 0:
-                    base_quarter_pop = 8000 + 2000 * cafe_count
-                    debug_reason = f"FTQ/Place 모두 없음 → 카페 {cafe_count}개로 추정"
-                else:
-                    debug_reason = "근방 FTQ/Place 데이터 모두 없음"
-
-        # 1-4) exog 시계열 구성
-        if base_quarter_pop and base_quarter_pop > 0:
-            w = _quarter_weights()
-            hist_vals = [
-                base_quarter_pop * w[i % 3] / 3.0 for i, _ in enumerate(y.index)
-            ]
-            exog_hist = pd.Series(hist_vals, index=y.index)
-
-            future_idx = pd.period_range(y.index[-1] + 1, periods=h, freq="M")
-            fut_vals = [base_quarter_pop * w[i % 3] / 3.0 for i in range(h)]
-            future_exog = pd.Series(fut_vals, index=future_idx)
-
-    print(f"[auto] lat={lat}, lon={lon}")
-    print(f"[auto] FTQ nearest(pop) -> {base_quarter_pop} (None=not found)")
-    if "places" in locals():
-        print(
-            f"[auto] places within bbox: {len(places)}",
-            f"foot>0: {sum(1 for p in places if (p.foot_traffic or 0) > 0)}",
-            f"cafes: {sum(1 for p in places if (p.category or '').startswith('카페'))}",
-        )
-    print(f"[auto] exog_hist set? -> {exog_hist is not None}")
+    if inp.base_quarter_pop and inp.base_quarter_pop > 0:
+        exog_hist = _exog_series(inp.base_quarter_pop, y.index)
+        future_exog = _exog_series(inp.base_quarter_pop, future_idx)
 
     # 2) SARIMAX 적합/예측
+    model = SARIMAX(
+        y,
+        exog=exog_hist,
+        order=MODEL_CONFIG["order"],
+        seasonal_order=MODEL_CONFIG["seasonal_order"],
+        enforce_stationarity=False,
+        enforce_invertibility=False,
+    )
+    t0 = time.perf_counter()
+    fit, fit_mode, iterations = _fit_sarimax(model, inp.start_params, inp.refit)
+    sarimax_s = time.perf_counter() - t0
+    fcast = fit.get_forecast(steps=h, exog=future_exog)
+    exog_coef = None
     if exog_hist is not None:
-        model = SARIMAX(
-            y,
-            exog=exog_hist,
-            order=(1, 1, 1),
-            seasonal_order=(1, 1, 1, 12),
-            enforce_stationarity=False,
-            enforce_invertibility=False,
-        )
-        fit = model.fit(disp=False)
-        fcast = fit.get_forecast(steps=h, exog=future_exog)
         model_name = "SARIMAX + exog(foot_traffic)"
-        exog_coef = None
         try:
             for k, v in fit.params.items():
                 if isinstance(k, str) and ("exog" in k or k.startswith("x")):
@@ -254,17 +316,7 @@ async def forecast_finance_auto(
         except Exception:
             exog_coef = None
     else:
-        model = SARIMAX(
-            y,
-            order=(1, 1, 1),
-            seasonal_order=(1, 1, 1, 12),
-            enforce_stationarity=False,
-            enforce_invertibility=False,
-        )
-        fit = model.fit(disp=False)
-        fcast = fit.get_forecast(steps=h)
         model_name = "SARIMAX (no exog)"
-        exog_coef = None
 
     mean_sarimax = fcast.predicted_mean.values
     ci = fcast.conf_int(alpha=0.05)
@@ -275,52 +327,222 @@ async def forecast_finance_auto(
     mean_ens = mean_sarimax.copy()
     lower_ens = lower_sarimax.copy()
     upper_ens = upper_sarimax.copy()
+    mean_ml: Optional[np.ndarray] = None
 
     try:
         df_feats = _make_features(y, exog_hist)
-        ml_model, ml_feats = _fit_ml_model(df_feats)
+        ml_model, ml_feats = _fit_ml_model(df_feats, inp.seed)
         if ml_model is not None:
             mean_ml = _predict_ml_recursive(
                 ml_model, ml_feats, y_hist=y, future_exog=future_exog, horizon=h
             )
-            alpha = 0.6  # SARIMAX 60%, ML 40%
+            alpha = MODEL_CONFIG["ensemble_alpha"]  # SARIMAX 60%, ML 40%
             mean_ens = alpha * mean_sarimax + (1 - alpha) * mean_ml
             # CI는 SARIMAX를 기준으로 유지
             lower_ens = lower_sarimax * alpha
             upper_ens = upper_sarimax * alpha
-            model_name += " + RF(0.4) ensemble"
+            model_name += f" + RF({1 - alpha:.1f}) ensemble"
     except Exception:
-        pass
+        mean_ml = None
+
+    return FittedForecast(
+        start=str(future_idx[0]),
+        mean=np.asarray(mean_ens, dtype=float),
+        lower=np.asarray(lower_ens, dtype=float),
+        upper=np.asarray(upper_ens, dtype=float),
+        model_name=model_name,
+        exog_coef=exog_coef,
+        exog_last=float(exog_hist.iloc[-1]) if exog_hist is not None else None,
+        ml=mean_ml,
+        params=tuple(float(v) for v in np.asarray(fit.params)),
+        fit_mode=fit_mode,
+        iterations=iterations,
+        sarimax_s=sarimax_s,
+    )
+
+
+# 적합 결과 캐시: capex/assumptions만 바꾼 재요청은 재적합 없이 후처리만
+# (같은 키 동시 요청은 적합 한 번을 함께 기다림)
+fit_cache = AsyncTTLCache(
+    settings.FORECAST_CACHE_SIZE,
+    settings.FORECAST_CACHE_TTL_S,
+    max_bytes=int(settings.FORECAST_CACHE_MAX_MB * 1024 * 1024),
+    sizeof=FittedForecast.nbytes,
+)
+
+
+async def _exog_base(
+    db: AsyncSession, lat: float | None, lon: float | None
+) -> tuple[Optional[int], Optional[str]]:
+    """lat/lon 근처 기준 분기 유동인구 + (없을 때) 사유"""
+    if lat is None or lon is None:
+        return None, None
+
+    # 1-1) 먼저 FTQ에서 최신 분기값 시도
+    base_quarter_pop = await ftq_snapshot.recent_near(db, lat, lon, deg=_FTQ_DEG)
+    debug_reason: Optional[str] = None
+    logger.debug(f"[auto] lat={lat}, lon={lon} FTQ nearest(pop) -> {base_quarter_pop}")
+    if base_quarter_pop is not None:
+        return base_quarter_pop, None
+
+    # 1-2) FTQ 없음 → Place.foot_traffic 로 폴백
+    d = _PLACE_DEG
+    cols = await PlaceColumns.from_bbox(db, lat - d, lon - d, lat + d, lon + d)
+    foot_vals = cols.foot_traffic[cols.foot_traffic > 0]
+    cafe_count = int(_cafe_mask(cols).sum())
+    logger.debug(
+        f"[auto] places within bbox: {len(cols)} foot>0: {len(foot_vals)} "
+        f"cafes: {cafe_count}"
+    )
+    return _exog_from_places(foot_vals, cafe_count)
+
+
+def _cafe_mask(cols: PlaceColumns) -> np.ndarray:
+    # 카테고리는 어휘에서 코드 집합으로 바꾼 뒤 정수 비교 (분석과 같은 규칙)
+    cafes = cols.vocab.codes_where(is_cafe)
+    return cols.vocab.mask(cols.category, cafes)
+
+
+def _exog_from_places(
+    foot_vals: np.ndarray, cafe_count: int
+) -> tuple[Optional[int], str]:
+    """FTQ가 없을 때: 주변 장소 유동인구 최댓값 → 카페 수 추정 순"""
+    if len(foot_vals):
+        return int(foot_vals.max()), "FTQ 없음 → Place.foot_traffic로 대체"
+    if cafe_count > 0:
+        # 1-3) 그래도 없으면, 카페 수 기반 추정
+        return (
+            8000 + 2000 * cafe_count,
+            f"FTQ/Place 모두 없음 → 카페 {cafe_count}개로 추정",
+        )
+    return None, "근방 FTQ/Place 데이터 모두 없음"
+
+
+async def _exog_bases(
+    db: AsyncSession, sites: Sequence[tuple[float | None, float | None]]
+) -> list[tuple[Optional[int], Optional[str]]]:
+    """
+    여러 지점의 _exog_base를 한 번에: FTQ 스냅샷 일괄 조회 + FTQ가 없는 지점은
+    _TILE_DEG 타일별로 묶어 타일마다 Place 상자 한 번 조회 후 지점별
+    (위도 정렬 + 이진 탐색) 상자 집계 — 멀리 떨어진 지점이 섞여도 조회 범위는
+    타일 + 여유(±_PLACE_DEG)로 제한
+    """
+    out: list[tuple[Optional[int], Optional[str]]] = [(None, None)] * len(sites)
+    located = [
+        i for i, (la, lo) in enumerate(sites) if la is not None and lo is not None
+    ]
+    if not located:
+        return out
+    pops = await ftq_snapshot.recent_near_many(
+        db, [sites[i][0] for i in located], [sites[i][1] for i in located], _FTQ_DEG
+    )
+    missing = []
+    for i, pop in zip(located, pops):
+        if pop is None:
+            missing.append(i)
+        else:
+            out[i] = (pop, None)
+    if not missing:
+        return out
+
+    d = _PLACE_DEG
+    la = np.array([sites[i][0] for i in missing], dtype=float)
+    lo = np.array([sites[i][1] for i in missing], dtype=float)
+    tiles: dict[tuple[int, int], list[int]] = defaultdict(list)
+    keys = zip(np.floor(la / _TILE_DEG).tolist(), np.floor(lo / _TILE_DEG).tolist())
+    for k, key in enumerate(keys):
+        tiles[key].append(k)
+
+    for idx in tiles.values():
+        tla, tlo = la[idx], lo[idx]
+        cols = await PlaceColumns.from_bbox(
+            db, tla.min() - d, tlo.min() - d, tla.max() + d, tlo.max() + d
+        )
+        order = np.argsort(cols.lat, kind="stable")
+        lats, lons = cols.lat[order], cols.lon[order]
+        foot, cafe = cols.foot_traffic[order], _cafe_mask(cols)[order]
+        starts = np.searchsorted(lats, tla - d, side="left")
+        ends = np.searchsorted(lats, tla + d, side="right")
+        for k, lon, a, b in zip(idx, tlo, starts, ends):
+            m = (lons[a:b] >= lon - d) & (lons[a:b] <= lon + d)
+            f = foot[a:b][m]
+            out[missing[k]] = _exog_from_places(f[f > 0], int(cafe[a:b][m].sum()))
+    return out
+
+
+@dataclass(slots=True)
+class ForecastPlan:
+    """요청 → 적합 입력/비용 가정/ETag (적합 전, 조건부 요청 판단용)"""
+
+    inputs: FitInputs
+    a: CostAssumptions
+    capex: int
+    debug_reason: Optional[str] = None
+    etag: Optional[str] = None  # 결정적 모드에서만
+    store_id: Optional[str] = None  # 증분 예측 대상 매장
+    state: Optional[SeriesState] = None  # 저장돼 있던 적합 상태
+    mode: str = "cold"  # forecast_state.decide 결과 ("stale"이면 상태 저장 안 함)
+
+    @property
+    def base_quarter_pop(self) -> Optional[int]:
+        return self.inputs.base_quarter_pop
+
+
+def forecast_etag(
+    inputs: FitInputs, a: CostAssumptions, capex: int, debug_reason: Optional[str]
+) -> str:
+    """
+    결정적 응답의 약한 ETag: 적합 키(시계열/exog 기준값/horizon/설정/seed
+    + 재사용한 저장 상태 지문) + 비용 가정 + capex.
+    exog 기준값이 DB에서 오므로 데이터가 바뀌면 달라지고, store_id 요청은
+    저장 상태가 갱신되면(새 개월 반영/재최적화) 같은 입력이라도 달라짐
+    """
+    raw = repr((inputs.key(), sorted(asdict(a).items()), capex, debug_reason))
+    return f'W/"fc-{hashlib.blake2b(raw.encode(), digest_size=12).hexdigest()}"'
 
-    # 4) 월별 가중치 + 랜덤 노이즈
-    mean_w, months = _apply_monthly_weights(y.index[-1] + 1, h, mean_ens)
-    noise = _random_monthly_noise(h)
-    mean_noisy = mean_w * noise
 
-    lower_w, _ = _apply_monthly_weights(y.index[-1] + 1, h, lower_ens)
-    upper_w, _ = _apply_monthly_weights(y.index[-1] + 1, h, upper_ens)
+def _finalize(
+    fitted: FittedForecast,
+    a: CostAssumptions,
+    capex: int,
+    base_quarter_pop: Optional[int],
+    debug_reason: Optional[str],
+    seed: Optional[int] = None,
+) -> FinanceForecastAutoResponse:
+    """적합 결과 → 월 가중치/노이즈 + 비용/회수 기간/설명 (가벼운 후처리)"""
+    h = len(fitted.mean)
+    months, weights = _month_weights(fitted.start, h)
+
+    # 4) 월별 가중치 + 랜덤 노이즈 (캐시된 배열은 그대로 두고 새 배열로)
+    noise = _random_monthly_noise(h, seed)
+    mean_noisy = fitted.mean * weights * noise
+
+    lower_w = fitted.lower * weights
+    upper_w = fitted.upper * weights
 
     items = _make_items_with_conf(months, mean_noisy, lower_w, upper_w, a)
 
     # 5) Payback
     profits = np.array([it.profit for it in items], dtype=int)
     payback = (
-        int(np.argmax(np.cumsum(profits) >= req.capex) + 1)
-        if profits.sum() > 0
-        else 999
+        int(np.argmax(np.cumsum(profits) >= capex) + 1) if profits.sum() > 0 else 999
     )
 
     # 6) 설명
     explain: list[str] = [
         f"원가율 {a.cogs_rate:.2f}, 인건비 base {a.labor_base:,}",
         "유동인구: 분기→월 분배 시 (0.98/1.00/1.02) 가중치 적용",
-        "출력 예측치에 월별 랜덤 노이즈(0.90~1.10) 적용 — 호출마다 약간 다름",
+        (
+            f"출력 예측치에 월별 랜덤 노이즈(0.90~1.10) 적용 — seed {seed} 고정"
+            if seed is not None
+            else "출력 예측치에 월별 랜덤 노이즈(0.90~1.10) 적용 — 호출마다 약간 다름"
+        ),
     ]
     if base_quarter_pop:
         explain.append(f"주변 기준 분기 유동인구(최댓값) ≈ {base_quarter_pop:,}")
-    if exog_hist is not None and exog_coef is not None and len(exog_hist):
-        e0 = float(exog_hist.iloc[-1])
-        delta_10pct = exog_coef * (0.10 * e0)
+    if fitted.exog_last is not None and fitted.exog_coef is not None:
+        exog_coef = fitted.exog_coef
+        delta_10pct = exog_coef * (0.10 * fitted.exog_last)
         explain.append(
             f"외생변수 계수 β≈{exog_coef:.4f} → exog 1단위↑ 시 매출 {exog_coef:.1f}↑ 추정"
         )
@@ -336,7 +558,230 @@ async def forecast_finance_auto(
         forecast=items,
         payback_month=payback,
         payback_prob_12m=min(0.998, float((profits[:12] > 0).mean())),
-        model=f"{model_name} + Monthly weights + Random noise",
+        model=f"{fitted.model_name} + Monthly weights + Random noise",
         top_features=None,
         explain=explain,
     )
+
+
+def _make_plan(
+    req: FinanceForecastAutoRequest,
+    base_quarter_pop: Optional[int],
+    debug_reason: Optional[str],
+    state: Optional[SeriesState],
+) -> ForecastPlan:
+    """
+    exog 기준값/저장 상태가 정해진 뒤: 적합 입력 + 증분 모드 + seed + ETag.
+    저장 상태를 재사용하면(append/warm) 그 지문이 seed/ETag에 들어감
+    → 같은 입력 + 같은 상태면 같은 응답, 상태가 갱신되면 새 ETag.
+    """
+    a = CostAssumptions(**_assumption_dict(req.assumptions))
+    inputs = FitInputs(
+        months=tuple(p.month for p in req.series),
+        sales=tuple(float(p.sales) for p in req.series),
+        horizon=int(req.horizon_months),
+        base_quarter_pop=base_quarter_pop,
+    )
+
+    store_id = req.store_id if settings.FORECAST_INCREMENTAL else None
+    mode = "cold"
+    if store_id:
+        mode = forecast_state.decide(
+            state, inputs.months, inputs.sales, inputs.model_fingerprint()
+        )
+        if mode in ("append", "warm"):
+            inputs.start_params = tuple(state.params)
+            inputs.refit = mode == "warm"
+            inputs.state_fp = forecast_state.state_fingerprint(state)
+
+    if req.seed is not None:
+        inputs.seed = int(req.seed)
+    elif settings.FORECAST_DETERMINISTIC:
+        inputs.seed = inputs.derived_seed()
+
+    etag = None
+    if inputs.seed is not None:
+        etag = forecast_etag(inputs, a, req.capex, debug_reason)
+    return ForecastPlan(inputs, a, req.capex, debug_reason, etag, store_id, state, mode)
+
+
+def _load_states(store_ids: Sequence[Optional[str]]) -> list[Optional[SeriesState]]:
+    if not settings.FORECAST_INCREMENTAL:
+        return [None] * len(store_ids)
+    return [forecast_state.load(sid) if sid else None for sid in store_ids]
+
+
+async def plan_forecast(
+    db: AsyncSession,
+    req: FinanceForecastAutoRequest,
+    *,
+    lat: float | None,
+    lon: float | None,
+) -> ForecastPlan:
+    """
+    적합 전 단계: 비용 가정 + exog 기준값 조회 + seed/ETag 결정.
+    seed: 요청 값 우선, 없으면 FORECAST_DETERMINISTIC일 때 입력 해시에서 유도.
+    """
+    base_quarter_pop, debug_reason = await _exog_base(db, lat, lon)
+    (state,) = await asyncio.to_thread(_load_states, [req.store_id])
+    logger.debug(
+        f"[auto] exog set? -> {bool(base_quarter_pop and base_quarter_pop > 0)}"
+    )
+    return _make_plan(req, base_quarter_pop, debug_reason, state)
+
+
+def _incremental_note(fitted: FittedForecast, prev: Optional[SeriesState]) -> str:
+    note = f"증분 적합({fitted.fit_mode}): 최적화 반복 {fitted.iterations}회"
+    cold = prev.cold_iterations if prev is not None else None
+    if fitted.fit_mode != "cold" and cold is not None:
+        note += f" — 직전 cold 적합 {cold}회 대비 {cold - fitted.iterations}회 절약"
+    return note
+
+
+async def _save_state(plan: ForecastPlan, fitted: FittedForecast) -> bool:
+    inputs = plan.inputs
+    state = forecast_state.advance(
+        plan.state,
+        plan.store_id,
+        inputs.months,
+        inputs.sales,
+        inputs.model_fingerprint(),
+        fitted.params,
+        fitted.fit_mode,
+        fitted.iterations,
+    )
+    return await asyncio.to_thread(forecast_state.save, state)
+
+
+async def run_forecast(plan: ForecastPlan) -> FinanceForecastAutoResponse:
+    """적합(fit_cache → forecast_pool) + 후처리"""
+    inputs = plan.inputs
+    fitted = await fit_cache.get_or_load(
+        inputs.key(), lambda: forecast_pool.run(fit_forecast, inputs)
+    )
+    return await _complete(plan, fitted)
+
+
+async def _complete(
+    plan: ForecastPlan, fitted: FittedForecast
+) -> FinanceForecastAutoResponse:
+    """후처리 + (store_id) 적합 상태 저장"""
+    out = _finalize(
+        fitted,
+        plan.a,
+        plan.capex,
+        plan.base_quarter_pop,
+        plan.debug_reason,
+        plan.inputs.seed,
+    )
+    if plan.store_id:
+        if plan.mode != "stale" and await _save_state(plan, fitted):
+            out.explain.append(_incremental_note(fitted, plan.state))
+        else:
+            out.explain.append(
+                "저장된 적합 상태가 더 최신 → 이번 결과는 상태에 반영 안 함"
+            )
+    return out
+
+
+async def forecast_finance_auto(
+    db: AsyncSession,
+    req: FinanceForecastAutoRequest,
+    *,
+    lat: float | None,
+    lon: float | None,
+) -> FinanceForecastAutoResponse:
+    """
+    최근 n개월 매출 + (선택) lat/lon 근처의 '분기 유동인구'를
+    월로 분할(0.98/1.00/1.02)하여 exog 구성.
+    SARIMAX + (옵션)RandomForest를 0.6:0.4로 앙상블 (forecast_pool 워커에서 적합,
+    같은 시계열/exog/horizon이면 fit_cache 재사용, store_id가 있으면
+    이전 적합 파라미터로 증분 적합 — forecast_state).
+    출력단에 월별 랜덤 노이즈(0.90~1.10) 적용 (결정적 모드면 seed 고정).
+    풀이 포화면 ForecastBusy (라우터에서 429).
+    """
+    plan = await plan_forecast(db, req, lat=lat, lon=lon)
+    return await run_forecast(plan)
+
+
+# ── 배치: 여러 매장 시계열을 한 요청으로 ────────────────────────────────────
+# 배치 적합 동시 작업 상한 (모든 배치 요청 공유, 풀 워커 수와 같은 규칙)
+# → 배치가 여러 개 동시에 와도 대기열 나머지 자리는 단건 요청 몫
+_batch_slots = asyncio.Semaphore(
+    max(1, settings.FORECAST_WORKERS or os.cpu_count() or 1)
+)
+
+
+def fit_forecast_many(batch: list[FitInputs]) -> list[FittedForecast | str]:
+    """워커 한 작업에 여러 매장 적합. 매장별 예외는 메시지로 격리"""
+    out: list[FittedForecast | str] = []
+    for inp in batch:
+        try:
+            out.append(fit_forecast(inp))
+        except Exception as e:
+            out.append(f"{type(e).__name__}: {e}")
+    return out
+
+
+async def _fit_chunk(
+    chunk: list[tuple[int, ForecastPlan]],
+) -> tuple[list[tuple[int, ForecastPlan]], list[FittedForecast | str]]:
+    batch = [plan.inputs for _, plan in chunk]
+    async with _batch_slots:
+        while True:
+            try:
+                return chunk, await forecast_pool.run(fit_forecast_many, batch)
+            except ForecastBusy as e:
+                # 단건 요청에 밀렸으면 기다렸다가 재제출 (배치는 429 대신 대기)
+                await asyncio.sleep(min(float(e.retry_after), 1.0))
+            except Exception as e:  # 풀 자체 오류(워커 종료 등) → 이 청크만 error
+                return chunk, [f"{type(e).__name__}: {e}"] * len(chunk)
+
+
+async def forecast_finance_batch(
+    db: AsyncSession, reqs: Sequence[FinanceForecastAutoRequest]
+) -> AsyncIterator[dict]:
+    """
+    여러 매장 예측을 끝나는 순서대로 {"index", "store_id", ...응답 | "error"}.
+    - exog 기준값: FTQ 스냅샷 일괄 + Place 타일별 상자 조회 (_exog_bases)
+    - 적합: FORECAST_BATCH_CHUNK개씩 묶어 forecast_pool에, 동시 작업은 모든 배치
+      요청 합쳐 워커 수까지 (_batch_slots, 나머지 대기열 자리는 단건 요청 몫)
+    - 한 매장의 잘못된 입력/적합 실패는 그 줄만 error
+    단건과 같은 입력이면 같은 결과 (seed/증분 상태 규칙 동일, fit_cache는 안 거침).
+    """
+    ids = [r.store_id for r in reqs]
+    try:
+        bases = await _exog_bases(db, [(r.lat, r.lon) for r in reqs])
+        states = await asyncio.to_thread(_load_states, ids)
+    except Exception as e:
+        for i, sid in enumerate(ids):
+            yield {"index": i, "store_id": sid, "error": str(e)}
+        return
+
+    plans: list[tuple[int, ForecastPlan]] = []
+    for i, (req, (base, reason), state) in enumerate(zip(reqs, bases, states)):
+        try:
+            plans.append((i, _make_plan(req, base, reason, state)))
+        except Exception as e:
+            yield {"index": i, "store_id": ids[i], "error": str(e)}
+
+    size = max(1, settings.FORECAST_BATCH_CHUNK)
+    tasks = [
+        asyncio.ensure_future(_fit_chunk(plans[k : k + size]))
+        for k in range(0, len(plans), size)
+    ]
+    try:
+        for done in asyncio.as_completed(tasks):
+            chunk, results = await done
+            for (i, plan), fitted in zip(chunk, results):
+                line = {"index": i, "store_id": ids[i]}
+                try:
+                    if isinstance(fitted, str):
+                        raise RuntimeError(fitted)
+                    line.update((await _complete(plan, fitted)).model_dump())
+                except Exception as e:
+                    line["error"] = str(e)
+                yield line
+    finally:
+        for t in tasks:
+            t.cancel()
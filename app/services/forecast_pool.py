@@ -0,0 +1,172 @@
+# app/services/forecast_pool.py
+# -----------------------------------------------------------------------------
+# 예측 적합(SARIMAX + RandomForest) 전용 프로세스 풀
+# - 적합은 수백 ms~수 초 CPU를 쓰므로 이벤트 루프 밖(별도 프로세스)에서 실행,
+#   요청 핸들러는 결과만 await → /health, /analysis 가 예측 뒤에 막히지 않음
+# - 워커 수 = FORECAST_WORKERS (0이면 CPU 코어 수), spawn 방식
+#   (부모의 스레드/DB 커넥션을 fork로 복제하지 않음)
+# - 워커 초기화 때 statsmodels/sklearn 미리 import + BLAS 스레드 1개로 고정
+#   (워커 수 × BLAS 스레드 과다 구독 방지), 기동 시 워커를 모두 띄워 둠
+# - 제출 상한 = 워커 수 + FORECAST_QUEUE_MAX. 넘으면 ForecastBusy
+#   (라우터에서 429 + Retry-After: 최근 평균 적합 시간 × 대기 순번 / 워커 수)
+# - 진행 중 건수는 실제 작업 종료 시점에 줄임 (클라이언트가 끊어도 작업은 계속 돎)
+# - FORECAST_POOL_ENABLED=False 면 같은 상한의 스레드 풀로 대체 (개발/디버깅용)
+# -----------------------------------------------------------------------------
+from __future__ import annotations
+
+import asyncio
+import math
+import multiprocessing as mp
+import os
+import time
+from concurrent.futures import Executor, Future, ProcessPoolExecutor
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Callable, TypeVar
+
+from loguru import logger
+
+from app.core.config import settings
+
+T = TypeVar("T")
+
+_BLAS_THREAD_VARS = (
+    "OMP_NUM_THREADS",
+    "OPENBLAS_NUM_THREADS",
+    "MKL_NUM_THREADS",
+)
+
+
+class ForecastBusy(Exception):
+    """예측 풀 포화 (retry_after 초 뒤 재시도 권장)"""
+
+    def __init__(self, retry_after: int):
+        super().__init__(f"예측 작업이 밀려 있습니다 ({retry_after}s 후 재시도)")
+        self.retry_after = retry_after
+
+
+def _warm() -> None:
+    """워커 초기화: 첫 요청이 import 비용을 내지 않도록"""
+    for var in _BLAS_THREAD_VARS:
+        os.environ.setdefault(var, "1")
+    import sklearn.ensemble  # noqa: F401
+    import statsmodels.tsa.statespace.sarimax  # noqa: F401
+
+    import app.services.forecast  # noqa: F401
+
+
+def _ping() -> int:
+    return os.getpid()
+
+
+class ForecastPool:
+    def __init__(self):
+        self._executor: Executor | None = None
+        self.workers = 0
+        self.inflight = 0
+        self.avg_s = 1.0  # 최근 처리 시간(제출→완료) 지수 이동 평균
+        self.completed = 0
+        self.failed = 0
+        self.rejected = 0
+
+    @property
+    def capacity(self) -> int:
+        return self.workers + max(0, settings.FORECAST_QUEUE_MAX)
+
+    def _create(self) -> None:
+        self.workers = settings.FORECAST_WORKERS or os.cpu_count() or 1
+        if settings.FORECAST_POOL_ENABLED:
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=mp.get_context("spawn"),
+                initializer=_warm,
+            )
+        else:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.workers, thread_name_prefix="forecast"
+            )
+
+    async def start(self) -> None:
+        """풀 생성 + 워커 전부 기동/워밍 (lifespan)"""
+        if self._executor is None:
+            self._create()
+        t0 = time.perf_counter()
+        if settings.FORECAST_POOL_ENABLED:
+            loop = asyncio.get_running_loop()
+            pids = await asyncio.gather(
+                *(
+                    loop.run_in_executor(self._executor, _ping)
+                    for _ in range(self.workers)
+                )
+            )
+            logger.info(
+                f"[forecast_pool] {len(set(pids))}/{self.workers} workers warm "
+                f"({time.perf_counter() - t0:.1f}s)"
+            )
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    def retry_after(self) -> int:
+        ahead = max(0, self.inflight - self.workers) + 1
+        return max(1, math.ceil(self.avg_s * ahead / max(1, self.workers)))
+
+    async def run(self, fn: Callable[..., T], *args) -> T:
+        """fn(*args)를 풀에서 실행 (fn/인자/결과는 pickle 가능해야 함)"""
+        if self._executor is None:  # lifespan 밖(스크립트) → 워밍 없이 생성
+            self._create()
+        if self.inflight >= self.capacity:
+            self.rejected += 1
+            raise ForecastBusy(self.retry_after())
+
+        loop = asyncio.get_running_loop()
+        executor = self._executor
+        try:
+            fut = executor.submit(fn, *args)
+        except BrokenProcessPool:
+            self._restart(executor)
+            executor = self._executor
+            fut = executor.submit(fn, *args)
+        self.inflight += 1
+        t0 = time.perf_counter()
+        fut.add_done_callback(
+            lambda f: loop.call_soon_threadsafe(self._done, f, time.perf_counter() - t0)
+        )
+        try:
+            return await asyncio.wrap_future(fut)
+        except BrokenProcessPool:
+            self._restart(executor)
+            raise
+
+    def _done(self, fut: Future, elapsed_s: float) -> None:
+        self.inflight -= 1
+        if fut.cancelled() or fut.exception() is not None:
+            self.failed += 1
+            return
+        self.completed += 1
+        self.avg_s = 0.8 * self.avg_s + 0.2 * elapsed_s
+
+    def _restart(self, broken: Executor) -> None:
+        """워커가 죽어(OOM 등) 풀이 깨졌으면 새로 만듦 (이미 교체됐으면 생략)"""
+        if self._executor is not broken:
+            return
+        logger.warning("[forecast_pool] broken pool → restart")
+        broken.shutdown(wait=False, cancel_futures=True)
+        self._create()
+
+    def stats(self) -> dict:
+        return {
+            "mode": "process" if settings.FORECAST_POOL_ENABLED else "thread",
+            "workers": self.workers,
+            "inflight": self.inflight,
+            "capacity": self.capacity,
+            "avg_fit_s": round(self.avg_s, 3),
+            "completed": self.completed,
+            "failed": self.failed,
+            "rejected": self.rejected,
+        }
+
+
+forecast_pool = ForecastPool()
@@ -0,0 +1,129 @@
+# app/services/forecast_state.py
+# -----------------------------------------------------------------------------
+# 매장별 SARIMAX 적합 상태 (증분 예측)
+# - models/forecast_state/<store_id 해시>.json: 마지막 적합 파라미터 + 지문
+#   · series_fp: 적합에 쓴 (월, 매출) 전체 해시 → 새 요청 앞부분과 비교
+#   · model_fp : exog 기준값 + 적합 설정 해시 (바뀌면 파라미터 재사용 불가)
+# - decide(): 새 요청이 저장된 시계열을 그대로 연장(또는 동일)하면
+#   · 최적화 없이 누적된 개월 ≤ FORECAST_REFIT_EVERY → "append"
+#     (저장 파라미터 고정, 칼만 필터 상태만 새 관측까지 갱신 = 재적합 없음)
+#   · 넘으면 "warm" (저장 파라미터에서 최적화 시작)
+#   · 저장된 시계열보다 짧은(과거) 요청 → "stale" (cold로 적합하되 저장하지 않음,
+#     더 최신 상태를 덮어쓰지 않도록)
+#   그 외(첫 요청/과거 값 수정/exog·설정 변경) → "cold"
+# - state_fingerprint(): 결과에 영향을 주는 상태 부분의 해시 → seed/ETag에 포함
+#   (store_id 요청은 같은 입력이라도 저장 상태가 바뀌면 ETag/결과가 바뀜)
+# - 쓰기는 임시 파일 → os.replace (여러 워커가 같은 매장을 써도 파일이 깨지지 않음)
+# -----------------------------------------------------------------------------
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import time
+from dataclasses import asdict, dataclass, field
+from typing import Optional, Sequence
+
+from app.core import model_store
+from app.core.config import settings
+
+_DIR = "forecast_state"
+
+
+@dataclass(slots=True)
+class SeriesState:
+    store_id: str
+    n_obs: int
+    series_fp: str
+    model_fp: str
+    params: list[float]
+    age: int = 0  # 마지막 최적화 이후 append로만 반영한 개월 수
+    cold_iterations: Optional[int] = None  # 마지막 cold 적합 반복 수 (절약분 기준)
+    updated_at: float = field(default_factory=time.time)
+
+
+def series_fingerprint(months: Sequence[str], sales: Sequence[float]) -> str:
+    raw = repr((tuple(months), tuple(float(v) for v in sales)))
+    return hashlib.blake2b(raw.encode(), digest_size=16).hexdigest()
+
+
+def state_fingerprint(state: Optional[SeriesState]) -> str:
+    """적합 결과를 좌우하는 상태(시계열/설정/파라미터/누적 개월) 해시, 갱신 시각 제외"""
+    if state is None:
+        return ""
+    raw = repr((state.n_obs, state.series_fp, state.model_fp, state.params, state.age))
+    return hashlib.blake2b(raw.encode(), digest_size=16).hexdigest()
+
+
+def _path(store_id: str):
+    h = hashlib.blake2b(store_id.encode(), digest_size=12).hexdigest()
+    return model_store.path(_DIR, f"{h}.json")
+
+
+def load(store_id: str) -> Optional[SeriesState]:
+    p = _path(store_id)
+    try:
+        state = SeriesState(**json.loads(p.read_text(encoding="utf-8")))
+    except (FileNotFoundError, ValueError, TypeError):
+        return None
+    return state if state.store_id == store_id else None
+
+
+def save(state: SeriesState) -> bool:
+    """저장 (그 사이 다른 요청이 더 긴 시계열을 저장했으면 건너뜀 → False)"""
+    current = load(state.store_id)
+    if current is not None and current.n_obs > state.n_obs:
+        return False
+    p = _path(state.store_id)
+    tmp = p.with_suffix(f".{os.getpid()}.tmp")
+    tmp.write_text(json.dumps(asdict(state)), encoding="utf-8")
+    os.replace(tmp, p)
+    return True
+
+
+def decide(
+    state: Optional[SeriesState],
+    months: Sequence[str],
+    sales: Sequence[float],
+    model_fp: str,
+) -> str:
+    """'append' | 'warm' | 'cold' | 'stale'"""
+    if state is None or state.model_fp != model_fp:
+        return "cold"
+    if len(months) < state.n_obs:
+        return "stale"  # 저장 상태가 더 최신 → 재사용도 덮어쓰기도 안 함
+    n = state.n_obs
+    if series_fingerprint(months[:n], sales[:n]) != state.series_fp:
+        return "cold"  # 과거 값이 바뀜
+    if state.age + (len(months) - n) <= settings.FORECAST_REFIT_EVERY:
+        return "append"
+    return "warm"
+
+
+def advance(
+    prev: Optional[SeriesState],
+    store_id: str,
+    months: Sequence[str],
+    sales: Sequence[float],
+    model_fp: str,
+    params: Sequence[float],
+    mode: str,
+    iterations: int,
+) -> SeriesState:
+    """이번 적합 결과로 다음 상태"""
+    if mode == "append" and prev is not None:
+        age = prev.age + (len(months) - prev.n_obs)
+    else:
+        age = 0
+    cold = prev.cold_iterations if prev is not None else None
+    if mode == "cold":
+        cold = iterations
+    return SeriesState(
+        store_id=store_id,
+        n_obs=len(months),
+        series_fp=series_fingerprint(months, sales),
+        model_fp=model_fp,
+        params=[float(v) for v in params],
+        age=age,
+        cold_iterations=cold,
+    )
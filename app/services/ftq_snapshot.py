@@ -0,0 +1,93 @@
+# app/services/ftq_snapshot.py
+# -----------------------------------------------------------------------------
+# 최신 분기 유동인구(FTQ) 스냅샷
+# - 최신 (year, quarter)와 그 분기의 (lat, lon, pop)을 NumPy 배열로 캐시
+#   (위도순 정렬) → 근방 최대/평균 유동인구를 DB 왕복 없이
+#   위도 구간 이진 탐색 + 경도 마스크로, 여러 지점도 한 번에 (recent_near_many)
+# - upsert_ftq / 벌크 적재의 커밋 이벤트("ftq")로 무효화, 다음 조회 때 한 문장 재적재
+# - 다중 워커: 다른 워커의 쓰기는 FTQ_SNAPSHOT_TTL_S마다 재적재로 흡수
+# -----------------------------------------------------------------------------
+from __future__ import annotations
+
+import asyncio
+import time
+
+import numpy as np
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.db import crud, events
+
+
+class FTQSnapshot:
+    """period=(year, quarter), lats/lons/pops: 해당 분기 전체 격자점"""
+
+    def __init__(self):
+        self.period: tuple[int, int] | None = None
+        self.lats = np.empty(0, dtype=np.float64)
+        self.lons = np.empty(0, dtype=np.float64)
+        self.pops = np.empty(0, dtype=np.int64)
+        self._stale = True
+        self._loaded_at = 0.0
+        self._lock = asyncio.Lock()
+
+    async def ensure(self, db: AsyncSession) -> None:
+        """무효화됐거나 TTL이 지났으면 재적재"""
+        expired = time.monotonic() - self._loaded_at >= settings.FTQ_SNAPSHOT_TTL_S
+        if not (self._stale or expired):
+            return
+        async with self._lock:
+            expired = time.monotonic() - self._loaded_at >= settings.FTQ_SNAPSHOT_TTL_S
+            if not (self._stale or expired):
+                return
+            self._stale = False  # 적재 중 도착한 무효화는 다시 True로
+            period, rows = await crud.get_latest_ftq_rows(db)
+            arr = np.array(rows, dtype=np.float64).reshape(-1, 3)
+            arr = arr[np.argsort(arr[:, 0], kind="stable")]
+            self.period = period
+            self.lats, self.lons = arr[:, 0], arr[:, 1]
+            self.pops = arr[:, 2].astype(np.int64)
+            self._loaded_at = time.monotonic()
+
+    def on_ftq_written(self, payload: dict) -> None:
+        period = (payload["year"], payload["quarter"])
+        if self.period is None or period >= self.period:
+            self._stale = True
+
+    def _box(self, lat: float, lon: float, deg: float) -> np.ndarray:
+        """(lat±deg, lon±deg) 상자 내 pop (SQL BETWEEN과 같은 경계)"""
+        lo = np.searchsorted(self.lats, lat - deg, side="left")
+        hi = np.searchsorted(self.lats, lat + deg, side="right")
+        lons = self.lons[lo:hi]
+        return self.pops[lo:hi][(lons >= lon - deg) & (lons <= lon + deg)]
+
+    @staticmethod
+    def _agg(pops: np.ndarray, agg: str) -> int | None:
+        if not len(pops):
+            return None
+        val = int(pops.max()) if agg == "max" else int(round(pops.mean()))
+        return val if val > 0 else None
+
+    async def recent_near(
+        self, db: AsyncSession, lat: float, lon: float, deg: float = 0.03, agg="max"
+    ) -> int | None:
+        """
+        최신 분기 근방 유동인구 (crud.get_ftq_recent_near와 같은 결과, agg="max").
+        agg="avg"면 상자 내 평균. 값이 없거나 0 이하면 None.
+        """
+        await self.ensure(db)
+        return self._agg(self._box(lat, lon, deg), agg)
+
+    async def recent_near_many(
+        self, db: AsyncSession, lats, lons, deg: float = 0.03, agg="max"
+    ) -> list[int | None]:
+        """지점마다 recent_near와 같은 값 (스냅샷 확인은 한 번)"""
+        await self.ensure(db)
+        return [
+            self._agg(self._box(float(la), float(lo), deg), agg)
+            for la, lo in zip(lats, lons)
+        ]
+
+
+ftq_snapshot = FTQSnapshot()
+events.subscribe("ftq", ftq_snapshot.on_ftq_written)
@@ -0,0 +1,293 @@
+# app/services/grid.py
+# -----------------------------------------------------------------------------
+# 수성구 고정 격자 사전 집계 (셀 단위 경쟁/유동인구)
+# - 셀별 장소 수/프랜차이즈 수/유동인구 합 + 분기별 FTQ 인구 합을
+#   DB(grid_cells, grid_ftq)에 물질화, 메모리에는 2D 배열 + 누적합 테이블(SAT)
+# - 반경 질의: 셀 중심 기준 원판 스텐실(행별 [x0, x1] 구간) × SAT
+#   → 행마다 사각합 O(1), 전체를 NumPy 인덱싱 한 번으로 (DB 왕복 없음)
+# - 쓰기는 커밋 이벤트("places", "ftq")로 더티 셀만 표시
+#   → 다음 질의 때(GRID_REFRESH_S 간격) 해당 셀만 SQL 재집계/저장
+# - 데이터 버전: 셀 저장 트랜잭션마다 grid_meta.version +1 (DB 공유)
+#   → 다중 워커/재시작에도 같은 버전 = 같은 셀 값 (히트맵 ETag/캐시 키)
+#   다른 워커가 저장해 버전이 어긋나면 다시 적재
+# - 정밀도: 셀 중심 판정 → 원 경계에서 셀 크기(GRID_CELL_M) 수준 오차
+# -----------------------------------------------------------------------------
+from __future__ import annotations
+
+import time
+from typing import Hashable, Iterable
+
+import numpy as np
+from loguru import logger
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core import geo
+from app.core.config import settings
+from app.db import crud, events
+
+PLACE_LAYERS = ("competitors", "franchise", "ft_sum", "ft_n")
+_MAX_DIRTY = 4000  # 더티 셀이 이보다 많으면 부분 대신 전체 재집계
+_MIN_RADIUS_CELLS = 4  # 이보다 작은 반경은 셀 오차가 커서 정확 SQL 집계 사용
+
+Period = tuple[int, int]
+
+
+class GridLayer:
+    """
+    layers[name] / ftq[(year, quarter)] : (ny, nx) int64 셀 값
+    SAT는 질의 시 지연 생성, 셀 갱신 시 무효화.
+    """
+
+    def __init__(self):
+        self.spec: geo.GridSpec | None = None
+        self.ready = False
+        self.layers: dict[str, np.ndarray] = {}
+        self.ftq: dict[Period, np.ndarray] = {}
+        self._sat: dict[Hashable, np.ndarray] = {}
+        self._stencils: dict[float, tuple[np.ndarray, np.ndarray]] = {}
+        self._dirty: set[int] = set()
+        self._dirty_ftq: dict[Period, set[int]] = {}
+        self._refreshed_at = 0.0
+        self._version = 0  # 메모리 셀 값에 해당하는 DB 데이터 버전 (-1 = 모름)
+
+    @property
+    def version(self) -> int:
+        """격자 데이터 버전 (파생 결과 캐시 키, refresh 후 확정)"""
+        return self._version
+
+    @property
+    def latest_period(self) -> Period | None:
+        return max(self.ftq) if self.ftq else None
+
+    def usable(self, lat: float, lon: float, radius_m: float) -> bool:
+        """격자로 답할 수 있는 질의인지 (적재 완료 + 반경이 범위 안 + 최소 반경)"""
+        return (
+            self.ready
+            and radius_m >= _MIN_RADIUS_CELLS * self.spec.cell_m
+            and self.spec.covers(lat, lon, radius_m)
+        )
+
+    # ── 셀 값 채우기 ─────────────────────────────────────────────────────────
+    def _zeros(self) -> np.ndarray:
+        return np.zeros((self.spec.ny, self.spec.nx), dtype=np.int64)
+
+    def _fill_places(self, rows: list[tuple], cells: Iterable[int] | None) -> None:
+        if cells is None:
+            self.layers = {name: self._zeros() for name in PLACE_LAYERS}
+        else:
+            idx = np.fromiter(cells, dtype=np.int64)
+            for name in PLACE_LAYERS:
+                self.layers[name].reshape(-1)[idx] = 0
+        if rows:
+            arr = np.array(rows, dtype=np.int64).reshape(-1, 1 + len(PLACE_LAYERS))
+            for i, name in enumerate(PLACE_LAYERS, start=1):
+                self.layers[name].reshape(-1)[arr[:, 0]] = arr[:, i]
+        for name in PLACE_LAYERS:
+            self._sat.pop(name, None)
+
+    def _fill_ftq(
+        self,
+        rows: list[tuple],
+        period: Period | None = None,
+        cells: Iterable[int] | None = None,
+    ) -> None:
+        if period is None:
+            self.ftq = {}
+            self._sat = {k: v for k, v in self._sat.items() if k in PLACE_LAYERS}
+        elif cells is None:
+            self.ftq.pop(period, None)
+        else:
+            grid = self.ftq.get(period)
+            if grid is not None:
+                grid.reshape(-1)[np.fromiter(cells, dtype=np.int64)] = 0
+        for y, q, cell, pop in rows:
+            grid = self.ftq.get((y, q))
+            if grid is None:
+                grid = self.ftq[(y, q)] = self._zeros()
+            grid.reshape(-1)[cell] = pop or 0
+        if period is not None:
+            self._sat.pop(period, None)
+
+    def _advance(self, version: int) -> None:
+        """내 저장으로 버전이 정확히 +1 됐을 때만 따라감 (사이에 다른 워커 저장 → 재적재)"""
+        self._version = version if version == self._version + 1 else -1
+
+    # ── DB 동기화 ────────────────────────────────────────────────────────────
+    async def load(self, db: AsyncSession) -> None:
+        """물질화된 셀 적재 (없으면 전체 재구축)"""
+        self.spec = geo.GridSpec(
+            settings.GRID_MIN_LAT,
+            settings.GRID_MIN_LON,
+            settings.GRID_MAX_LAT,
+            settings.GRID_MAX_LON,
+            settings.GRID_CELL_M,
+        )
+        self._stencils.clear()
+        if not await self._reload(db):
+            await self.rebuild(db)
+        self._refreshed_at = time.monotonic()
+        self.ready = True
+        logger.info(
+            f"[grid] {self.spec.key}: 장소 {int(self.layers['competitors'].sum()):,}"
+            f"건, FTQ {len(self.ftq)}개 분기"
+        )
+
+    async def rebuild(self, db: AsyncSession) -> None:
+        """원본 테이블에서 전체 셀 재집계 후 저장"""
+        spec = self.spec
+        rows = await crud.grid_place_aggregates(db, spec)
+        self._advance(await crud.save_grid_cells(db, spec.key, rows))
+        self._fill_places(rows, None)
+        ftq_rows = await crud.grid_ftq_aggregates(db, spec)
+        self._advance(await crud.save_grid_ftq(db, spec.key, ftq_rows))
+        self._fill_ftq(ftq_rows)
+
+    async def _reload(self, db: AsyncSession) -> bool:
+        """
+        DB 셀 전체 적재 + 버전 (한 읽기 트랜잭션 → 버전과 셀 값이 같은 스냅샷).
+        반환: 물질화된 셀이 있었는지
+        """
+        version = await crud.grid_version(db, self.spec.key)
+        rows = await crud.load_grid_cells(db, self.spec.key)
+        self._fill_places(rows, None)
+        self._fill_ftq(await crud.load_grid_ftq(db, self.spec.key))
+        self._version = version
+        return bool(rows)
+
+    async def refresh(self, db: AsyncSession, *, force: bool = False) -> None:
+        """더티 셀만 재집계 (GRID_REFRESH_S 간격, force면 즉시)"""
+        now = time.monotonic()
+        stale = self._version < 0
+        if not (force or stale) and now - self._refreshed_at < settings.GRID_REFRESH_S:
+            return
+        self._refreshed_at = now
+        spec = self.spec
+
+        # 다른 워커가 저장한 셀 흡수
+        if stale or await crud.grid_version(db, spec.key) != self._version:
+            await self._reload(db)
+
+        dirty, self._dirty = self._dirty, set()
+        dirty_ftq, self._dirty_ftq = self._dirty_ftq, {}
+        try:
+            if dirty:
+                cells = sorted(dirty) if len(dirty) <= _MAX_DIRTY else None
+                rows = await crud.grid_place_aggregates(db, spec, cells)
+                self._advance(
+                    await crud.save_grid_cells(db, spec.key, rows, cells=cells)
+                )
+                self._fill_places(rows, cells)
+            for (y, q), cset in dirty_ftq.items():
+                cells = sorted(cset) if len(cset) <= _MAX_DIRTY else None
+                rows = await crud.grid_ftq_aggregates(
+                    db, spec, year=y, quarter=q, cells=cells
+                )
+                self._advance(
+                    await crud.save_grid_ftq(
+                        db, spec.key, rows, year=y, quarter=q, cells=cells
+                    )
+                )
+                self._fill_ftq(rows, (y, q), cells)
+        except Exception:
+            self._dirty |= dirty
+            for period, cset in dirty_ftq.items():
+                self._dirty_ftq.setdefault(period, set()).update(cset)
+            raise
+
+    def on_places_written(self, rows: list[dict]) -> None:
+        if not self.ready or not rows:
+            return
+        cells = self.spec.cell_ids([r["lat"] for r in rows], [r["lon"] for r in rows])
+        self._dirty.update(cells.tolist())
+
+    def on_ftq_written(self, payload: dict) -> None:
+        if not self.ready or not payload["coords"]:
+            return
+        lats, lons = zip(*payload["coords"])
+        cells = self.spec.cell_ids(lats, lons)
+        period = (payload["year"], payload["quarter"])
+        self._dirty_ftq.setdefault(period, set()).update(cells.tolist())
+
+    # ── 질의 ────────────────────────────────────────────────────────────────
+    def _sat_of(self, key: Hashable) -> np.ndarray:
+        sat = self._sat.get(key)
+        if sat is None:
+            grid = self.layers[key] if isinstance(key, str) else self.ftq[key]
+            sat = np.zeros((self.spec.ny + 1, self.spec.nx + 1), dtype=np.int64)
+            sat[1:, 1:] = grid.cumsum(axis=0).cumsum(axis=1)
+            self._sat[key] = sat
+        return sat
+
+    def _stencil(self, radius_m: float) -> tuple[np.ndarray, np.ndarray]:
+        """원판 스텐실: 행 오프셋 dy와 행별 반폭 w (셀 중심 거리 ≤ r)"""
+        st = self._stencils.get(radius_m)
+        if st is None:
+            r = radius_m / self.spec.cell_m
+            dy = np.arange(-int(r), int(r) + 1)
+            w = np.floor(np.sqrt(np.maximum(r * r - dy * dy, 0.0))).astype(np.int64)
+            st = self._stencils[radius_m] = (dy, w)
+        return st
+
+    def disk_sums(
+        self, keys: Iterable[Hashable], lats, lons, radius_m: float
+    ) -> dict[Hashable, np.ndarray]:
+        """
+        점 N개 각각의 반경 내 셀 합 {key: (N,) 배열}.
+        key: PLACE_LAYERS 이름 또는 FTQ 분기 (year, quarter).
+        비용: 점마다 스텐실 행 수(2·r/cell + 1)만큼 SAT 사각합 → O(N · r/cell)
+        시간, 중간 배열 (N, 행 수) 메모리 (셀 50 m·반경 1 km ≈ 41행).
+        외접 정사각형 한 번(O(1))이면 더 싸지만 면적이 4/π배(≈ +27%)라
+        경쟁 수/인구가 부풀려짐 → 원 경계 정확도를 위해 행 단위 합 유지.
+        N이 크면 호출 측에서 나눠 넣음 (heatmap._CHUNK).
+        """
+        ny, nx = self.spec.ny, self.spec.nx
+        cy, cx = self.spec.cell_yx(np.atleast_1d(lats), np.atleast_1d(lons))
+        dy, w = self._stencil(radius_m)
+        rows = cy[:, None] + dy[None, :]
+        ok = (rows >= 0) & (rows < ny)
+        r0 = np.clip(rows, 0, ny - 1)
+        r1 = r0 + 1
+        x0 = np.clip(cx[:, None] - w[None, :], 0, nx)
+        x1 = np.clip(cx[:, None] + w[None, :] + 1, 0, nx)
+        out = {}
+        for key in keys:
+            sat = self._sat_of(key)
+            span = sat[r1, x1] - sat[r0, x1] - sat[r1, x0] + sat[r0, x0]
+            out[key] = np.where(ok, span, 0).sum(axis=1)
+        return out
+
+    def area_aggregates(self, lats, lons, radius_m: float) -> list[crud.AreaAggregate]:
+        """crud.aggregate_places_in_radius의 격자 버전 (점 N개 일괄)"""
+        s = self.disk_sums(PLACE_LAYERS, lats, lons, radius_m)
+        out = []
+        for count, franchise, ft_sum, ft_n in zip(
+            *(s[name].tolist() for name in PLACE_LAYERS)
+        ):
+            out.append(
+                crud.AreaAggregate(
+                    count=count,
+                    franchise=franchise,
+                    personal=count - franchise,
+                    avg_foot_traffic=ft_sum / ft_n if ft_n else None,
+                )
+            )
+        return out
+
+    def area_aggregate(
+        self, lat: float, lon: float, radius_m: float
+    ) -> crud.AreaAggregate:
+        return self.area_aggregates([lat], [lon], radius_m)[0]
+
+    def ftq_pop(
+        self, lat: float, lon: float, radius_m: float, period: Period | None = None
+    ) -> int | None:
+        """반경 내 분기 유동인구 합 (period 생략 시 최신 분기)"""
+        period = period or self.latest_period
+        if period not in self.ftq:
+            return None
+        return int(self.disk_sums([period], lat, lon, radius_m)[period][0])
+
+
+grid_layer = GridLayer()
+events.subscribe("places", grid_layer.on_places_written)
+events.subscribe("ftq", grid_layer.on_ftq_written)
@@ -0,0 +1,167 @@
+# app/services/heatmap.py
+# -----------------------------------------------------------------------------
+# 적합도 히트맵 (bbox × cell_m 래스터)
+# - 출력 셀 중심마다 반경 내 경쟁 수/최신 분기 유동인구를 격자 SAT 원판합으로
+#   (app/services/grid.py: Place·FTQ를 같은 격자로 묶어 둔 사전 집계)
+# - 점수식은 /analysis/area와 같은 analyzer.suitability_score
+# - 결과는 (bbox, cell_m, radius_m, 옵션, 격자 데이터 버전) 키로 캐시
+#   → 데이터가 바뀌지 않으면 재계산/재전송 없음 (ETag)
+#   버전은 DB(grid_meta)에 있어 워커/재시작이 달라도 같은 ETag
+# -----------------------------------------------------------------------------
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import math
+from dataclasses import dataclass
+
+import numpy as np
+
+from app.core import geo
+from app.core.cache import AsyncTTLCache
+from app.services.analyzer import suitability_score
+from app.services.grid import grid_layer
+
+MAX_CELLS = 250_000
+_CHUNK = 4096  # disk_sums 한 번에 넣을 중심점 수 (N × 스텐실 행 메모리 상한)
+
+_cache = AsyncTTLCache(maxsize=32, ttl=3600.0)
+
+
+@dataclass(slots=True)
+class Heatmap:
+    bbox: tuple[float, float, float, float]  # (min_lat, min_lon, max_lat, max_lon)
+    shape: tuple[int, int]  # (ny, nx), 0행 = 남쪽(min_lat)
+    cell_m: float
+    radius_m: float
+    period: tuple[int, int] | None  # 유동인구 분기
+    revision: int
+    etag: str
+    score: np.ndarray  # uint8 (ny, nx)
+    competitors: np.ndarray  # int32 (ny, nx)
+    foot_traffic: np.ndarray | None  # int64 (ny, nx), FTQ 없으면 None
+
+    def to_json(self) -> dict:
+        """행 우선 평탄화 배열 (shape로 복원)"""
+        return {
+            "bbox": list(self.bbox),
+            "shape": list(self.shape),
+            "cell_m": self.cell_m,
+            "radius_m": self.radius_m,
+            "period": list(self.period) if self.period else None,
+            "revision": self.revision,
+            "score": self.score.ravel().tolist(),
+            "competitors": self.competitors.ravel().tolist(),
+            "foot_traffic": (
+                self.foot_traffic.ravel().tolist()
+                if self.foot_traffic is not None
+                else None
+            ),
+        }
+
+
+def _centers(
+    bbox: tuple[float, float, float, float], cell_m: float
+) -> tuple[np.ndarray, np.ndarray]:
+    min_lat, min_lon, max_lat, max_lon = bbox
+    ky, kx = geo.local_scale((min_lat + max_lat) / 2)
+    dlat, dlon = cell_m / ky, cell_m / kx
+    ny = max(1, math.ceil((max_lat - min_lat) / dlat))
+    nx = max(1, math.ceil((max_lon - min_lon) / dlon))
+    if ny * nx > MAX_CELLS:
+        raise ValueError(
+            f"셀 {ny}x{nx}개가 상한 {MAX_CELLS:,}개 초과 — cell_m을 키우세요"
+        )
+    return (
+        min_lat + (np.arange(ny) + 0.5) * dlat,
+        min_lon + (np.arange(nx) + 0.5) * dlon,
+    )
+
+
+def _compute(
+    bbox: tuple[float, float, float, float],
+    cell_m: float,
+    radius_m: float,
+    use_foot_traffic: bool,
+    etag: str,
+) -> Heatmap:
+    lat_c, lon_c = _centers(bbox, cell_m)
+    shape = (len(lat_c), len(lon_c))
+    lats = np.repeat(lat_c, shape[1])
+    lons = np.tile(lon_c, shape[0])
+
+    period = grid_layer.latest_period
+    keys = ["competitors"] + ([period] if period else [])
+    comp = np.empty(lats.size, dtype=np.int64)
+    foot = np.zeros(lats.size, dtype=np.int64) if period else None
+    for i in range(0, lats.size, _CHUNK):
+        sl = slice(i, i + _CHUNK)
+        sums = grid_layer.disk_sums(keys, lats[sl], lons[sl], radius_m)
+        comp[sl] = sums["competitors"]
+        if period:
+            foot[sl] = sums[period]
+
+    floating = foot if (use_foot_traffic and foot is not None) else 0
+    score = suitability_score(comp, floating).astype(np.uint8)
+    return Heatmap(
+        bbox=bbox,
+        shape=shape,
+        cell_m=cell_m,
+        radius_m=radius_m,
+        period=period,
+        revision=grid_layer.version,
+        etag=etag,
+        score=score.reshape(shape),
+        competitors=comp.astype(np.int32).reshape(shape),
+        foot_traffic=foot.reshape(shape) if foot is not None else None,
+    )
+
+
+def default_bbox() -> tuple[float, float, float, float]:
+    """격자 전체 범위 (수성구)"""
+    s = grid_layer.spec
+    return s.min_lat, s.min_lon, s.max_lat, s.max_lon
+
+
+def heatmap_etag(
+    bbox: tuple[float, float, float, float],
+    cell_m: float,
+    radius_m: float,
+    use_foot_traffic: bool,
+) -> str:
+    """요청 파라미터 + 격자 데이터 버전 → 약한 ETag (데이터가 바뀌면 달라짐)"""
+    s = grid_layer.spec
+    raw = f"{bbox}|{cell_m}|{radius_m}|{use_foot_traffic}|{s.key}|{grid_layer.version}"
+    return 'W/"' + hashlib.sha1(raw.encode()).hexdigest()[:20] + '"'
+
+
+async def get_heatmap(
+    bbox: tuple[float, float, float, float],
+    cell_m: float,
+    radius_m: float,
+    *,
+    use_foot_traffic: bool = False,
+) -> Heatmap:
+    """
+    격자 범위 안 bbox의 히트맵 (호출 전 grid_layer.refresh 필요).
+    같은 파라미터 + 같은 데이터 버전이면 캐시 반환.
+    """
+    if not grid_layer.ready:
+        raise RuntimeError("격자 집계가 적재되지 않았습니다 (GRID_ENABLED)")
+    s = grid_layer.spec
+    min_lat, min_lon, max_lat, max_lon = bbox
+    if not (
+        s.min_lat <= min_lat < max_lat <= s.max_lat
+        and s.min_lon <= min_lon < max_lon <= s.max_lon
+    ):
+        raise ValueError(f"bbox는 격자 범위 {default_bbox()} 안이어야 합니다")
+
+    etag = heatmap_etag(bbox, cell_m, radius_m, use_foot_traffic)
+
+    async def load() -> Heatmap:
+        # CPU 연산은 스레드로 (이벤트 루프 차단 방지)
+        return await asyncio.to_thread(
+            _compute, bbox, cell_m, radius_m, use_foot_traffic, etag
+        )
+
+    return await _cache.get_or_load(etag, load)
@@ -2,18 +2,26 @@
 # -----------------------------------------------------------------------------
 # (1) 데모용 MOCK 적재
 # (2) 수성구 공공데이터 유동인구 적재
-# (3) 서버 기동 시 분기별 부트스트랩
+# (3) 서버 기동 시 분기별 부트스트랩 (동시 분기 수집 + 페이지 체크포인트 재개)
 # -----------------------------------------------------------------------------
 from __future__ import annotations
 
 import asyncio
+from typing import Callable
+
 import httpx
-from sqlalchemy import select
-from sqlalchemy.ext.asyncio import AsyncSession
+from loguru import logger
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
 from app.core.config import settings
-from app.db.models import Place, IngestLog
+from app.core.ratelimit import AsyncTokenBucket
 from app.db import crud
+from app.db.session import AsyncSessionLocal
+
+SOURCE_SUSEONG = "suseong"
+
+# 페이지 커밋 직후 호출되는 진행률 콜백: (page, rows_added)
+PageCallback = Callable[[int, int], None]
 
 
 # ── (1) MOCK DEMO DATA ────────────────────────────────────────────────────────
@@ -46,82 +54,265 @@ MOCK = [
 
 
 async def load_mock(session: AsyncSession) -> None:
-    for m in MOCK:
-        session.add(Place(**m))
-    await session.commit()
+    await crud.insert_places_ignore(session, [dict(m) for m in MOCK])
 
 
 # ── (2) 수성구 유동인구 적재 ───────────────────────────────────────────────────
+def _parse_items(items: list[dict]) -> list[dict]:
+    """API items → {"name", "lat", "lon", "pop"} 목록 (좌표 없는 항목 제외)"""
+    rows: list[dict] = []
+    for it in items:
+        # 이름
+        name = str(it.get("marketNm") or it.get("name") or "상권").strip()
+
+        # 좌표
+        lat_raw = it.get("lat") or it.get("latitude") or it.get("위도")
+        lon_raw = it.get("lon") or it.get("longitude") or it.get("경도")
+        try:
+            lat = float(lat_raw)
+            lon = float(lon_raw)
+        except (TypeError, ValueError):
+            continue
+        if not lat or not lon:
+            continue
+
+        # 유동인구
+        pop_raw = it.get("popuCnt") or it.get("flowCnt") or it.get("total")
+        try:
+            pop = int(float(pop_raw))
+        except (TypeError, ValueError):
+            pop = 0
+
+        rows.append({"name": name, "lat": lat, "lon": lon, "pop": pop})
+    return rows
+
+
+def _extract_items(data: dict) -> list[dict]:
+    """응답 구조 방어적 파싱 → items 리스트"""
+    items_node = (data.get("response") or {}).get("body", {}).get("items")
+    if isinstance(items_node, dict):
+        return items_node.get("item", []) or []
+    if isinstance(items_node, list):
+        return items_node
+    return []
+
+
+def suseong_client(concurrency: int | None = None) -> httpx.AsyncClient:
+    """수집 전체(부트스트랩 포함)에서 재사용하는 keep-alive 클라이언트"""
+    n = max(1, concurrency or settings.SUSEONG_FETCH_CONCURRENCY)
+    return httpx.AsyncClient(
+        timeout=settings.SUSEONG_HTTP_TIMEOUT,
+        limits=httpx.Limits(max_keepalive_connections=n, max_connections=n),
+    )
+
+
+async def _fetch_page(
+    client: httpx.AsyncClient,
+    limiter: AsyncTokenBucket,
+    *,
+    year: int,
+    quarter: int,
+    page: int,
+    page_size: int,
+) -> list[dict]:
+    await limiter.acquire()
+    params = {
+        "serviceKey": settings.SUSEONG_API_KEY,
+        "startYear": str(year),
+        "startBungi": str(quarter),
+        "resultType": "json",
+        "size": str(page_size),
+        "page": str(page),
+    }
+    r = await client.get(settings.SUSEONG_API_URL, params=params)
+    r.raise_for_status()
+    return _extract_items(r.json())
+
+
+async def _produce_pages(
+    client: httpx.AsyncClient,
+    limiter: AsyncTokenBucket,
+    queue: asyncio.Queue,
+    stop: asyncio.Event,
+    *,
+    year: int,
+    quarter: int,
+    pages: range,
+    page_size: int,
+    concurrency: int,
+) -> None:
+    """
+    생산자: 페이지 fetch 태스크를 페이지 순서대로 큐에 적재.
+    - 세마포어로 동시 in-flight 요청 수 제한
+    - stop이 세팅되면(빈 페이지/오류) 새 요청 중단
+    """
+    sem = asyncio.Semaphore(concurrency)
+    for page in pages:
+        await sem.acquire()
+        if stop.is_set():
+            sem.release()
+            return
+        task = asyncio.create_task(
+            _fetch_page(
+                client,
+                limiter,
+                year=year,
+                quarter=quarter,
+                page=page,
+                page_size=page_size,
+            )
+        )
+        task.add_done_callback(lambda _t: sem.release())
+        try:
+            await queue.put((page, task))
+        except asyncio.CancelledError:
+            task.cancel()
+            raise
+    await queue.put(None)
+
+
+async def _shutdown_producer(producer: asyncio.Task, queue: asyncio.Queue) -> None:
+    """생산자 중단 + 큐에 남은(선행 요청) 태스크 취소/회수"""
+    producer.cancel()
+    await asyncio.gather(producer, return_exceptions=True)
+    pending = []
+    while not queue.empty():
+        entry = queue.get_nowait()
+        if entry is not None:
+            entry[1].cancel()
+            pending.append(entry[1])
+    await asyncio.gather(*pending, return_exceptions=True)
+
+
+def suseong_limiter() -> AsyncTokenBucket:
+    """수성구 API 전역 속도 제한 (부트스트랩 시 모든 분기가 공유)"""
+    rps = settings.SUSEONG_RATE_LIMIT_RPS
+    return AsyncTokenBucket(rps, burst=max(1, int(rps)))
+
+
 async def ingest_suseong_foot_traffic(
-    db: AsyncSession, *, year: int, quarter: int, pages: int = 5, page_size: int = 100
+    db: AsyncSession,
+    *,
+    year: int,
+    quarter: int,
+    pages: int = 5,
+    page_size: int = 100,
+    client: httpx.AsyncClient | None = None,
+    concurrency: int | None = None,
+    limiter: AsyncTokenBucket | None = None,
+    resume: bool = False,
+    on_page: PageCallback | None = None,
 ) -> dict:
     """
-    수성구 유동인구 API 호출 → items 파싱 → Place & FTQ에 upsert
+    수성구 유동인구 API 호출 → items 파싱 → Place & FTQ에 페이지 단위 벌크 upsert
+    - 페이지 요청은 동시에(최대 concurrency개) 진행, DB 쓰기는 페이지 순서대로
+      소비자가 처리 → 네트워크 대기와 DB 쓰기가 겹침
+    - 첫 빈 페이지에서 종료(이후 선행 요청은 취소)
+    - client를 넘기면 keep-alive 연결 재사용(부트스트랩), 없으면 임시 생성
+    - resume=True: 페이지마다 IngestState에 체크포인트(데이터와 같은 트랜잭션),
+      이미 done이면 건너뛰고, 아니면 마지막 커밋 페이지 다음부터 재개
+    - on_page: 페이지 커밋마다 (page, rows_added) 통지 (작업 진행률)
     """
     if not settings.SUSEONG_API_KEY:
         raise RuntimeError("SUSEONG_API_KEY가 설정되어 있지 않습니다")
 
-    total_ingested = 0
-    async with httpx.AsyncClient(timeout=20) as client:
-        for page in range(1, pages + 1):
-            params = {
-                "serviceKey": settings.SUSEONG_API_KEY,
-                "startYear": str(year),
-                "startBungi": str(quarter),
-                "resultType": "json",
-                "size": str(page_size),
-                "page": str(page),
+    n = max(1, concurrency or settings.SUSEONG_FETCH_CONCURRENCY)
+    if client is None:
+        async with suseong_client(n) as own:
+            return await ingest_suseong_foot_traffic(
+                db,
+                year=year,
+                quarter=quarter,
+                pages=pages,
+                page_size=page_size,
+                client=own,
+                concurrency=n,
+                limiter=limiter,
+                resume=resume,
+                on_page=on_page,
+            )
+    limiter = limiter or suseong_limiter()
+
+    first_page = 1
+    if resume:
+        state = await crud.get_ingest_state(
+            db, source=SOURCE_SUSEONG, year=year, quarter=quarter
+        )
+        if state is not None and state.status == "done":
+            return {
+                "status": "skipped",
+                "ingested": 0,
+                "year": year,
+                "quarter": quarter,
             }
-            r = await client.get(settings.SUSEONG_API_URL, params=params)
-            r.raise_for_status()
-            data = r.json()
-
-            # 응답 구조 방어적 파싱
-            items_node = data.get("response", {}).get("body", {}).get("items")
-            if isinstance(items_node, dict):
-                items = items_node.get("item", [])
-            elif isinstance(items_node, list):
-                items = items_node
-            else:
-                items = []
+        first_page = (state.last_page if state is not None else 0) + 1
+        await crud.save_ingest_state(
+            db, source=SOURCE_SUSEONG, year=year, quarter=quarter, status="running"
+        )
 
+    queue: asyncio.Queue = asyncio.Queue(maxsize=2 * n)
+    stop = asyncio.Event()
+    producer = asyncio.create_task(
+        _produce_pages(
+            client,
+            limiter,
+            queue,
+            stop,
+            year=year,
+            quarter=quarter,
+            pages=range(first_page, pages + 1),
+            page_size=page_size,
+            concurrency=n,
+        )
+    )
+
+    total_ingested = 0
+    try:
+        while (entry := await queue.get()) is not None:
+            page, task = entry
+            items = await task
             if not items:
                 break
 
-            for it in items:
-                # 이름
-                name = str(it.get("marketNm") or it.get("name") or "상권").strip()
-
-                # 좌표
-                lat_raw = it.get("lat") or it.get("latitude") or it.get("위도")
-                lon_raw = it.get("lon") or it.get("longitude") or it.get("경도")
-                try:
-                    lat = float(lat_raw)
-                    lon = float(lon_raw)
-                except (TypeError, ValueError):
-                    continue
-                if not lat or not lon:
-                    continue
-
-                # 유동인구
-                pop_raw = it.get("popuCnt") or it.get("flowCnt") or it.get("total")
-                try:
-                    pop = int(float(pop_raw))
-                except (TypeError, ValueError):
-                    pop = 0
-
-                # upsert
-                await crud.upsert_place_with_foot_traffic(
-                    db, name=name, lat=lat, lon=lon, foot_traffic=pop
+            # 페이지 단위 벌크 업서트 (Place + FTQ [+ 체크포인트], 1트랜잭션)
+            added = await crud.bulk_upsert_foot_traffic(
+                db, year=year, quarter=quarter, rows=_parse_items(items), commit=False
+            )
+            if resume:
+                await crud.save_ingest_state(
+                    db,
+                    source=SOURCE_SUSEONG,
+                    year=year,
+                    quarter=quarter,
+                    status="running",
+                    page=page,
+                    rows_added=added,
+                    commit=False,
                 )
-                await crud.upsert_ftq(
-                    db, year=year, quarter=quarter, lat=lat, lon=lon, pop=pop
-                )
-
-                total_ingested += 1
-
-            # 배치 커밋
             await db.commit()
+            total_ingested += added
+            if on_page is not None:
+                on_page(page, added)
+    except Exception as e:
+        await db.rollback()
+        if resume:
+            await crud.save_ingest_state(
+                db,
+                source=SOURCE_SUSEONG,
+                year=year,
+                quarter=quarter,
+                status="error",
+                error=str(e)[:500],
+            )
+        raise
+    finally:
+        stop.set()
+        await _shutdown_producer(producer, queue)
+
+    if resume:
+        await crud.save_ingest_state(
+            db, source=SOURCE_SUSEONG, year=year, quarter=quarter, status="done"
+        )
 
     return {
         "status": "ok",
@@ -131,47 +322,60 @@ async def ingest_suseong_foot_traffic(
     }
 
 
-# ── (3) 부트스트랩 유틸 ────────────────────────────────────────────────────────
-async def _is_done(db: AsyncSession, key: str) -> bool:
-    res = await db.execute(
-        select(IngestLog).where(IngestLog.source == key, IngestLog.status == "done")
-    )
-    return res.scalar_one_or_none() is not None
-
-
-async def _mark(db: AsyncSession, key: str, status: str) -> None:
-    db.add(IngestLog(source=key, status=status))
-    await db.commit()
+# ── (3) 부트스트랩 스케줄러 ────────────────────────────────────────────────────
+def bootstrap_quarters() -> list[tuple[int, int]]:
+    """설정된 부트스트랩 범위의 (연, 분기) 목록"""
+    y_from = settings.SUSEONG_BOOTSTRAP_YEAR_FROM
+    y_to = settings.SUSEONG_BOOTSTRAP_YEAR_TO
+    q_to = settings.SUSEONG_BOOTSTRAP_QUARTER_TO
+    return [
+        (y, q)
+        for y in range(y_from, y_to + 1)
+        for q in range(1, (q_to if y == y_to else 4) + 1)
+    ]
 
 
-async def bootstrap_suseong(db: AsyncSession) -> dict:
+async def bootstrap_suseong(
+    session_factory: async_sessionmaker[AsyncSession] = AsyncSessionLocal,
+    *,
+    on_page: PageCallback | None = None,
+) -> dict:
     """
     설정된 범위(연/분기) 전체를 자동 적재.
-    - 이미 성공한 키는 패스
-    - 실패는 error:* 로 남겨 재시도 판별
+    - 여러 분기를 동시에 수집(SUSEONG_BOOTSTRAP_CONCURRENCY), 요청 속도는
+      전역 토큰 버킷(SUSEONG_RATE_LIMIT_RPS)으로 제한
+    - 분기마다 별도 세션, 페이지 단위 체크포인트 → 재시작 시 이어서 수집
+    - 이미 done인 분기는 패스, 실패 분기는 error로 남고 다음 실행 때 재개
     """
-    y_from = settings.SUSEONG_BOOTSTRAP_YEAR_FROM
-    y_to = settings.SUSEONG_BOOTSTRAP_YEAR_TO
-    q_to = settings.SUSEONG_BOOTSTRAP_QUARTER_TO
-    page_size = settings.SUSEONG_PAGE_SIZE
-    pages = settings.SUSEONG_PAGES
-
-    total = 0
-    for y in range(y_from, y_to + 1):
-        qmax = q_to if y == y_to else 4
-        for q in range(1, qmax + 1):
-            key = f"suseong_{y}Q{q}"
+    q_conc = max(1, settings.SUSEONG_BOOTSTRAP_CONCURRENCY)
+    f_conc = max(1, settings.SUSEONG_FETCH_CONCURRENCY)
+    sem = asyncio.Semaphore(q_conc)
+    limiter = suseong_limiter()
+
+    async def run_quarter(client: httpx.AsyncClient, y: int, q: int) -> int:
+        async with sem, session_factory() as db:
             try:
-                if await _is_done(db, key):
-                    continue
                 res = await ingest_suseong_foot_traffic(
-                    db, year=y, quarter=q, pages=pages, page_size=page_size
+                    db,
+                    year=y,
+                    quarter=q,
+                    pages=settings.SUSEONG_PAGES,
+                    page_size=settings.SUSEONG_PAGE_SIZE,
+                    client=client,
+                    concurrency=f_conc,
+                    limiter=limiter,
+                    resume=True,
+                    on_page=on_page,
                 )
-                total += res.get("ingested", 0)
-                await _mark(db, key, "done")
-                await asyncio.sleep(0.2)
-            except Exception as e:  # 실패도 로그 남김
-                await _mark(db, key, f"error:{e}")
-                await asyncio.sleep(0.5)
-
-    return {"status": "ok", "bootstrapped": total}
+                return res.get("ingested", 0)
+            except Exception as e:  # 상태 테이블에 error 기록됨 → 다음 분기 계속
+                logger.warning(f"[bootstrap] {y}Q{q} 실패: {e}")
+                return 0
+
+    # 전체 구간에서 연결 재사용 (분기 동시성 × 페이지 동시성)
+    async with suseong_client(q_conc * f_conc) as client:
+        results = await asyncio.gather(
+            *(run_quarter(client, y, q) for y, q in bootstrap_quarters())
+        )
+
+    return {"status": "ok", "bootstrapped": sum(results)}
@@ -0,0 +1,287 @@
+# app/services/jobs.py
+# -----------------------------------------------------------------------------
+# 프로세스 내 백그라운드 작업 실행기
+# - 장시간 적재(수성구 분기/부트스트랩)/피처 스토어 갱신을 요청 워커 밖에서 실행
+# - 진행률(페이지/행/처리량)은 메모리, 상태 전이는 IngestJob 테이블에 기록
+# - 취소: asyncio 태스크 cancel
+# - 기동 시 정리: 실행 프로세스(owner)가 사라진 queued/running 행 → error
+#   (같은 호스트에서만 판별, 다른 호스트 소유 행은 그대로 둠)
+# -----------------------------------------------------------------------------
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+import socket
+import time
+import uuid
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Awaitable, Callable
+
+from loguru import logger
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.db import crud
+from app.db.models import IngestJob
+from app.db.session import AsyncSessionLocal
+from app.services.feature_store import feature_store
+from app.services.ingest import bootstrap_suseong, ingest_suseong_foot_traffic
+
+ACTIVE = ("queued", "running")
+
+# 이 프로세스 식별자 (pid는 재시작 후 재사용될 수 있어 토큰을 덧붙임)
+_HOST = socket.gethostname()
+_TOKEN = uuid.uuid4().hex[:8]
+OWNER = f"{_HOST}:{os.getpid()}:{_TOKEN}"
+
+
+@dataclass(slots=True)
+class Job:
+    id: int
+    kind: str
+    params: dict
+    status: str = "queued"
+    pages_done: int = 0
+    rows_done: int = 0
+    error: str | None = None
+    result: dict | None = None
+    started: float | None = None  # monotonic
+    finished: float | None = None
+    task: asyncio.Task | None = field(default=None, repr=False)
+
+    def on_page(self, page: int, rows: int) -> None:
+        self.pages_done += 1
+        self.rows_done += rows
+
+    def to_dict(self) -> dict:
+        elapsed = 0.0
+        if self.started is not None:
+            elapsed = (self.finished or time.monotonic()) - self.started
+        return {
+            "job_id": self.id,
+            "kind": self.kind,
+            "params": self.params,
+            "status": self.status,
+            "pages_done": self.pages_done,
+            "rows_done": self.rows_done,
+            "elapsed_s": round(elapsed, 3),
+            "pages_per_sec": round(self.pages_done / elapsed, 2) if elapsed else 0.0,
+            "rows_per_sec": round(self.rows_done / elapsed, 1) if elapsed else 0.0,
+            "error": self.error,
+            "result": self.result,
+        }
+
+
+def job_row_to_dict(row: IngestJob) -> dict:
+    """DB 이력 행 → 응답 dict (처리량은 기록된 시작/종료 시각 기준)"""
+    elapsed = 0.0
+    if row.started_at and row.finished_at:
+        elapsed = (row.finished_at - row.started_at).total_seconds()
+    return {
+        "job_id": row.id,
+        "kind": row.kind,
+        "params": json.loads(row.params) if row.params else {},
+        "status": row.status,
+        "pages_done": row.pages_done,
+        "rows_done": row.rows_done,
+        "elapsed_s": round(elapsed, 3),
+        "pages_per_sec": round(row.pages_done / elapsed, 2) if elapsed else 0.0,
+        "rows_per_sec": round(row.rows_done / elapsed, 1) if elapsed else 0.0,
+        "error": row.error,
+        "created_at": row.created_at,
+        "started_at": row.started_at,
+        "finished_at": row.finished_at,
+    }
+
+
+def _now() -> datetime:
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+def _orphaned(owner: str | None) -> bool:
+    """owner 프로세스가 더 이상 없는지 (다른 호스트면 판단 불가 → False)"""
+    try:
+        host, pid_s, token = (owner or "").rsplit(":", 2)
+        pid = int(pid_s)
+    except ValueError:
+        return True  # 소유자 기록 이전 행
+    if host != _HOST:
+        return False
+    if pid == os.getpid():
+        return token != _TOKEN  # 같은 pid의 이전 프로세스
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return True
+    except PermissionError:
+        pass
+    return False
+
+
+JobFn = Callable[[Job], Awaitable[dict]]
+
+
+class JobRunner:
+    """
+    작업 제출 → IngestJob 행 생성(id 발급) → asyncio 태스크로 실행.
+    종료된 작업은 최근 keep개만 메모리에 유지(그 외는 DB 이력 조회).
+    """
+
+    def __init__(
+        self,
+        session_factory: async_sessionmaker[AsyncSession] = AsyncSessionLocal,
+        keep: int = 100,
+    ):
+        self._session_factory = session_factory
+        self._keep = keep
+        self._jobs: dict[int, Job] = {}
+        # 중복 확인 ~ 등록 사이에 DB await가 있으므로 제출을 직렬화
+        self._submit_lock = asyncio.Lock()
+
+    async def submit(
+        self, kind: str, params: dict, fn: JobFn, *, unique: bool = False
+    ) -> Job:
+        """unique=True면 같은 kind + 같은 params의 실행 중 작업이 있을 때 그 작업을 반환"""
+        async with self._submit_lock:
+            if unique:
+                for job in self._jobs.values():
+                    if (
+                        job.kind == kind
+                        and job.params == params
+                        and job.status in ACTIVE
+                    ):
+                        return job
+
+            async with self._session_factory() as db:
+                row = await crud.create_ingest_job(
+                    db, kind=kind, params=json.dumps(params), owner=OWNER
+                )
+            job = Job(id=row.id, kind=kind, params=params)
+            self._jobs[job.id] = job
+            job.task = asyncio.create_task(self._run(job, fn), name=f"job-{job.id}")
+        self._evict()
+        return job
+
+    async def reconcile(self) -> int:
+        """기동 시: 소유 프로세스가 사라진 queued/running 행을 error로 (정리한 수)"""
+        async with self._session_factory() as db:
+            rows = await crud.list_active_ingest_jobs(db)
+            stale = [r.id for r in rows if _orphaned(r.owner)]
+            for job_id in stale:
+                await crud.update_ingest_job(
+                    db,
+                    job_id,
+                    status="error",
+                    error="프로세스 종료로 중단됨",
+                    finished_at=_now(),
+                )
+        if stale:
+            logger.warning(f"[jobs] 중단된 작업 {len(stale)}건 정리: {stale}")
+        return len(stale)
+
+    def get(self, job_id: int) -> Job | None:
+        return self._jobs.get(job_id)
+
+    def cancel(self, job_id: int) -> bool:
+        job = self._jobs.get(job_id)
+        if job is None or job.task is None or job.task.done():
+            return False
+        job.task.cancel()
+        return True
+
+    async def shutdown(self) -> None:
+        tasks = [j.task for j in self._jobs.values() if j.task and not j.task.done()]
+        for t in tasks:
+            t.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def _run(self, job: Job, fn: JobFn) -> None:
+        job.status = "running"
+        job.started = time.monotonic()
+        await self._persist(job, status="running", started_at=_now())
+        try:
+            job.result = await fn(job)
+            job.status = "done"
+        except asyncio.CancelledError:
+            job.status = "cancelled"
+        except Exception as e:
+            logger.exception(f"[job {job.id}] {job.kind} 실패")
+            job.status = "error"
+            job.error = str(e)[:500]
+        finally:
+            job.finished = time.monotonic()
+            await asyncio.shield(
+                self._persist(
+                    job,
+                    status=job.status,
+                    pages_done=job.pages_done,
+                    rows_done=job.rows_done,
+                    error=job.error,
+                    finished_at=_now(),
+                )
+            )
+
+    async def _persist(self, job: Job, **values) -> None:
+        try:
+            async with self._session_factory() as db:
+                await crud.update_ingest_job(db, job.id, **values)
+        except Exception:
+            logger.exception(f"[job {job.id}] 상태 기록 실패")
+
+    def _evict(self) -> None:
+        done = [j.id for j in self._jobs.values() if j.status not in ACTIVE]
+        for job_id in sorted(done)[: max(0, len(done) - self._keep)]:
+            del self._jobs[job_id]
+
+
+job_runner = JobRunner()
+
+# 피처 스토어 갱신 직렬화: 증분 갱신 중 요청된 전체 재구축은 끝날 때까지 대기 후 실행
+_feature_lock = asyncio.Lock()
+
+
+# ── 적재 작업 제출 ────────────────────────────────────────────────────────────
+async def submit_suseong_ingest(
+    *, year: int, quarter: int, pages: int, page_size: int, resume: bool = False
+) -> Job:
+    params = {
+        "year": year,
+        "quarter": quarter,
+        "pages": pages,
+        "page_size": page_size,
+        "resume": resume,
+    }
+
+    async def _fn(job: Job) -> dict:
+        async with AsyncSessionLocal() as db:
+            return await ingest_suseong_foot_traffic(db, **params, on_page=job.on_page)
+
+    return await job_runner.submit("suseong", params, _fn)
+
+
+async def submit_bootstrap() -> Job:
+    """부트스트랩은 동시에 하나만 (실행 중이면 기존 작업 반환)"""
+
+    async def _fn(job: Job) -> dict:
+        return await bootstrap_suseong(on_page=job.on_page)
+
+    return await job_runner.submit("bootstrap", {}, _fn, unique=True)
+
+
+async def submit_feature_refresh(*, full: bool = False) -> Job:
+    """
+    피처 스토어 갱신 (전체 또는 쌓인 좌표 주변만). 종류(full)별로 하나만,
+    실제 갱신은 한 번에 하나 (실행 중인 다른 종류가 끝나면 이어서 실행)
+    """
+
+    async def _fn(job: Job) -> dict:
+        async with _feature_lock, AsyncSessionLocal() as db:
+            if full:
+                result = await feature_store.rebuild(db)
+            else:
+                result = await feature_store.refresh(db)
+        job.rows_done = result["places"]
+        return result
+
+    return await job_runner.submit("feature_store", {"full": full}, _fn, unique=True)
@@ -1,11 +1,85 @@
 # app/services/kakao.py
-import os
+# -----------------------------------------------------------------------------
+# Kakao 로컬 API 비동기 클라이언트 (카페 CE7 카테고리 검색)
+# - 앱 수명 동안 하나의 httpx.AsyncClient(커넥션 풀) 공유
+#   · main.py lifespan에서 open()/close(), 그 밖(스크립트 등)에서는 첫 호출 시 지연 생성
+# - 1페이지로 meta.pageable_count를 보고 나머지 페이지는 동시 요청
+# - 호출마다 워커 공유 토큰 버킷(SharedTokenBucket)에서 토큰 획득
+#   · priority: "interactive"(분석 요청) > "background"(사전 수집)
+# - 타임아웃/429/5xx는 Retry-After 우선, 없으면 지터 지수 백오프로 재시도
+#   · 429는 공용 쿨다운으로 기록 → 다른 워커도 함께 멈춤
+# - 결과 캐시: 좌표를 KAKAO_CACHE_GRID_M 격자로 양자화 + 반경을 키로 TTL/LRU,
+#   같은 키 동시 미스는 한 번만 호출 (실패는 캐시하지 않음)
+# - 요청 마감(app/core/deadline.py): 토큰 대기/HTTP 타임아웃/백오프를 남은 예산 안으로
+# - 서킷 브레이커: 연속 실패 시 호출 없이 즉시 폴백
+# - 실패/서킷 open/마감/쿼터 소진 → 만료 캐시가 있으면 그것, 없으면 []
+#   (응답은 degraded로 표시, 호출자는 DB 데이터만 사용)
+# -----------------------------------------------------------------------------
+from __future__ import annotations
+
+import asyncio
+import math
+import random
+import time
+from email.utils import parsedate_to_datetime
+from typing import Dict, List
+
 import httpx
-from typing import List, Dict, Optional
-from app.core.config import settings
 from loguru import logger
 
+from app.core import deadline
+from app.core.breaker import CircuitBreaker
+from app.core.cache import AsyncTTLCache
+from app.core.config import settings
+from app.core.geo import local_scale
+from app.core.ratelimit import RateLimitExceeded, SharedTokenBucket
+
 KAKAO_REST_URL = "https://dapi.kakao.com/v2/local/search/category.json"
+PAGE_SIZE = 15  # Kakao 기본 페이지 크기
+MAX_PAGES = 3
+RETRIES = 3
+
+# 연결/읽기 타임아웃을 넉넉히, 풀 대기도 제한
+_TIMEOUT = httpx.Timeout(connect=6.0, read=10.0, write=10.0, pool=6.0)
+_LIMITS = httpx.Limits(max_keepalive_connections=10, max_connections=20)
+
+
+def quantize(lat: float, lon: float, step_m: float) -> tuple[float, float]:
+    """좌표를 step_m 격자점으로 스냅 (경도 간격은 위도 보정)"""
+    if step_m <= 0:
+        return lat, lon
+    ky, _ = local_scale(lat)
+    qlat = round(round(lat * ky / step_m) * step_m / ky, 7)
+    _, kx = local_scale(qlat)
+    qlon = round(round(lon * kx / step_m) * step_m / kx, 7)
+    return qlat, qlon
+
+
+def _retry_after(r: httpx.Response | None) -> float | None:
+    """Retry-After(초 또는 HTTP-date) → 대기 초. 없으면 None"""
+    if r is None:
+        return None
+    raw = r.headers.get("Retry-After")
+    if not raw:
+        return None
+    try:
+        return max(0.0, float(raw))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(raw).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def _backoff(attempt: int) -> float:
+    """full-jitter 지수 백오프: U(0, min(cap, base·2^attempt))"""
+    cap = min(settings.KAKAO_BACKOFF_CAP_S, settings.KAKAO_BACKOFF_BASE_S * 2**attempt)
+    return random.uniform(0, cap)
+
+
+class CircuitOpen(RuntimeError):
+    """서킷 open — 상류 호출 생략"""
 
 
 def _auth_headers() -> Dict[str, str]:
@@ -15,59 +89,190 @@ def _auth_headers() -> Dict[str, str]:
     return {"Authorization": f"KakaoAK {key}"}
 
 
-async def get_nearby_cafes(lat: float, lon: float, radius_m: int = 2000) -> List[Dict]:
-    """
-    카카오 장소 검색(카페 CE7). 타임아웃/재시도 내장.
-    실패 시 [] 반환(서버는 폴백으로 DB 데이터만 사용).
-    """
-    headers = _auth_headers()
-    all_docs: List[Dict] = []
-    max_pages = 3
+class KakaoClient:
+    """앱 범위 커넥션 풀을 가진 Kakao 검색 클라이언트"""
 
-    # 연결/읽기 타임아웃을 넉넉히, 전체 요청 타임아웃도 설정
-    timeout = httpx.Timeout(connect=6.0, read=10.0, write=10.0, pool=6.0)
-    limits = httpx.Limits(max_keepalive_connections=10, max_connections=20)
+    def __init__(self):
+        self._client: httpx.AsyncClient | None = None
+        self.cache = AsyncTTLCache(
+            settings.KAKAO_CACHE_SIZE, settings.KAKAO_CACHE_TTL_S
+        )
+        self.bucket = SharedTokenBucket(
+            settings.KAKAO_QUOTA_DB,
+            "kakao",
+            rate=settings.KAKAO_RATE_LIMIT_RPS,
+            burst=settings.KAKAO_RATE_BURST,
+            daily_quota=settings.KAKAO_DAILY_QUOTA,
+            reserve=settings.KAKAO_BACKGROUND_RESERVE,
+            background_quota_frac=settings.KAKAO_BACKGROUND_QUOTA_FRAC,
+        )
+        self.breaker = CircuitBreaker(
+            "kakao",
+            failure_threshold=settings.KAKAO_BREAKER_FAILURES,
+            reset_timeout=settings.KAKAO_BREAKER_RESET_S,
+        )
 
-    # 최대 3회 재시도 (지수 백오프)
-    for attempt in range(3):
-        try:
-            async with httpx.AsyncClient(timeout=timeout, limits=limits) as client:
-                for page in range(1, max_pages + 1):
-                    params = {
-                        "category_group_code": "CE7",
-                        "y": str(lat),
-                        "x": str(lon),
-                        "radius": str(radius_m),
-                        "sort": "distance",
-                        "page": str(page),
-                    }
-                    r = await client.get(KAKAO_REST_URL, params=params, headers=headers)
-                    r.raise_for_status()
-                    data = r.json()
-                    docs = data.get("documents", []) or []
-                    if not docs:
-                        break
-                    all_docs.extend(docs)
-                    # meta.is_end가 True면 종료
-                    meta = data.get("meta", {}) or {}
-                    if meta.get("is_end") or page >= max_pages:
-                        break
-            return all_docs
-
-        except (httpx.ConnectTimeout, httpx.ReadTimeout) as e:
-            wait = 1.5 * (attempt + 1)
-            logger.warning(
-                f"[Kakao] timeout 재시도 {attempt+1}/3 … {e}. {wait:.1f}s 대기"
+    async def open(self) -> None:
+        if self._client is None:
+            self._client = httpx.AsyncClient(timeout=_TIMEOUT, limits=_LIMITS)
+
+    async def close(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    async def _get_page(
+        self,
+        lat: float,
+        lon: float,
+        radius_m: int,
+        page: int,
+        headers: dict,
+        priority: str,
+    ) -> dict:
+        """한 페이지 요청 (토큰 획득 → 타임아웃/429/5xx 재시도)"""
+        params = {
+            "category_group_code": "CE7",
+            "y": str(lat),
+            "x": str(lon),
+            "radius": str(radius_m),
+            "sort": "distance",
+            "page": str(page),
+        }
+        for attempt in range(RETRIES):
+            if priority == "interactive":
+                max_wait = deadline.budget(settings.KAKAO_MAX_WAIT_S)
+            else:
+                max_wait = deadline.remaining()
+            await self.bucket.acquire(priority, max_wait=max_wait)
+            left = deadline.remaining()
+            resp: httpx.Response | None = None
+            try:
+                resp = await self._client.get(
+                    KAKAO_REST_URL,
+                    params=params,
+                    headers=headers,
+                    timeout=_TIMEOUT if left is None else deadline.budget(10.0),
+                )
+                resp.raise_for_status()
+                return resp.json()
+            except (httpx.TimeoutException, httpx.HTTPStatusError) as e:
+                status = resp.status_code if resp is not None else None
+                retryable = status is None or status == 429 or status >= 500
+                if not retryable or attempt == RETRIES - 1:
+                    raise
+                hinted = _retry_after(resp)
+                wait = hinted if hinted is not None else _backoff(attempt)
+                if status == 429:
+                    await self.bucket.penalize(wait)  # 모든 워커 공용 쿨다운
+                if hinted is not None:
+                    wait += random.uniform(0, 0.1 * wait + 0.05)
+                left = deadline.remaining()
+                if left is not None and wait >= left:
+                    raise deadline.DeadlineExceeded(
+                        f"Kakao 재시도 대기 {wait:.2f}s > 남은 예산 {left:.2f}s"
+                    ) from e
+                logger.warning(
+                    f"[Kakao] {status or 'timeout'} 재시도 {attempt+1}/{RETRIES}"
+                    f" … {e}. {wait:.2f}s 대기"
+                )
+                await asyncio.sleep(wait)
+
+    async def _fetch(
+        self, lat: float, lon: float, radius_m: int, headers: dict, priority: str
+    ) -> List[Dict]:
+        """1페이지 후 나머지 페이지 동시 요청 (실패 시 예외)"""
+        await self.open()
+        first = await self._get_page(lat, lon, radius_m, 1, headers, priority)
+        docs: List[Dict] = list(first.get("documents") or [])
+        meta = first.get("meta") or {}
+        if not docs or meta.get("is_end"):
+            return docs
+
+        total = meta.get("pageable_count") or MAX_PAGES * PAGE_SIZE
+        pages = min(MAX_PAGES, math.ceil(total / PAGE_SIZE))
+        rest = await asyncio.gather(
+            *(
+                self._get_page(lat, lon, radius_m, p, headers, priority)
+                for p in range(2, pages + 1)
             )
-            import asyncio
+        )
+        for data in rest:  # 페이지 순서 유지 (거리순)
+            docs.extend(data.get("documents") or [])
+        return docs
+
+    async def _guarded_fetch(
+        self, lat: float, lon: float, radius_m: int, headers: dict, priority: str
+    ) -> List[Dict]:
+        """서킷 브레이커 경유 호출 (상류 실패/지연만 실패로 기록)"""
+        left = deadline.remaining()
+        if left is not None and left < settings.KAKAO_MIN_BUDGET_S:
+            raise deadline.DeadlineExceeded(f"남은 예산 {left:.2f}s — Kakao 호출 생략")
+        if not self.breaker.allow():
+            raise CircuitOpen("Kakao 서킷 open")
+        try:
+            docs = await self._fetch(lat, lon, radius_m, headers, priority)
+        except (httpx.HTTPError, deadline.DeadlineExceeded):
+            self.breaker.record_failure()
+            raise
+        except BaseException:
+            self.breaker.release()  # 쿼터/취소 등 상류와 무관한 중단
+            raise
+        self.breaker.record_success()
+        return docs
+
+    async def search_cafes(
+        self,
+        lat: float,
+        lon: float,
+        radius_m: int = 2000,
+        *,
+        priority: str = "interactive",
+    ) -> List[Dict]:
+        """
+        반경 내 카페 문서 (거리순, 최대 MAX_PAGES 페이지).
+        검색 중심은 양자화된 격자점 (같은 칸의 요청은 같은 결과를 공유).
+        priority="background"는 사전 수집용 (토큰/쿼터 일부를 분석 요청에 양보).
+        실패 시 만료 캐시 또는 [] + 요청 스코프에 degraded 표시.
+        """
+        try:
+            headers = _auth_headers()
+        except RuntimeError as e:
+            logger.warning(f"[Kakao] {e}")
+            return []
 
-            await asyncio.sleep(wait)
+        qlat, qlon = quantize(lat, lon, settings.KAKAO_CACHE_GRID_M)
+        key = (qlat, qlon, int(radius_m))
+        try:
+            return await self.cache.get_or_load(
+                key, lambda: self._guarded_fetch(*key, headers, priority)
+            )
+        except CircuitOpen:
+            reason = "kakao_circuit_open"
+        except deadline.DeadlineExceeded as e:
+            logger.warning(f"[Kakao] {e}")
+            reason = "kakao_deadline"
+        except RateLimitExceeded as e:
+            logger.warning(f"[Kakao] {e}")
+            reason = "kakao_rate_limited"
         except httpx.HTTPError as e:
             logger.error(f"[Kakao] HTTPError: {e}")
-            break
+            reason = "kakao_error"
         except Exception as e:
             logger.error(f"[Kakao] 기타 오류: {e}")
-            break
+            reason = "kakao_error"
+
+        stale = self.cache.get_stale(key)
+        deadline.mark_degraded(reason if stale is None else f"{reason}:stale_cache")
+        # 폴백: 만료 캐시 또는 빈 리스트(상위 라우터가 DB데이터만 사용)
+        return stale if stale is not None else []
+
+
+kakao_client = KakaoClient()
+
 
-    # 모든 시도 실패 -> 폴백: 빈 리스트(상위 라우터가 DB데이터만 사용)
-    return []
+async def get_nearby_cafes(
+    lat: float, lon: float, radius_m: int = 2000, *, priority: str = "interactive"
+) -> List[Dict]:
+    """카카오 장소 검색(카페 CE7). 앱 공유 클라이언트 사용"""
+    return await kakao_client.search_cafes(lat, lon, radius_m, priority=priority)
@@ -0,0 +1,267 @@
+# app/services/place_index.py
+# -----------------------------------------------------------------------------
+# Place 좌표 인메모리 공간 인덱스 (haversine BallTree)
+# - 기동 시 (id, lat, lon, foot_traffic, category) 경량 스냅샷 → NumPy 배열 → BallTree
+#   (카테고리는 정수 코드 열 + 코드→이름 목록, 증분 추가 시 새 이름만 코드 발급)
+# - 적재/Kakao 업서트는 커밋 이벤트("places")로 증분 반영
+#   · 신규 좌표는 delta 버퍼에 쌓아 벡터화 brute-force로 함께 조회
+#   · delta가 임계치를 넘으면 BallTree 재구축
+#   · 기존 id의 유동인구 갱신은 ft 배열에 제자리 반영
+# - 반경/최근접 k 조회가 SQLite를 거치지 않음 (마이크로초 단위)
+# - query_radius_many: 지점 N개 일괄 반경 조회 → 평탄화(CSR식) 이웃 목록
+# - 다중 워커: 다른 워커의 쓰기는 refresh_if_stale()가 주기적으로 흡수
+# -----------------------------------------------------------------------------
+from __future__ import annotations
+
+import time
+
+import numpy as np
+from sklearn.neighbors import BallTree
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.geo import EARTH_RADIUS_M
+from app.db import crud, events
+
+_DELTA_CHUNK = 512  # query_radius_many에서 delta와 한 번에 비교할 지점 수
+
+
+def _haversine_rad(lat0, lon0, rad: np.ndarray) -> np.ndarray:
+    """(lat0, lon0)[rad] → rad[:, (lat, lon)] 중심각(rad). lat0/lon0가 (N, 1)이면 (N, M)"""
+    dlat = rad[:, 0] - lat0
+    dlon = rad[:, 1] - lon0
+    a = np.sin(dlat / 2) ** 2 + np.cos(lat0) * np.cos(rad[:, 0]) * np.sin(dlon / 2) ** 2
+    return 2 * np.arcsin(np.sqrt(np.clip(a, 0.0, 1.0)))
+
+
+def _columns(rows: list[tuple]) -> tuple:
+    """get_place_coords 행 → (ids, lats, lons, foot_traffic, categories)"""
+    if not rows:
+        return [], [], [], [], []
+    return tuple(zip(*rows))
+
+
+def _foot_traffic(values, n: int) -> np.ndarray:
+    """유동인구 열 → float64 (None은 NaN)"""
+    if values is None:
+        return np.full(n, np.nan)
+    return np.array(values, dtype=np.float64).reshape(n)
+
+
+class PlaceIndex:
+    """
+    ids[i] ↔ rad[i] = (lat, lon)[radian] ↔ ft[i] = 유동인구 (없으면 0)
+    ↔ cat[i] = 카테고리 코드 (categories[cat[i]], 0 = 없음)
+    앞쪽 n_tree개는 BallTree, 나머지는 delta(미색인) 구간.
+    조회 결과는 (ids, 거리 m)를 거리 오름차순으로 반환.
+    """
+
+    def __init__(self, rebuild_threshold: int = 2048, leaf_size: int = 40):
+        self.rebuild_threshold = rebuild_threshold
+        self.leaf_size = leaf_size
+        self.ids = np.empty(0, dtype=np.int64)
+        self.rad = np.empty((0, 2), dtype=np.float64)
+        self.ft = np.empty(0, dtype=np.float64)
+        self.cat = np.empty(0, dtype=np.int32)
+        self.categories: list[str] = [""]
+        self._cat_code: dict[str, int] = {"": 0}
+        self._tree: BallTree | None = None
+        self._n_tree = 0
+        self._row: dict[int, int] = {}  # id → 행
+        self.ready = False
+        self.max_id = 0
+        self._checked_at = 0.0
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    # ── 구축/증분 ────────────────────────────────────────────────────────────
+    def _encode(self, categories, n: int) -> np.ndarray:
+        """카테고리 이름 → 코드 (처음 보는 이름은 새 코드, None은 0)"""
+        if categories is None:
+            return np.zeros(n, dtype=np.int32)
+        out = np.empty(n, dtype=np.int32)
+        for i, name in enumerate(categories):
+            name = name or ""
+            code = self._cat_code.get(name)
+            if code is None:
+                code = self._cat_code[name] = len(self.categories)
+                self.categories.append(name)
+            out[i] = code
+        return out
+
+    def build(self, ids, lats, lons, foot_traffic=None, categories=None) -> None:
+        self.ids = np.asarray(ids, dtype=np.int64)
+        self.rad = np.radians(
+            np.column_stack([lats, lons]).astype(np.float64).reshape(-1, 2)
+        )
+        self.ft = np.nan_to_num(_foot_traffic(foot_traffic, len(self.ids)))
+        self.cat = self._encode(categories, len(self.ids))
+        self._row = dict(zip(self.ids.tolist(), range(len(self.ids))))
+        self.max_id = int(self.ids.max()) if len(self.ids) else 0
+        self._rebuild()
+        self.ready = True
+
+    def add(self, ids, lats, lons, foot_traffic=None, categories=None) -> int:
+        """
+        신규 id는 delta에 추가, 이미 있는 id는 유동인구/카테고리만 갱신
+        (좌표는 자연키라 불변, None은 기존 값 유지).
+        """
+        ids = np.asarray(ids, dtype=np.int64)
+        if not len(ids):
+            return 0
+        ft = _foot_traffic(foot_traffic, len(ids))
+        cat = self._encode(categories, len(ids))
+        rows = np.fromiter((self._row.get(i, -1) for i in ids.tolist()), np.int64)
+        new = rows < 0
+        upd = ~new & ~np.isnan(ft)
+        self.ft[rows[upd]] = ft[upd]
+        if categories is not None:
+            has = np.fromiter((c is not None for c in categories), bool, len(ids))
+            self.cat[rows[~new & has]] = cat[~new & has]
+        if not new.any():
+            return 0
+        ids = ids[new]
+        rad = np.radians(
+            np.column_stack([np.asarray(lats)[new], np.asarray(lons)[new]]).astype(
+                np.float64
+            )
+        )
+        start = len(self.ids)
+        self.ids = np.concatenate([self.ids, ids])
+        self.rad = np.vstack([self.rad, rad])
+        self.ft = np.concatenate([self.ft, np.nan_to_num(ft[new])])
+        self.cat = np.concatenate([self.cat, cat[new]])
+        self._row.update(zip(ids.tolist(), range(start, len(self.ids))))
+        self.max_id = max(self.max_id, int(ids.max()))
+        if len(self.ids) - self._n_tree >= self.rebuild_threshold:
+            self._rebuild()
+        return int(new.sum())
+
+    def _rebuild(self) -> None:
+        self._n_tree = len(self.ids)
+        self._tree = (
+            BallTree(self.rad, metric="haversine", leaf_size=self.leaf_size)
+            if self._n_tree
+            else None
+        )
+
+    # ── 조회 ────────────────────────────────────────────────────────────────
+    def _delta(self, lat0: float, lon0: float) -> tuple[np.ndarray, np.ndarray]:
+        rows = np.arange(self._n_tree, len(self.ids))
+        return rows, _haversine_rad(lat0, lon0, self.rad[self._n_tree :])
+
+    def query_radius(
+        self, lat: float, lon: float, radius_m: float
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """반경 radius_m 내 (ids, 거리 m), 거리 오름차순"""
+        lat0, lon0 = np.radians(lat), np.radians(lon)
+        r = radius_m / EARTH_RADIUS_M
+        rows_parts, dist_parts = [], []
+        if self._tree is not None:
+            ind, dist = self._tree.query_radius(
+                [[lat0, lon0]], r=r, return_distance=True
+            )
+            rows_parts.append(ind[0])
+            dist_parts.append(dist[0])
+        d_rows, d_dist = self._delta(lat0, lon0)
+        hit = d_dist <= r
+        rows_parts.append(d_rows[hit])
+        dist_parts.append(d_dist[hit])
+
+        rows = np.concatenate(rows_parts).astype(np.int64)
+        dist = np.concatenate(dist_parts)
+        order = np.argsort(dist, kind="stable")
+        return self.ids[rows[order]], dist[order] * EARTH_RADIUS_M
+
+    def query_knn(
+        self, lat: float, lon: float, k: int
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """최근접 k개 (ids, 거리 m), 거리 오름차순"""
+        lat0, lon0 = np.radians(lat), np.radians(lon)
+        rows_parts, dist_parts = [], []
+        if self._tree is not None:
+            dist, ind = self._tree.query([[lat0, lon0]], k=min(k, self._n_tree))
+            rows_parts.append(ind[0])
+            dist_parts.append(dist[0])
+        d_rows, d_dist = self._delta(lat0, lon0)
+        rows_parts.append(d_rows)
+        dist_parts.append(d_dist)
+
+        rows = np.concatenate(rows_parts).astype(np.int64)
+        dist = np.concatenate(dist_parts)
+        order = np.argsort(dist, kind="stable")[:k]
+        return self.ids[rows[order]], dist[order] * EARTH_RADIUS_M
+
+    def query_radius_many(
+        self, lats, lons, radius_m: float
+    ) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        지점 N개 각각의 반경 radius_m 내 이웃을 평탄화해 반환 (정렬 없음).
+        (site, rows, 거리 m): site[k]번 지점의 이웃 행 rows[k]
+        → ids[rows] / ft[rows]로 속성 조회, np.bincount(site, ...)로 지점별 합.
+        """
+        lat0 = np.radians(np.atleast_1d(np.asarray(lats, dtype=np.float64)))
+        lon0 = np.radians(np.atleast_1d(np.asarray(lons, dtype=np.float64)))
+        r = radius_m / EARTH_RADIUS_M
+        site_parts, rows_parts, dist_parts = [], [], []
+        if self._tree is not None and len(lat0):
+            ind, dist = self._tree.query_radius(
+                np.column_stack([lat0, lon0]), r=r, return_distance=True
+            )
+            counts = np.fromiter(map(len, ind), np.int64, len(ind))
+            site_parts.append(np.repeat(np.arange(len(ind)), counts))
+            rows_parts.append(np.concatenate(ind).astype(np.int64))
+            dist_parts.append(np.concatenate(dist))
+
+        delta = self.rad[self._n_tree :]
+        if len(delta):
+            for i in range(0, len(lat0), _DELTA_CHUNK):
+                d = _haversine_rad(
+                    lat0[i : i + _DELTA_CHUNK, None],
+                    lon0[i : i + _DELTA_CHUNK, None],
+                    delta,
+                )
+                s, j = np.nonzero(d <= r)
+                site_parts.append(s + i)
+                rows_parts.append(j + self._n_tree)
+                dist_parts.append(d[s, j])
+
+        if not site_parts:
+            empty = np.empty(0, dtype=np.int64)
+            return empty, empty, np.empty(0, dtype=np.float64)
+        return (
+            np.concatenate(site_parts).astype(np.int64),
+            np.concatenate(rows_parts).astype(np.int64),
+            np.concatenate(dist_parts) * EARTH_RADIUS_M,
+        )
+
+    # ── DB 동기화 ────────────────────────────────────────────────────────────
+    async def load(self, db: AsyncSession) -> None:
+        self.build(*_columns(await crud.get_place_coords(db)))
+        self._checked_at = time.monotonic()
+
+    async def refresh_if_stale(self, db: AsyncSession) -> None:
+        """다른 워커가 추가한 행 흡수 (PLACE_INDEX_REFRESH_S마다 id > max_id만)"""
+        now = time.monotonic()
+        if now - self._checked_at < settings.PLACE_INDEX_REFRESH_S:
+            return
+        self._checked_at = now
+        rows = await crud.get_place_coords(db, after_id=self.max_id)
+        if rows:
+            self.add(*_columns(rows))
+
+    def on_places_written(self, rows: list[dict]) -> None:
+        if not self.ready or not rows:
+            return
+        self.add(
+            [r["id"] for r in rows],
+            [r["lat"] for r in rows],
+            [r["lon"] for r in rows],
+            [r.get("foot_traffic") for r in rows],
+            [r.get("category") for r in rows],
+        )
+
+
+place_index = PlaceIndex()
+events.subscribe("places", place_index.on_places_written)
@@ -0,0 +1,106 @@
+# benchmarks/bench_feature_engine.py
+# -----------------------------------------------------------------------------
+# 지점 피처 계산: 스칼라 함수 vs 컬럼형 엔진 (app/services/feature_engine.py)
+# - scalar: 지점마다 반경 내 Place 객체 목록 → features.flow_score /
+#           features.competition_density (카테고리 문자열 비교)
+#           (반경 필터는 NumPy로 해 줘서 피처 계산 자체만 비교)
+# - engine: FeatureEngine.compute (BallTree 일괄 질의 + 정수 코드 + bincount)
+# - 두 결과가 같은지 확인 후 지점 수별 시간 출력
+# 실행: python -m benchmarks.bench_feature_engine --places 20000 --sites 100 1000
+# -----------------------------------------------------------------------------
+from __future__ import annotations
+
+import argparse
+import time
+
+import numpy as np
+
+from app.core import geo
+from app.db.models import Place
+from app.services import features
+from app.services.feature_engine import FeatureEngine, PlaceColumns
+
+CENTER = (35.8427, 128.627)
+CATEGORIES = ["카페", "카페 > 프랜차이즈", "음식점 > 한식", "편의점", "베이커리"]
+TARGET = "카페"
+
+
+def _synthetic_places(n: int, rng: np.random.Generator) -> list[Place]:
+    lat0, lon0 = CENTER
+    lats = rng.normal(lat0, 0.02, n)
+    lons = rng.normal(lon0, 0.025, n)
+    cats = rng.choice(len(CATEGORIES), n)
+    ft = np.where(rng.random(n) < 0.6, rng.integers(1_000, 40_000, n), 0)
+    return [
+        Place(
+            name=f"p{i}",
+            lat=float(lats[i]),
+            lon=float(lons[i]),
+            category=CATEGORIES[cats[i]],
+            foot_traffic=int(ft[i]) or None,
+        )
+        for i in range(n)
+    ]
+
+
+def _scalar(
+    places: list[Place], lats, lons, site_lats, site_lons, radius_m: float
+) -> tuple[np.ndarray, np.ndarray]:
+    flow, density = [], []
+    for la, lo in zip(site_lats.tolist(), site_lons.tolist()):
+        idx, _ = geo.within_radius(la, lo, lats, lons, radius_m)
+        near = [places[i] for i in idx.tolist()]
+        ft = [p.foot_traffic for p in near if (p.foot_traffic or 0) > 0]
+        avg = sum(ft) / len(ft) if ft else 0.0
+        flow.append(features.flow_score(len(near), 0, avg))
+        density.append(features.competition_density(near, TARGET))
+    return np.array(flow), np.array(density)
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--places", type=int, default=20_000)
+    ap.add_argument("--sites", type=int, nargs="+", default=[100, 1000])
+    ap.add_argument("--radius", type=float, default=500.0)
+    args = ap.parse_args()
+    rng = np.random.default_rng(7)
+
+    places = _synthetic_places(args.places, rng)
+    lats = np.array([p.lat for p in places])
+    lons = np.array([p.lon for p in places])
+
+    t0 = time.perf_counter()
+    engine = FeatureEngine(PlaceColumns.from_places(places))
+    t_build = time.perf_counter() - t0
+    print(f"장소 {args.places:,}건 → 열 인코딩 + BallTree {t_build * 1000:.1f} ms")
+
+    for n in args.sites:
+        site_lats = rng.normal(CENTER[0], 0.015, n)
+        site_lons = rng.normal(CENTER[1], 0.02, n)
+
+        t0 = time.perf_counter()
+        ref_flow, ref_density = _scalar(
+            places, lats, lons, site_lats, site_lons, args.radius
+        )
+        t_scalar = time.perf_counter() - t0
+
+        t0 = time.perf_counter()
+        out = engine.compute(
+            site_lats,
+            site_lons,
+            args.radius,
+            ("flow_score", "competition_density"),
+            category=TARGET,
+        )
+        t_engine = time.perf_counter() - t0
+
+        assert np.allclose(out["flow_score"], ref_flow, atol=1e-3)
+        assert np.allclose(out["competition_density"], ref_density)
+        print(
+            f"{n:>6,} sites: scalar {t_scalar * 1000:9.1f} ms  "
+            f"engine {t_engine * 1000:8.2f} ms  x{t_scalar / t_engine:6.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+# benchmarks/bench_forecast_incremental.py
+# -----------------------------------------------------------------------------
+# 매월 한 달씩 늘어나는 매장 시계열: cold 재적합 vs 증분 적합 (forecast_state)
+# - cold       : 매월 기본 시작값으로 SARIMAX 최적화 (기존 동작)
+# - incremental: decide()/advance() 규칙 그대로 — append(파라미터 고정, 최적화 없음)
+#                → FORECAST_REFIT_EVERY 개월마다 warm(이전 파라미터에서 최적화)
+# - 월별 SARIMAX 적합 시간/반복 수 + 전체 fit_forecast 시간,
+#   cold 대비 예측 평균 최대 상대 차이
+# 실행: python -m benchmarks.bench_forecast_incremental --history 36 --updates 12
+# -----------------------------------------------------------------------------
+from __future__ import annotations
+
+import argparse
+import time
+import warnings
+
+import numpy as np
+import pandas as pd
+
+from app.services import forecast_state
+from app.services.forecast import FitInputs, fit_forecast
+
+STORE = "bench-store"
+
+
+def _series(n: int, seed: int) -> tuple[tuple[str, ...], tuple[float, ...]]:
+    rng = np.random.default_rng(seed)
+    months = pd.period_range("2020-01", periods=n, freq="M")
+    season = 1 + 0.08 * np.sin(2 * np.pi * (months.month.values - 1) / 12)
+    trend = np.arange(n) * 40_000
+    sales = 22_000_000 * season + trend + rng.normal(0, 600_000, n)
+    return tuple(str(m) for m in months), tuple(float(v) for v in sales.round())
+
+
+def _timed(inp: FitInputs):
+    t0 = time.perf_counter()
+    fitted = fit_forecast(inp)
+    return fitted, time.perf_counter() - t0
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--history", type=int, default=36)
+    ap.add_argument("--updates", type=int, default=12)
+    ap.add_argument("--horizon", type=int, default=12)
+    ap.add_argument("--base", type=int, default=12_000, help="exog 기준값 (0=없음)")
+    ap.add_argument("--seed", type=int, default=5)
+    args = ap.parse_args()
+    warnings.simplefilter("ignore")
+
+    months, sales = _series(args.history + args.updates, args.seed)
+    base = args.base or None
+
+    def inputs(n: int) -> FitInputs:
+        return FitInputs(months[:n], sales[:n], args.horizon, base, seed=args.seed)
+
+    # 초기 cold 적합으로 상태 생성
+    first = inputs(args.history)
+    fitted, _ = _timed(first)
+    model_fp = first.model_fingerprint()
+    state = forecast_state.advance(
+        None,
+        STORE,
+        first.months,
+        first.sales,
+        model_fp,
+        fitted.params,
+        fitted.fit_mode,
+        fitted.iterations,
+    )
+
+    print(
+        f"{'':>12}{'── cold ──':>22}{'── incremental ──':>26}\n"
+        f"{'n':>4} {'mode':>7} {'sarimax':>9} {'total':>8} {'it':>4} "
+        f"{'sarimax':>9} {'total':>8} {'it':>4}  diff"
+    )
+    tot = {"cold": 0.0, "inc": 0.0, "cold_s": 0.0, "inc_s": 0.0}
+    it_cold = it_inc = 0
+    for n in range(args.history + 1, args.history + args.updates + 1):
+        cold_inp = inputs(n)
+        cold, t_cold = _timed(cold_inp)
+
+        inc_inp = inputs(n)
+        mode = forecast_state.decide(state, inc_inp.months, inc_inp.sales, model_fp)
+        if mode in ("append", "warm"):
+            inc_inp.start_params = tuple(state.params)
+            inc_inp.refit = mode == "warm"
+        inc, t_inc = _timed(inc_inp)
+        state = forecast_state.advance(
+            state,
+            STORE,
+            inc_inp.months,
+            inc_inp.sales,
+            model_fp,
+            inc.params,
+            inc.fit_mode,
+            inc.iterations,
+        )
+
+        diff = float(np.max(np.abs(inc.mean - cold.mean)) / np.mean(cold.mean))
+        tot["cold"] += t_cold
+        tot["inc"] += t_inc
+        tot["cold_s"] += cold.sarimax_s
+        tot["inc_s"] += inc.sarimax_s
+        it_cold += cold.iterations
+        it_inc += inc.iterations
+        print(
+            f"{n:>4} {inc.fit_mode:>7} "
+            f"{cold.sarimax_s * 1000:7.1f}ms {t_cold * 1000:6.0f}ms {cold.iterations:>4} "
+            f"{inc.sarimax_s * 1000:7.1f}ms {t_inc * 1000:6.0f}ms {inc.iterations:>4}  "
+            f"{diff:6.2%}"
+        )
+
+    print(
+        f"SARIMAX 합계: cold {tot['cold_s'] * 1000:.0f} ms / {it_cold}회 반복, "
+        f"incremental {tot['inc_s'] * 1000:.0f} ms / {it_inc}회 반복 "
+        f"(반복 {it_cold - it_inc}회 절약, x{tot['cold_s'] / tot['inc_s']:.1f})"
+    )
+    print(
+        f"fit_forecast 전체(RF 포함): cold {tot['cold'] * 1000:.0f} ms, "
+        f"incremental {tot['inc'] * 1000:.0f} ms"
+    )
+
+
+if __name__ == "__main__":
+    main()
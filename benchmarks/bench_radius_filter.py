@@ -0,0 +1,77 @@
+# benchmarks/bench_radius_filter.py
+# -----------------------------------------------------------------------------
+# 반경 필터 비교 (대구 위도 기준)
+# - 정확도: 기존 111km/deg 정사각 상자 vs 실반경(haversine) 포함 개수
+# - 속도  : 후보 N개에 대해 객체 단위 Python 루프 vs NumPy 벡터화(geo.within_radius)
+# 실행: python -m benchmarks.bench_radius_filter --candidates 10000 100000 1000000
+# -----------------------------------------------------------------------------
+from __future__ import annotations
+
+import argparse
+import math
+import time
+
+import numpy as np
+
+from app.core import geo
+
+CENTER = (35.8427, 128.627)
+
+
+def _loop_filter(lat0, lon0, lats, lons, radius_m):
+    out = []
+    for i, (la, lo) in enumerate(zip(lats, lons)):
+        p0, p1 = math.radians(lat0), math.radians(la)
+        a = (
+            math.sin((p1 - p0) / 2) ** 2
+            + math.cos(p0) * math.cos(p1) * math.sin(math.radians(lo - lon0) / 2) ** 2
+        )
+        d = 2 * geo.EARTH_RADIUS_M * math.asin(math.sqrt(a))
+        if d <= radius_m:
+            out.append((d, i))
+    out.sort()
+    return out
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--candidates", type=int, nargs="+", default=[10_000, 100_000])
+    ap.add_argument("--radius", type=float, default=2000.0)
+    args = ap.parse_args()
+    lat0, lon0 = CENTER
+    rng = np.random.default_rng(3)
+
+    # 정확도: 기존 상자(111km/deg, 양축 동일) 안의 균일 분포 점
+    deg = args.radius / 1000 / 111.0
+    lats = rng.uniform(lat0 - deg, lat0 + deg, 200_000)
+    lons = rng.uniform(lon0 - deg, lon0 + deg, 200_000)
+    idx, _ = geo.within_radius(lat0, lon0, lats, lons, args.radius)
+    print(
+        f"111km/deg 상자 {len(lats):,}개 중 실반경 {args.radius:.0f}m 내 {len(idx):,}개 "
+        f"→ 상자 방식 과대계상 x{len(lats) / len(idx):.2f}"
+    )
+
+    for n in args.candidates:
+        # SQL 선필터 결과를 흉내낸 후보 집합 (축별 델타 상자)
+        min_lat, min_lon, max_lat, max_lon = geo.bounding_box(lat0, lon0, args.radius)
+        lats = rng.uniform(min_lat, max_lat, n)
+        lons = rng.uniform(min_lon, max_lon, n)
+
+        t0 = time.perf_counter()
+        ref = _loop_filter(lat0, lon0, lats.tolist(), lons.tolist(), args.radius)
+        t_loop = time.perf_counter() - t0
+
+        t0 = time.perf_counter()
+        idx, dist = geo.within_radius(lat0, lon0, lats, lons, args.radius)
+        t_vec = time.perf_counter() - t0
+
+        assert len(ref) == len(idx)
+        print(
+            f"{n:>9,} candidates → {len(idx):>8,} in radius: "
+            f"loop {t_loop * 1000:9.1f} ms  numpy {t_vec * 1000:8.2f} ms  "
+            f"x{t_loop / t_vec:6.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
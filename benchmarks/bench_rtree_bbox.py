@@ -0,0 +1,99 @@
+# benchmarks/bench_rtree_bbox.py
+# -----------------------------------------------------------------------------
+# bbox 조회 지연시간: B-tree BETWEEN vs R*Tree (app/db/spatial.py)
+# - 합성 Place N건(수성구 범위)을 적재 후 같은 crud 함수로 비교
+# 실행: python -m benchmarks.bench_rtree_bbox --places 100000 1000000
+# -----------------------------------------------------------------------------
+from __future__ import annotations
+
+import argparse
+import asyncio
+import random
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+from sqlalchemy import func, insert, select
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from app.db import crud, spatial
+from app.db.models import Place
+from app.db.session import Base
+
+# (라벨, 반경 deg) — 약 50m / 500m / 2km 박스
+BOXES = [("~50m", 0.0005), ("~500m", 0.0045), ("~2km", 0.018)]
+
+
+async def _seed(engine, n: int, seed: int = 7) -> None:
+    rng = random.Random(seed)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+        await spatial.ensure_rtree(conn)
+        batch = 50_000
+        for i in range(0, n, batch):
+            rows = [
+                {
+                    "name": f"p{j}",
+                    "category": "카페",
+                    "lat": rng.uniform(35.80, 35.88),
+                    "lon": rng.uniform(128.58, 128.70),
+                    "foot_traffic": rng.randint(0, 50_000),
+                }
+                for j in range(i, min(n, i + batch))
+            ]
+            await conn.execute(insert(Place), rows)
+        await conn.exec_driver_sql("ANALYZE")
+
+
+async def _time_queries(Session, d: float, reps: int, orm: bool) -> tuple[float, int]:
+    """orm=True: crud.get_places_bbox(행 로드), False: bbox COUNT(순수 인덱스 비용)"""
+    rng = random.Random(11)
+    lat_s: list[float] = []
+    found = 0
+    async with Session() as db:
+        for _ in range(reps):
+            lat = rng.uniform(35.81, 35.87)
+            lon = rng.uniform(128.59, 128.69)
+            box = (lat - d, lon - d, lat + d, lon + d)
+            t0 = time.perf_counter()
+            if orm:
+                found += len(await crud.get_places_bbox(db, *box))
+                db.expunge_all()
+            else:
+                stmt = select(func.count()).where(*spatial.bbox_filter(Place, *box))
+                found += (await db.execute(stmt)).scalar_one()
+            lat_s.append(time.perf_counter() - t0)
+    return statistics.median(lat_s) * 1000, found // reps
+
+
+async def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--places", type=int, nargs="+", default=[100_000, 1_000_000])
+    ap.add_argument("--reps", type=int, default=30)
+    args = ap.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for n in args.places:
+            engine = create_async_engine(f"sqlite+aiosqlite:///{Path(tmp) / f'{n}.db'}")
+            t0 = time.perf_counter()
+            await _seed(engine, n)
+            print(f"--- {n:,} places (seed {time.perf_counter() - t0:.1f}s)")
+            Session = async_sessionmaker(engine, expire_on_commit=False)
+
+            for orm in (False, True):
+                for label, d in BOXES:
+                    spatial._enabled.discard("places")
+                    ms_bt, k = await _time_queries(Session, d, args.reps, orm)
+                    spatial._enabled.add("places")
+                    ms_rt, _ = await _time_queries(Session, d, args.reps, orm)
+                    print(
+                        f"{'rows ' if orm else 'count'} {label:>6} (~{k:>6}): "
+                        f"btree {ms_bt:8.2f} ms  rtree {ms_rt:8.2f} ms  "
+                        f"x{ms_bt / ms_rt:5.1f}"
+                    )
+            await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,75 @@
+# benchmarks/bench_suseong_fetch.py
+# -----------------------------------------------------------------------------
+# 수성구 페이지 수집 파이프라인 처리량 (로컬 대역 서버 사용, 네트워크 불필요)
+# - concurrency=1 : 페이지 순차 요청
+# - concurrency=N : 동시 요청 + 생산자/소비자 큐로 DB 쓰기 중첩
+# 실행: python -m benchmarks.bench_suseong_fetch --quarters 4 --latency 0.3
+# -----------------------------------------------------------------------------
+from __future__ import annotations
+
+import argparse
+import asyncio
+import tempfile
+import time
+from pathlib import Path
+
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from app.core.config import settings
+from app.db import models  # noqa: F401  (메타데이터 등록)
+from app.db.session import Base
+from app.services.ingest import ingest_suseong_foot_traffic, suseong_client
+from benchmarks.suseong_stub import start_stub
+
+
+async def _run(concurrency: int, args, workdir: Path) -> None:
+    engine = create_async_engine(f"sqlite+aiosqlite:///{workdir / f'c{concurrency}.db'}")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    Session = async_sessionmaker(engine, expire_on_commit=False)
+
+    rows = 0
+    t0 = time.perf_counter()
+    async with Session() as db, suseong_client(concurrency) as client:
+        for q in range(1, args.quarters + 1):
+            res = await ingest_suseong_foot_traffic(
+                db,
+                year=2024 + (q - 1) // 4,
+                quarter=(q - 1) % 4 + 1,
+                pages=args.pages,
+                page_size=args.page_size,
+                client=client,
+                concurrency=concurrency,
+            )
+            rows += res["ingested"]
+    dt = time.perf_counter() - t0
+    print(
+        f"concurrency={concurrency:>2}: {rows:>6} rows {dt:7.2f}s "
+        f"{rows / dt:8.0f} rows/s"
+    )
+    await engine.dispose()
+
+
+async def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--quarters", type=int, default=4)
+    ap.add_argument("--pages", type=int, default=10)
+    ap.add_argument("--page-size", type=int, default=200)
+    ap.add_argument("--rows", type=int, default=1800, help="분기당 항목 수")
+    ap.add_argument("--latency", type=float, default=0.3)
+    ap.add_argument("--concurrency", type=int, nargs="+", default=[1, 4, 8])
+    args = ap.parse_args()
+
+    server, url = start_stub(latency=args.latency, rows=args.rows)
+    settings.SUSEONG_API_URL = url
+    settings.SUSEONG_API_KEY = settings.SUSEONG_API_KEY or "stub"
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            for c in args.concurrency:
+                await _run(c, args, Path(tmp))
+    finally:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,93 @@
+# benchmarks/check_forecast_determinism.py
+# -----------------------------------------------------------------------------
+# 결정적 예측 회귀 확인 (app/services/forecast.py)
+# - 같은 입력 → 같은 seed → 같은 응답(JSON 바이트)/ETag
+#   · 현재 프로세스 적합 vs forecast_pool 워커 프로세스 적합도 동일해야 함
+# - seed가 다르면 응답이 달라지고, capex만 바꾸면 매출은 같고 ETag만 달라짐
+# - DB 없이 적합/후처리 함수만 직접 호출 (exog 기준값은 인자로)
+# 실행: python -m benchmarks.check_forecast_determinism --months 36 --horizon 12
+# -----------------------------------------------------------------------------
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import time
+
+import numpy as np
+import pandas as pd
+
+from app.services.forecast import (
+    CostAssumptions,
+    FitInputs,
+    _finalize,
+    fit_forecast,
+    forecast_etag,
+)
+from app.services.forecast_pool import forecast_pool
+
+CAPEX = 80_000_000
+
+
+def _synthetic_inputs(n: int, horizon: int, base: int | None) -> FitInputs:
+    rng = np.random.default_rng(3)
+    months = pd.period_range("2022-01", periods=n, freq="M")
+    season = 1 + 0.08 * np.sin(2 * np.pi * (months.month.values - 1) / 12)
+    sales = 22_000_000 * season + rng.normal(0, 600_000, n)
+    inp = FitInputs(
+        months=tuple(str(m) for m in months),
+        sales=tuple(float(v) for v in sales.round()),
+        horizon=horizon,
+        base_quarter_pop=base,
+    )
+    inp.seed = inp.derived_seed()
+    return inp
+
+
+def _render(inp: FitInputs, fitted, capex: int = CAPEX) -> tuple[str, str]:
+    a = CostAssumptions()
+    out = _finalize(fitted, a, capex, inp.base_quarter_pop, None, inp.seed)
+    return out.model_dump_json(), forecast_etag(inp, a, capex, None)
+
+
+async def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--months", type=int, default=36)
+    ap.add_argument("--horizon", type=int, default=12)
+    args = ap.parse_args()
+
+    await forecast_pool.start()
+    try:
+        for base in (None, 12_000):
+            inp = _synthetic_inputs(args.months, args.horizon, base)
+            t0 = time.perf_counter()
+            body_a, etag_a = _render(inp, fit_forecast(inp))
+            body_b, etag_b = _render(inp, await forecast_pool.run(fit_forecast, inp))
+            elapsed = time.perf_counter() - t0
+            assert body_a == body_b, "같은 입력인데 응답이 다름"
+            assert etag_a == etag_b
+
+            again = _synthetic_inputs(args.months, args.horizon, base)
+            assert again.seed == inp.seed and again.key() == inp.key()
+
+            other = _synthetic_inputs(args.months, args.horizon, base)
+            other.seed = inp.seed + 1
+            body_c, etag_c = _render(other, fit_forecast(other))
+            assert body_c != body_a and etag_c != etag_a, "seed가 결과에 반영되지 않음"
+
+            fitted = fit_forecast(inp)
+            body_d, etag_d = _render(inp, fitted, capex=CAPEX * 2)
+            sales = [f["sales"] for f in json.loads(body_a)["forecast"]]
+            sales_d = [f["sales"] for f in json.loads(body_d)["forecast"]]
+            assert sales == sales_d and etag_d != etag_a
+
+            print(
+                f"exog={base}: seed={inp.seed} etag={etag_a} "
+                f"(2 fits {elapsed * 1000:.0f} ms) OK"
+            )
+    finally:
+        forecast_pool.shutdown()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
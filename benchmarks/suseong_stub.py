@@ -0,0 +1,91 @@
+# benchmarks/suseong_stub.py
+# -----------------------------------------------------------------------------
+# 수성구 유동인구 API 로컬 대역 서버 (오프라인 처리량 측정용)
+# - 응답 구조: {"response": {"body": {"items": {"item": [...]}}}}
+# - 분기당 rows개 항목을 page/size로 잘라 반환, 범위를 넘으면 빈 페이지
+# - latency: 요청당 인위적 지연(초) — 실제 공공데이터 API 대기시간 흉내
+# 실행: python -m benchmarks.suseong_stub --port 8765 --latency 0.3 --rows 1800
+# -----------------------------------------------------------------------------
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+
+def _make_handler(latency: float, rows: int):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"  # keep-alive
+
+        def do_GET(self):  # noqa: N802
+            q = parse_qs(urlparse(self.path).query)
+            year = int(q.get("startYear", ["2025"])[0])
+            quarter = int(q.get("startBungi", ["1"])[0])
+            page = int(q.get("page", ["1"])[0])
+            size = int(q.get("size", ["100"])[0])
+
+            time.sleep(latency)
+
+            # (연, 분기)마다 고정된 좌표/값 — 재실행 시 같은 데이터
+            rng = random.Random(year * 10 + quarter)
+            points = [
+                (round(rng.uniform(35.80, 35.88), 6), round(rng.uniform(128.58, 128.70), 6))
+                for _ in range(rows)
+            ]
+            lo, hi = (page - 1) * size, min(page * size, rows)
+            items = [
+                {
+                    "marketNm": f"상권{i}",
+                    "lat": points[i][0],
+                    "lon": points[i][1],
+                    "popuCnt": rng.randint(1_000, 80_000),
+                }
+                for i in range(lo, hi)
+            ]
+            body = json.dumps(
+                {"response": {"body": {"items": {"item": items}}}}
+            ).encode()
+            try:
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+            except (BrokenPipeError, ConnectionResetError):
+                pass  # 클라이언트가 선행 요청을 취소한 경우
+
+        def log_message(self, *args):  # 요청 로그 생략
+            pass
+
+    return Handler
+
+
+def start_stub(
+    host: str = "127.0.0.1", port: int = 0, *, latency: float = 0.3, rows: int = 1800
+) -> tuple[ThreadingHTTPServer, str]:
+    """백그라운드 스레드로 서버 기동 → (server, url). port=0이면 임의 포트"""
+    server = ThreadingHTTPServer((host, port), _make_handler(latency, rows))
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    h, p = server.server_address[:2]
+    return server, f"http://{h}:{p}/viewmarketpopudetail"
+
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--host", default="127.0.0.1")
+    ap.add_argument("--port", type=int, default=8765)
+    ap.add_argument("--latency", type=float, default=0.3)
+    ap.add_argument("--rows", type=int, default=1800)
+    args = ap.parse_args()
+
+    server, url = start_stub(args.host, args.port, latency=args.latency, rows=args.rows)
+    print(f"stub listening: {url}  (SUSEONG_API_URL로 지정)")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
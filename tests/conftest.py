@@ -0,0 +1,8 @@
+# tests/conftest.py
+# -----------------------------------------------------------------------------
+# 저장소 루트를 import 경로에 추가 (pytest를 어디서 실행해도 app.* import)
+# -----------------------------------------------------------------------------
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
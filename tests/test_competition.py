@@ -0,0 +1,41 @@
+# tests/test_competition.py
+# -----------------------------------------------------------------------------
+# 거리감쇠 경쟁 압력 (app/services/competition.py): 카페 행만 경쟁점
+# -----------------------------------------------------------------------------
+import numpy as np
+
+from app.services.competition import DecayConfig, pressure_in_index
+from app.services.place_index import PlaceIndex
+
+SITE = (35.8580, 128.6300)
+CFG = DecayConfig()
+
+
+def _index(rows):
+    """rows: (lat, lon, foot_traffic, category)"""
+    idx = PlaceIndex()
+    lats, lons, ft, cats = zip(*rows)
+    idx.build(np.arange(len(rows)), lats, lons, ft, cats)
+    return idx
+
+
+def _pressure(rows):
+    return pressure_in_index(
+        _index(rows), np.array([SITE[0]]), np.array([SITE[1]]), CFG
+    )
+
+
+def test_non_cafe_point_adds_no_pressure():
+    cafe = (SITE[0] + 0.002, SITE[1], 0, "음식점 > 카페 > 커피전문점")
+    ftq_point = (SITE[0] + 0.001, SITE[1], 90_000, None)  # 유동인구 표본 지점
+    only_cafe = _pressure([cafe])
+    mixed = _pressure([cafe, ftq_point])
+    assert mixed.count[0] == only_cafe.count[0] == 1
+    assert mixed.pressure[0] == only_cafe.pressure[0]
+    assert mixed.nearest_m[0] == only_cafe.nearest_m[0]
+
+
+def test_no_cafes_means_full_share():
+    out = _pressure([(SITE[0] + 0.001, SITE[1], 50_000, "음식점 > 한식")])
+    assert out.count[0] == 0 and out.pressure[0] == 0.0
+    assert out.huff_share[0] == 1.0 and np.isnan(out.nearest_m[0])
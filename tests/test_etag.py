@@ -0,0 +1,32 @@
+# tests/test_etag.py
+# -----------------------------------------------------------------------------
+# If-None-Match 판정 (app/core/etag.py): 목록/와일드카드/약한 비교
+# -----------------------------------------------------------------------------
+import pytest
+
+from app.core.etag import etag_matches
+
+TAG = 'W/"fc-abc"'
+
+
+@pytest.mark.parametrize(
+    "header",
+    [
+        'W/"fc-abc"',
+        '"fc-abc"',
+        "*",
+        ' W/"other", W/"fc-abc" ',
+        '"other","fc-abc"',
+    ],
+)
+def test_matches(header):
+    assert etag_matches(header, TAG)
+
+
+@pytest.mark.parametrize("header", [None, "", 'W/"other"', '"fc-ab"', 'W/"fc-abc-x"'])
+def test_no_match(header):
+    assert not etag_matches(header, TAG)
+
+
+def test_no_etag_never_matches():
+    assert not etag_matches("*", None)
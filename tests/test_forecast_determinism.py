@@ -0,0 +1,60 @@
+# tests/test_forecast_determinism.py
+# -----------------------------------------------------------------------------
+# 결정적 예측: 같은 FitInputs → 같은 응답 JSON/ETag, seed가 다르면 다른 응답
+# (DB/프로세스 풀 없이 적합/후처리 함수만 직접 호출)
+# -----------------------------------------------------------------------------
+import warnings
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.services.forecast import (
+    CostAssumptions,
+    FitInputs,
+    _finalize,
+    fit_forecast,
+    forecast_etag,
+)
+
+CAPEX = 80_000_000
+
+
+def _inputs(base: int | None, seed: int | None = None) -> FitInputs:
+    rng = np.random.default_rng(3)
+    months = pd.period_range("2022-01", periods=30, freq="M")
+    season = 1 + 0.08 * np.sin(2 * np.pi * (months.month.values - 1) / 12)
+    sales = 22_000_000 * season + rng.normal(0, 600_000, len(months))
+    inp = FitInputs(
+        months=tuple(str(m) for m in months),
+        sales=tuple(float(v) for v in sales.round()),
+        horizon=6,
+        base_quarter_pop=base,
+    )
+    inp.seed = inp.derived_seed() if seed is None else seed
+    return inp
+
+
+def _render(inp: FitInputs) -> tuple[str, str]:
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        fitted = fit_forecast(inp)
+    a = CostAssumptions()
+    out = _finalize(fitted, a, CAPEX, inp.base_quarter_pop, None, inp.seed)
+    return out.model_dump_json(), forecast_etag(inp, a, CAPEX, None)
+
+
+@pytest.mark.parametrize("base", [None, 12_000])
+def test_same_inputs_same_body_and_etag(base):
+    a, b = _inputs(base), _inputs(base)
+    assert a.seed == b.seed and a.key() == b.key()
+    assert _render(a) == _render(b)
+
+
+@pytest.mark.parametrize("base", [None, 12_000])
+def test_different_seed_changes_body_and_etag(base):
+    a = _inputs(base)
+    body_a, etag_a = _render(a)
+    body_b, etag_b = _render(_inputs(base, seed=a.seed + 1))
+    assert body_a != body_b
+    assert etag_a != etag_b
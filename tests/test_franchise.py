@@ -0,0 +1,53 @@
+# tests/test_franchise.py
+# -----------------------------------------------------------------------------
+# 프랜차이즈 브랜드 판정 (app/core/franchise.py): 정탐/오탐 상호명
+# -----------------------------------------------------------------------------
+import pytest
+
+from app.core.franchise import classify, match_brand
+
+
+@pytest.mark.parametrize(
+    "name, brand",
+    [
+        ("스타벅스 대구수성못점", "스타벅스"),
+        ("스타벅스수성못점", "스타벅스"),
+        ("투썸 플레이스 범어점", "투썸플레이스"),
+        ("A TWOSOME PLACE 수성", "투썸플레이스"),
+        ("이디야커피 범어점", "이디야커피"),
+        ("이디야 카페", "이디야커피"),
+        ("빽다방(범어점)", "빽다방"),
+        ("메가MGC커피 수성못점", "메가MGC커피"),
+        ("공차 범어점", "공차"),
+        ("카페 공차", "공차"),
+        ("커피빈 수성점", "커피빈"),
+        ("던킨도너츠 수성점", "던킨"),
+    ],
+)
+def test_match_brand_positive(name, brand):
+    assert match_brand(name) == brand
+
+
+@pytest.mark.parametrize(
+    "name",
+    [
+        "개인카페 공차장",
+        "커피빈스",
+        "공차티하우스",
+        "동네커피",
+        "카페스타벅스사랑",
+        "",
+        None,
+    ],
+)
+def test_match_brand_negative(name):
+    assert match_brand(name) is None
+
+
+def test_classify_uses_category_fallback():
+    assert classify("수성못 1호점", "음식점 > 카페 > 커피전문점 > 스타벅스") == (
+        True,
+        "스타벅스",
+    )
+    assert classify("개인카페 공차장", "음식점 > 카페") == (False, None)
+    assert classify("동네커피", "음식점 > 카페 > 프랜차이즈") == (True, None)